@@ -5,8 +5,20 @@ Git Automatic Sync Service
 ✔️ Commit messages follow this format:
     Automated Commit Update at (updated time)
 
+✔️ Commits are recorded locally even while offline and pushed in the background
+    (exponential backoff with jitter, backlog size and age shown in the log)
+
+✔️ Repository maintenance between syncs when object counts cross thresholds
+    (prune, loose-object packing, incremental repack, commit-graph)
+
+✔️ Every sync and push attempt is recorded in .git/autosync-telemetry.sqlite
+    (python git_commit.py --stats [hours] shows p50/p95, optional Prometheus textfile export)
+
+✔️ A large first sync is committed in size-bounded batches ordered by directory and pushed one batch at a time
+    (resumes at the last pushed batch, progress in MB and files is logged)
+
 📌 Please modify the path, URL, and branch format appropriately at the locations below before use!:
-    ▶ Lines 205, 260
+    ▶ Lines 965, 1023
 """
 # ─────────────────────────────────────────────────────
 # Essential checks before use:
@@ -22,14 +34,22 @@ Git Automatic Sync Service
 # Create a shortcut for Git_Automate.vbs and register it in startup programs!
 # ─────────────────────────────────────────────────────
 
+import atexit
+import json
+import math
 import os
+import random
+import sqlite3
+import threading
 import time
 import traceback
-from datetime import datetime
+from contextlib import closing
+from datetime import datetime, timedelta
 from git import Repo
 import schedule
 import sys
 import logging
+import logging.handlers
 from pathlib import Path
 import servicemanager
 import socket
@@ -41,12 +61,645 @@ import subprocess
 # Flag to check if executed from bat file
 from_bat = "--from-bat" in sys.argv
 
+# Auto-commit backend: "plumbing" (fewer git processes), "gitpython" (previous behaviour)
+GIT_BACKEND = "plumbing"
+
+# Push queue: commits are made locally right away and a background worker pushes them
+PUSH_RETRY_BASE_SECONDS = 30  # Wait after the first failed push (doubles on each failure)
+PUSH_RETRY_MAX_SECONDS = 1800  # Longest wait between push attempts
+PUSH_PROBE_TIMEOUT = 15  # Seconds to wait for the remote connectivity check
+PUSH_TIMEOUT = 300  # Seconds to wait for a single push
+
+# Initial import: a large first sync is committed in size-bounded batches ordered by directory, pushed one batch at a time
+IMPORT_BATCH_MB = 500  # Largest batch; changes totalling more than this are imported in batches (0 disables)
+
+# Repository maintenance: runs between syncs, only when object counts cross these thresholds
+MAINTENANCE = True  # Enable automatic maintenance
+MAINTENANCE_LOOSE_OBJECTS = 1000  # Prune old unreachable objects and pack the rest above this many loose objects
+MAINTENANCE_PACKS = 20  # Incremental repack with a multi-pack-index above this many pack files
+MAINTENANCE_IDLE_SECONDS = 300  # Only run when no sync has started for this many seconds
+MAINTENANCE_CHECK_MINUTES = 30  # How often object counts are checked
+
+# Telemetry: phase timings and outcome of every sync and push attempt (.git/autosync-telemetry.sqlite)
+TELEMETRY = True  # Record sync cycles (view them with: python git_commit.py --stats [hours])
+TELEMETRY_RETENTION_DAYS = 30  # Per-cycle rows are kept this many days; older ones survive only as hourly totals
+PROMETHEUS_TEXTFILE_DIR = ""  # node_exporter textfile collector directory (e.g. "/var/lib/node_exporter/textfile"), empty to disable
+LOG_MAX_BYTES = 5 * 1024 * 1024  # git_sync.log is rotated at this size (3 old files are kept)
+
+SYNC_PHASES = ("status", "add", "commit", "fetch", "merge", "push", "other")
+
+class GitPlumbing:
+    """Auto-commit backend that starts as few git processes as possible
+
+    Commit and tree lookups go through one long-lived git cat-file --batch-check process,
+    and commits are made with update-index -> write-tree -> commit-tree -> update-ref
+    (unlike GitPython's index.commit, the whole index is never read and rebuilt in Python).
+    """
+    def __init__(self, repo_path):
+        self.repo_path = str(repo_path)
+        self.batch_process = None
+        atexit.register(self.close)
+
+    def run(self, *args, input=None):
+        result = subprocess.run(["git", *args], cwd=self.repo_path, input=input, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout.decode("utf-8", "surrogateescape")
+
+    def resolve(self, revision):
+        """Return the object ID of a revision (None if it does not exist) without starting a new process"""
+        if self.batch_process is None or self.batch_process.poll() is not None:
+            self.batch_process = subprocess.Popen(
+                ["git", "cat-file", "--batch-check"], cwd=self.repo_path,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        self.batch_process.stdin.write(revision.encode("utf-8") + b"\n")
+        self.batch_process.stdin.flush()
+        line = self.batch_process.stdout.readline()
+        if not line:
+            self.close()
+            raise RuntimeError("git cat-file --batch-check process exited")
+
+        # "<object ID> <type> <size>" or "<revision> missing"
+        fields = line.decode("utf-8", "replace").split()
+        return fields[0] if len(fields) == 3 and fields[1] in ("commit", "tree", "blob", "tag") else None
+
+    def commit(self, message, paths=None, cycle=None):
+        """Stage the changed files and commit them; returns None without committing if the tree equals HEAD
+
+        Without paths, git ls-files finds modified, deleted and untracked files.
+        With a cycle (SyncCycle), phase timings and the number of committed files are recorded.
+        """
+        if paths is None:
+            if cycle:
+                cycle.enter("status")
+            output = self.run("ls-files", "--modified", "--deleted", "--others", "--exclude-standard", "-z")
+            paths = list(dict.fromkeys(path for path in output.split("\0") if path))
+        if cycle:
+            cycle.enter("add")
+        if paths:
+            # --remove: files deleted from the working tree are removed from the index as well
+            self.run("update-index", "--add", "--remove", "--replace", "-z", "--stdin",
+                     input="\0".join(paths).encode("utf-8", "surrogateescape") + b"\0")
+
+        if cycle:
+            cycle.enter("commit")
+        tree = self.run("write-tree").strip()
+        parent = self.resolve("HEAD")
+        if parent and tree == self.resolve("HEAD^{tree}"):
+            return None
+
+        args = ["commit-tree", tree, "-m", message]
+        if parent:
+            args += ["-p", parent]
+        commit = self.run(*args).strip()
+        # Pass the previous value so HEAD is not overwritten if another program moved it meanwhile
+        self.run("update-ref", "-m", f"commit: {message}", "HEAD", commit, parent or "")
+        if cycle:
+            cycle.files_changed = len(paths)
+        return commit
+
+    def close(self):
+        if self.batch_process and self.batch_process.poll() is None:
+            self.batch_process.stdin.close()
+            self.batch_process.wait()
+        self.batch_process = None
+
+class RepoMaintenance:
+    """Checks object counts between syncs and runs only the maintenance tasks that are needed
+
+    Auto-commits (plumbing or GitPython) never call gc --auto the way git commit does,
+    so loose objects and small packs keep piling up. It runs on the sync thread, so it never overlaps a sync.
+    """
+    def __init__(self, repo_path, logger):
+        self.repo_path = str(repo_path)
+        self.logger = logger
+        self.next_check = 0.0
+        self.last_result = None
+
+    def git(self, *args):
+        result = subprocess.run(["git", *args], cwd=self.repo_path, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def count_objects(self):
+        """Output of git count-objects -v (count: loose objects, packs: pack files, ...)"""
+        stats = {}
+        for line in self.git("count-objects", "-v").splitlines():
+            key, value = line.split(": ", 1)
+            stats[key] = int(value)
+        return stats
+
+    def has_commit_graph(self):
+        info_dir = Path(self.git("rev-parse", "--git-path", "objects/info").strip())
+        if not info_dir.is_absolute():
+            info_dir = Path(self.repo_path) / info_dir
+        return (info_dir / "commit-graph").exists() or (info_dir / "commit-graphs").exists()
+
+    def plan_tasks(self, stats):
+        """Pick the tasks whose thresholds were crossed, in the order they should run"""
+        tasks = []
+        if stats["count"] >= MAINTENANCE_LOOSE_OBJECTS:
+            tasks += ["prune", "loose-objects"]
+        if stats["packs"] >= MAINTENANCE_PACKS:
+            tasks.append("incremental-repack")
+        if tasks or not self.has_commit_graph():
+            tasks.append("commit-graph")
+        return tasks
+
+    def run_task(self, task):
+        if task == "prune":
+            # Delete loose objects nothing has referenced for two weeks (same as the git gc default)
+            self.git("prune", "--expire=2.weeks.ago")
+        elif task == "commit-graph":
+            # Lets log, merge-base and fetch negotiation read the graph file instead of parsing commits
+            self.git("commit-graph", "write", "--reachable", "--changed-paths", "--split")
+        elif task == "incremental-repack":
+            self.git("multi-pack-index", "write")
+            self.git("maintenance", "run", "--task=incremental-repack")
+        elif task == "loose-objects":
+            self.git("maintenance", "run", "--task=loose-objects")
+            # The task only deletes the packed loose objects on its next run, so remove them now
+            self.git("prune-packed")
+        else:
+            self.git("maintenance", "run", f"--task={task}")
+
+    def is_due(self, idle_seconds):
+        return idle_seconds >= MAINTENANCE_IDLE_SECONDS and time.monotonic() >= self.next_check
+
+    def run(self):
+        """Check object counts and run the needed tasks; returns before/after counts and timings if anything ran"""
+        self.next_check = time.monotonic() + MAINTENANCE_CHECK_MINUTES * 60
+        try:
+            before = self.count_objects()
+            tasks = self.plan_tasks(before)
+            if not tasks:
+                return None
+
+            start = time.perf_counter()
+            timings = {}
+            for task in tasks:
+                task_start = time.perf_counter()
+                self.run_task(task)
+                timings[task] = round(time.perf_counter() - task_start, 3)
+            after = self.count_objects()
+        except Exception as e:
+            self.logger.error(f"Maintenance failed: {str(e)}")
+            return None
+
+        self.last_result = {
+            "time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "tasks": timings,
+            "seconds": round(time.perf_counter() - start, 3),
+            "before": before,
+            "after": after,
+        }
+        self.logger.info(
+            f"Maintenance ({', '.join(tasks)}): loose objects {before['count']} -> {after['count']}, "
+            f"packs {before['packs']} -> {after['packs']}, "
+            f"{(before['size'] + before['size-pack']) / 1024:.1f} -> {(after['size'] + after['size-pack']) / 1024:.1f} MB, "
+            f"{self.last_result['seconds']:.2f}s"
+        )
+        return self.last_result
+
+    def run_if_idle(self, last_sync_time):
+        """Called from the scheduler loop; runs only when maintenance is enabled and no sync ran recently"""
+        if MAINTENANCE and self.is_due(time.monotonic() - last_sync_time):
+            return self.run()
+        return None
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an unsorted list (None if it is empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+class SyncCycle:
+    """Phase timings and outcome of one sync cycle or push attempt
+
+    enter() switches phases and adds the time spent so far to the previous one (time outside any phase is "other").
+    """
+    def __init__(self, kind="sync"):
+        self.kind = kind
+        self.started = time.time()
+        self.start_counter = time.perf_counter()
+        self.phase_seconds = dict.fromkeys(SYNC_PHASES, 0.0)
+        self.phase = "other"
+        self.phase_start = self.start_counter
+        self.files_changed = 0
+        self.bytes_pushed = 0
+        self.round_trips = 0  # Connections to the remote (ls-remote, push)
+        self.outcome = None
+        self.seconds = None
+
+    def enter(self, phase):
+        now = time.perf_counter()
+        self.phase_seconds[self.phase] += now - self.phase_start
+        self.phase, self.phase_start = phase, now
+
+    def finish(self, success):
+        self.enter("other")
+        self.seconds = time.perf_counter() - self.start_counter
+        if self.outcome is None:
+            if not success:
+                self.outcome = "failed"
+            elif self.files_changed or self.round_trips > 1:
+                self.outcome = "ok"
+            else:
+                # Nothing to commit and nothing sent to the remote
+                self.outcome = "idle"
+
+class SyncTelemetry:
+    """Telemetry store (SQLite, .git/autosync-telemetry.sqlite in the repository)
+
+    Per-cycle rows (cycles) are kept for TELEMETRY_RETENTION_DAYS while hourly totals (hourly) are kept for good,
+    so the file barely grows over long runs. Every record also refreshes the metrics file in PROMETHEUS_TEXTFILE_DIR.
+    """
+    def __init__(self, git_dir, name, logger):
+        self.path = os.path.join(git_dir, "autosync-telemetry.sqlite")
+        self.name = name
+        self.logger = logger
+
+    def connect(self):
+        # One connection per call: the sync loop and the push worker record from different threads
+        connection = sqlite3.connect(self.path, timeout=10)
+        phase_columns = ", ".join(f"{phase}_seconds REAL" for phase in SYNC_PHASES)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS cycles (started REAL, kind TEXT, outcome TEXT, seconds REAL, {phase_columns}, "
+            "files_changed INTEGER, bytes_pushed INTEGER, round_trips INTEGER)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS cycles_started ON cycles (started)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS hourly (hour INTEGER, kind TEXT, outcome TEXT, cycles INTEGER, seconds REAL, "
+            "max_seconds REAL, files_changed INTEGER, bytes_pushed INTEGER, round_trips INTEGER, PRIMARY KEY (hour, kind, outcome))"
+        )
+        return connection
+
+    def record(self, cycle):
+        row = (
+            cycle.started, cycle.kind, cycle.outcome, cycle.seconds,
+            *(cycle.phase_seconds[phase] for phase in SYNC_PHASES),
+            cycle.files_changed, cycle.bytes_pushed, cycle.round_trips,
+        )
+        try:
+            with closing(self.connect()) as connection, connection:
+                connection.execute(f"INSERT INTO cycles VALUES ({', '.join('?' * len(row))})", row)
+                connection.execute(
+                    "INSERT INTO hourly VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?) ON CONFLICT (hour, kind, outcome) DO UPDATE SET "
+                    "cycles = cycles + 1, seconds = seconds + excluded.seconds, max_seconds = max(max_seconds, excluded.max_seconds), "
+                    "files_changed = files_changed + excluded.files_changed, bytes_pushed = bytes_pushed + excluded.bytes_pushed, "
+                    "round_trips = round_trips + excluded.round_trips",
+                    (int(cycle.started // 3600 * 3600), cycle.kind, cycle.outcome, cycle.seconds, cycle.seconds,
+                     cycle.files_changed, cycle.bytes_pushed, cycle.round_trips),
+                )
+                connection.execute("DELETE FROM cycles WHERE started < ?", (time.time() - TELEMETRY_RETENTION_DAYS * 24 * 60 * 60,))
+            if PROMETHEUS_TEXTFILE_DIR:
+                self.write_prometheus()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Failed to record telemetry: {str(e)}")
+
+    def summarize(self, hours=24, kind="sync"):
+        """Cycle count, outcomes, and overall and per-phase p50/p95 over the last hours (None without records)"""
+        with closing(self.connect()) as connection:
+            rows = connection.execute(
+                f"SELECT outcome, seconds, {', '.join(f'{phase}_seconds' for phase in SYNC_PHASES)}, files_changed, bytes_pushed, round_trips "
+                "FROM cycles WHERE kind = ? AND started >= ?", (kind, time.time() - hours * 60 * 60)
+            ).fetchall()
+        if not rows:
+            return None
+
+        outcomes = {}
+        for row in rows:
+            outcomes[row[0]] = outcomes.get(row[0], 0) + 1
+        seconds = [row[1] for row in rows]
+        phases = {}
+        for index, phase in enumerate(SYNC_PHASES, start=2):
+            values = [row[index] for row in rows if row[index]]
+            if values:
+                phases[phase] = (percentile(values, 0.5), percentile(values, 0.95))
+        return {
+            "cycles": len(rows),
+            "outcomes": outcomes,
+            "p50": percentile(seconds, 0.5),
+            "p95": percentile(seconds, 0.95),
+            "max": max(seconds),
+            "phases": phases,
+            "files_changed": sum(row[-3] for row in rows),
+            "bytes_pushed": sum(row[-2] for row in rows),
+            "round_trips": sum(row[-1] for row in rows),
+        }
+
+    def print_summary(self, hours=24):
+        found = False
+        for kind in ("sync", "push"):
+            summary = self.summarize(hours, kind)
+            if not summary:
+                continue
+            found = True
+            outcomes = ", ".join(f"{outcome} {count}" for outcome, count in sorted(summary["outcomes"].items()))
+            print(f"[{self.name}] last {hours} hours, {kind}: {summary['cycles']} ({outcomes})")
+            print(f"   cycle p50 {summary['p50']:.3f}s | p95 {summary['p95']:.3f}s | max {summary['max']:.3f}s")
+            print("   phase p50/p95: " + ", ".join(
+                f"{phase} {p50:.3f}/{p95:.3f}s" for phase, (p50, p95) in summary["phases"].items()
+            ))
+            print(f"   {summary['files_changed']} files committed | {summary['bytes_pushed'] / 1024:.1f} KB pushed | {summary['round_trips']} remote round trips")
+        if not found:
+            print(f"[{self.name}] No sync records in the last {hours} hours.")
+
+    def write_prometheus(self):
+        """Atomically replace the metrics file read by the node_exporter textfile collector"""
+        repo_label = self.name.replace("\\", "\\\\").replace('"', '\\"')
+        with closing(self.connect()) as connection:
+            totals = connection.execute(
+                "SELECT kind, outcome, SUM(cycles), SUM(seconds), SUM(files_changed), SUM(bytes_pushed), SUM(round_trips) "
+                "FROM hourly GROUP BY kind, outcome"
+            ).fetchall()
+            last = connection.execute(
+                "SELECT started, seconds FROM cycles WHERE kind = 'sync' ORDER BY started DESC LIMIT 1"
+            ).fetchone()
+            last_success = connection.execute(
+                "SELECT MAX(started) FROM cycles WHERE kind = 'push' AND outcome = 'ok'"
+            ).fetchone()[0]
+
+        metrics = {
+            "git_autosync_cycles_total": ("counter", "Sync cycles and push attempts by kind and outcome", []),
+            "git_autosync_cycle_seconds_total": ("counter", "Time spent in sync cycles and push attempts", []),
+            "git_autosync_files_changed_total": ("counter", "Files committed by sync cycles", []),
+            "git_autosync_pushed_bytes_total": ("counter", "On-disk size of pushed objects", []),
+            "git_autosync_remote_round_trips_total": ("counter", "Connections to the remote (ls-remote, push)", []),
+            "git_autosync_last_cycle_timestamp_seconds": ("gauge", "Start time of the last sync cycle", []),
+            "git_autosync_last_cycle_duration_seconds": ("gauge", "Duration of the last sync cycle", []),
+            "git_autosync_last_success_timestamp_seconds": ("gauge", "Start time of the last successful push", []),
+            "git_autosync_cycle_duration_seconds": ("gauge", "Sync cycle duration quantiles over the last 24 hours", []),
+        }
+        for kind, outcome, cycles, seconds, files_changed, bytes_pushed, round_trips in totals:
+            labels = f'repo="{repo_label}",kind="{kind}",outcome="{outcome}"'
+            metrics["git_autosync_cycles_total"][2].append((labels, cycles))
+            metrics["git_autosync_cycle_seconds_total"][2].append((labels, round(seconds, 3)))
+            metrics["git_autosync_files_changed_total"][2].append((labels, files_changed))
+            metrics["git_autosync_pushed_bytes_total"][2].append((labels, bytes_pushed))
+            metrics["git_autosync_remote_round_trips_total"][2].append((labels, round_trips))
+        labels = f'repo="{repo_label}"'
+        if last:
+            metrics["git_autosync_last_cycle_timestamp_seconds"][2].append((labels, round(last[0], 3)))
+            metrics["git_autosync_last_cycle_duration_seconds"][2].append((labels, round(last[1], 3)))
+        if last_success:
+            metrics["git_autosync_last_success_timestamp_seconds"][2].append((labels, round(last_success, 3)))
+        summary = self.summarize(24)
+        if summary:
+            for quantile in ("0.5", "0.95"):
+                value = summary["p50" if quantile == "0.5" else "p95"]
+                metrics["git_autosync_cycle_duration_seconds"][2].append((f'{labels},quantile="{quantile}"', round(value, 3)))
+
+        lines = []
+        for metric, (metric_type, help_text, samples) in metrics.items():
+            if samples:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"]
+                lines += [f"{metric}{{{labels}}} {value}" for labels, value in samples]
+
+        file_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.name)
+        path = os.path.join(PROMETHEUS_TEXTFILE_DIR, f"git_autosync_{file_name}.prom")
+        # Write to a temporary file first so the collector never reads a half-written file
+        with open(path + ".tmp", 'w', encoding='utf-8', newline='\n') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(path + ".tmp", path)
+
+class PushWorker(threading.Thread):
+    """Background thread that pushes local commits which have not reached the remote yet
+
+    The backlog is the commits between origin/<branch> and <branch>, so it lives in git itself
+    and survives restarts. Before each push the remote is probed with git ls-remote; while it
+    cannot be reached, attempts are retried with exponential backoff and jitter.
+    """
+    def __init__(self, repo_path, branch, logger):
+        super().__init__(name="PushWorker", daemon=True)
+        self.repo_path = str(repo_path)
+        self.branch = branch
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.failures = 0
+        self.next_attempt = None
+        self.pending_count = 0
+        self.oldest_pending = None
+        self.telemetry = None  # SyncTelemetry, set once the repository is loaded
+
+    def git(self, *args, timeout=None):
+        # Never wait for a credential prompt nobody can answer
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        return subprocess.run(["git", *args], cwd=self.repo_path, env=env, capture_output=True, timeout=timeout)
+
+    def refresh_backlog(self):
+        """Count the commits waiting to be pushed and find when the oldest one was made"""
+        with self.lock:
+            revisions = [f"refs/heads/{self.branch}"]
+            remote_ref = f"refs/remotes/origin/{self.branch}"
+            if self.git("rev-parse", "--verify", "-q", remote_ref).returncode == 0:
+                revisions += ["--not", remote_ref]
+            result = self.git("log", "--format=%ct", *revisions, "--")
+            # Fails when the branch has no commits yet
+            times = result.stdout.split() if result.returncode == 0 else []
+            self.pending_count = len(times)
+            self.oldest_pending = datetime.fromtimestamp(int(times[-1])) if times else None
+            return self.pending_count
+
+    def describe_backlog(self):
+        if not self.pending_count:
+            return "Push queue empty"
+        age_minutes = int((datetime.now() - self.oldest_pending).total_seconds() // 60) if self.oldest_pending else 0
+        text = f"Push queue: {self.pending_count} commit(s) waiting, oldest {age_minutes} min"
+        if self.next_attempt:
+            text += f", next attempt at {self.next_attempt.strftime('%H:%M:%S')}"
+        return text
+
+    def get_unpushed_bytes(self):
+        """On-disk size of the objects in commits the remote does not have yet (estimate of what a push sends)"""
+        result = self.git("rev-list", "--objects", "--disk-usage", f"refs/heads/{self.branch}", "--not", "--remotes=origin")
+        try:
+            return int(result.stdout) if result.returncode == 0 else 0
+        except ValueError:
+            return 0
+
+    def push_pending(self):
+        """Try one push; on failure schedule the next attempt and return False"""
+        cycle = SyncCycle("push")
+        pushed = False
+        try:
+            pushed = self.attempt_push(cycle)
+            return pushed
+        finally:
+            cycle.finish(pushed)
+            if self.telemetry:
+                self.telemetry.record(cycle)
+
+    def attempt_push(self, cycle):
+        """Probe the remote and push once; the phases and outcome are recorded in cycle"""
+        try:
+            cycle.enter("fetch")
+            cycle.round_trips += 1
+            probe = self.git("ls-remote", "--heads", "origin", self.branch, timeout=PUSH_PROBE_TIMEOUT)
+            if probe.returncode != 0:
+                cycle.outcome = "offline"
+                raise RuntimeError(f"Remote unreachable: {probe.stderr.decode('utf-8', 'replace').strip()}")
+
+            self.logger.info(f"Force pushing {self.pending_count} commit(s) to origin/{self.branch}...")
+            cycle.enter("push")
+            unpushed_bytes = self.get_unpushed_bytes()
+            cycle.round_trips += 1
+            result = self.git("push", "--force", "--porcelain", "origin", self.branch, timeout=PUSH_TIMEOUT)
+            if result.returncode != 0:
+                cycle.outcome = "rejected"
+                raise RuntimeError(f"Push rejected: {result.stderr.decode('utf-8', 'replace').strip()}")
+            cycle.bytes_pushed = unpushed_bytes
+        except (RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+            if cycle.outcome is None:
+                cycle.outcome = "timeout" if isinstance(e, subprocess.TimeoutExpired) else "failed"
+            self.failures += 1
+            delay = min(PUSH_RETRY_MAX_SECONDS, PUSH_RETRY_BASE_SECONDS * 2 ** (self.failures - 1))
+            # Random delay between half and the full backoff so many clients do not retry together
+            self.next_attempt = datetime.now() + timedelta(seconds=random.uniform(delay / 2, delay))
+            self.logger.error(f"Push failed ({self.failures} in a row): {str(e)}")
+            self.logger.warning(self.describe_backlog())
+            return False
+
+        for line in result.stdout.decode("utf-8", "replace").splitlines():
+            if line.startswith(("+", " ", "*", "=")):
+                self.logger.info(f"Push result: {line.strip()}")
+        self.failures = 0
+        self.next_attempt = None
+        self.refresh_backlog()
+        return True
+
+    def notify(self):
+        """Tell the worker that new commits were made"""
+        self.wake_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            timeout = None
+            if self.refresh_backlog() == 0:
+                self.failures = 0
+                self.next_attempt = None
+            elif self.next_attempt and datetime.now() < self.next_attempt:
+                # New commits do not cut a backoff short
+                timeout = (self.next_attempt - datetime.now()).total_seconds()
+            elif self.push_pending():
+                continue
+            else:
+                timeout = (self.next_attempt - datetime.now()).total_seconds()
+
+            self.wake_event.wait(max(timeout, 0) if timeout is not None else None)
+            self.wake_event.clear()
+
+class InitialImport:
+    """Progress of an import that commits a large tree in size-bounded batches
+
+    The resume point is git itself: files of pushed batches are committed and no longer show up
+    as changes, so after a failure or restart only the remaining files are planned again.
+    .git/autosync-import.json only keeps the totals for progress reporting.
+    """
+    def __init__(self, git_dir, logger):
+        self.path = os.path.join(git_dir, "autosync-import.json")
+        self.logger = logger
+        self.state = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = None
+
+    @property
+    def active(self):
+        return self.state is not None
+
+    def is_large(self, changes):
+        return IMPORT_BATCH_MB > 0 and sum(changes.values()) > IMPORT_BATCH_MB * 1024 * 1024
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.path)
+
+    def start(self, changes):
+        if self.state is None:
+            self.state = {
+                "started": datetime.now().isoformat(timespec="seconds"),
+                "total_files": len(changes), "total_bytes": sum(changes.values()),
+                "pushed_files": 0, "pushed_bytes": 0, "pending_files": 0, "pending_bytes": 0, "batches": 0,
+            }
+            self.save()
+            self.logger.info(f"Initial import: {len(changes)} files, {sum(changes.values()) / 1024 ** 2:.1f} MB "
+                             f"in batches of up to {IMPORT_BATCH_MB} MB")
+
+    def plan(self, changes):
+        """Split the changed paths into batches of at most IMPORT_BATCH_MB, keeping each directory together
+
+        A single file larger than the limit becomes a batch of its own.
+        """
+        limit = IMPORT_BATCH_MB * 1024 * 1024
+        batches, batch, batch_bytes = [], [], 0
+        for path in sorted(changes, key=lambda path: (os.path.dirname(path), path)):
+            if batch and batch_bytes + changes[path] > limit:
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(path)
+            batch_bytes += changes[path]
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def batch_committed(self, files, size):
+        self.state["batches"] += 1
+        self.state["pending_files"] += files
+        self.state["pending_bytes"] += size
+        self.save()
+
+    def batch_pushed(self):
+        """The committed batches reached the remote: count them as done and report progress"""
+        if not self.state or not self.state["pending_files"]:
+            return
+        state = self.state
+        state["pushed_files"] += state["pending_files"]
+        state["pushed_bytes"] += state["pending_bytes"]
+        state["pending_files"] = state["pending_bytes"] = 0
+        self.save()
+        total_bytes = max(state["total_bytes"], state["pushed_bytes"], 1)
+        self.logger.info(
+            f"Import batch {state['batches']} pushed: {state['pushed_bytes'] / 1024 ** 2:.1f} / {total_bytes / 1024 ** 2:.1f} MB "
+            f"({state['pushed_bytes'] * 100 // total_bytes}%), {state['pushed_files']} / {max(state['total_files'], state['pushed_files'])} files"
+        )
+
+    def finish(self):
+        if self.state:
+            self.logger.info(f"Initial import finished: {self.state['batches']} batch(es) pushed since {self.state['started']}")
+        self.state = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
 class GitAutoSync:
     def __init__(self, repo_path, remote_url, branch="gb"):
         self.repo_path = Path(repo_path)
         self.remote_url = remote_url
         self.branch = branch
         self.setup_logging()
+        self.plumbing = GitPlumbing(self.repo_path) if GIT_BACKEND == "plumbing" else None
+        self.push_worker = PushWorker(self.repo_path, self.branch, self.logger)
+        self.maintenance = RepoMaintenance(self.repo_path, self.logger)
+        self.last_sync_time = time.monotonic()
+        self.cycle = SyncCycle()
+        self.telemetry = None
+        self.importer = None
 
         try:
             if (self.repo_path / ".git").exists():
@@ -66,6 +719,11 @@ class GitAutoSync:
                 self.repo.create_remote("origin", remote_url)
                 self.logger.info("Remote 'origin' created")
 
+            if TELEMETRY:
+                self.telemetry = SyncTelemetry(self.repo.git_dir, self.repo_path.name, self.logger)
+                self.push_worker.telemetry = self.telemetry
+            self.importer = InitialImport(self.repo.git_dir, self.logger)
+
         except Exception as e:
             self.logger.error(f"Failed to initialize repository: {str(e)}")
             self.logger.error(traceback.format_exc())
@@ -76,7 +734,7 @@ class GitAutoSync:
         self.logger.setLevel(logging.INFO)
 
         log_path = self.repo_path.parent / "git_sync.log"
-        file_handler = logging.FileHandler(log_path)
+        file_handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=3, encoding="utf-8")
         console_handler = logging.StreamHandler()
 
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
@@ -105,77 +763,180 @@ class GitAutoSync:
             self.logger.error(traceback.format_exc())
             return False
 
+    def get_pending_changes(self):
+        """Modified, deleted and untracked paths with their sizes in bytes (deleted files count as 0)"""
+        self.cycle.enter("status")
+        output = subprocess.run(
+            ["git", "ls-files", "--modified", "--deleted", "--others", "--exclude-standard", "-z"],
+            cwd=self.repo_path, capture_output=True, check=True
+        ).stdout.decode("utf-8", "surrogateescape")
+        changes = {}
+        for path in output.split("\0"):
+            if path and path not in changes:
+                try:
+                    changes[path] = os.lstat(self.repo_path / path).st_size
+                except OSError:
+                    changes[path] = 0
+        return changes
+
+    def commit_changes(self, message, paths=None):
+        """Commit the given paths (every change when None); returns False if there was nothing to commit"""
+        if self.plumbing:
+            try:
+                return self.plumbing.commit(message, paths, cycle=self.cycle) is not None
+            except Exception as e:
+                self.logger.warning(f"Plumbing commit failed, switching to GitPython: {str(e)}")
+                self.plumbing.close()
+                self.plumbing = None
+
+        self.cycle.enter("add")
+        if paths is None:
+            self.repo.git.add(".")
+        else:
+            # Paths go through stdin so thousands of them do not hit the command line length limit
+            subprocess.run(["git", "add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"], cwd=self.repo_path,
+                           input="\0".join(paths).encode("utf-8", "surrogateescape"), capture_output=True, check=True)
+        if self.repo.is_dirty() or len(self.repo.untracked_files) > 0:
+            self.cycle.enter("commit")
+            self.repo.index.commit(message)
+            return True
+        return False
+
     def force_push(self):
         try:
             if not self.ensure_branch():
                 self.logger.error("Failed to ensure correct branch, skipping push")
                 return False
 
-            self.repo.git.add(".")
+            changes = self.get_pending_changes()
+            if self.importer.active or self.importer.is_large(changes):
+                return self.import_in_batches(changes)
 
+            # Commit only when something changed; commits still waiting from an earlier run are pushed as they are
             commit_message = f"Automated Commit Update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            self.repo.git.commit("-m", commit_message, "--allow-empty")
-            self.logger.info(f"Created commit: {commit_message}")
+            if self.commit_changes(commit_message, list(changes)):
+                self.logger.info(f"Created commit: {commit_message}")
 
-            try:
-                self.logger.info(f"Force pushing to origin/{self.branch}...")
-                origin = self.repo.remote("origin")
-                push_info = origin.push(self.branch, force=True)
-                for info in push_info:
-                    self.logger.info(f"Push result: {info.summary}")
+            if self.push_worker.refresh_backlog() == 0:
+                self.logger.info("No commits waiting to be pushed")
                 return True
-            except Exception as e:
-                self.logger.error(f"Push failed: {str(e)}")
-                self.logger.error(traceback.format_exc())
-                return False
+            self.logger.info(self.push_worker.describe_backlog())
+            return self.push_worker.push_pending()
 
         except Exception as e:
             self.logger.error(f"Error during force push: {str(e)}")
             self.logger.error(traceback.format_exc())
             return False
 
+    def commit_import_batch(self, paths, changes):
+        """Commit one import batch; returns False if it contained no actual change"""
+        batch_bytes = sum(changes[path] for path in paths)
+        commit_message = (f"Automated Import {self.importer.state['batches'] + 1} ({len(paths)} files, "
+                          f"{batch_bytes / 1024 ** 2:.1f} MB) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if not self.commit_changes(commit_message, paths):
+            return False
+        self.importer.batch_committed(len(paths), batch_bytes)
+        self.logger.info(f"Created commit: {commit_message}")
+        return True
+
+    def import_in_batches(self, changes):
+        """Initial import at startup: commit and push one batch at a time
+
+        If a push fails the remaining batches stay uncommitted; the push worker retries the
+        committed one and scheduled syncs continue with the rest (see continue_import).
+        """
+        self.importer.start(changes)
+        # A batch committed before a restart that never reached the remote goes first
+        if self.push_worker.refresh_backlog():
+            self.logger.info(self.push_worker.describe_backlog())
+            if not self.push_worker.push_pending():
+                return False
+        self.importer.batch_pushed()
+
+        for paths in self.importer.plan(changes):
+            if not self.commit_import_batch(paths, changes):
+                continue
+            self.push_worker.refresh_backlog()
+            if not self.push_worker.push_pending():
+                self.logger.warning("Import paused; the batch is retried in the background and the rest follows on later syncs")
+                return False
+            self.importer.batch_pushed()
+        self.importer.finish()
+        return True
+
+    def continue_import(self, changes):
+        """Scheduled sync during an unfinished import: commit the next batch only once the previous one is pushed
+
+        Returns False when the import is over and the remaining changes can be committed as usual.
+        """
+        self.importer.start(changes)
+        if self.push_worker.refresh_backlog():
+            self.logger.info(f"Import waiting for the previous batch to be pushed ({self.push_worker.describe_backlog()})")
+            return True
+        self.importer.batch_pushed()
+        if not self.importer.is_large(changes):
+            self.importer.finish()
+            return False
+
+        if self.commit_import_batch(self.importer.plan(changes)[0], changes):
+            # The push worker sends it; the next batch waits for the next sync
+            self.push_worker.refresh_backlog()
+            self.push_worker.notify()
+        return True
+
     def sync(self):
+        """Scheduled sync; phase timings and the outcome are recorded when TELEMETRY is on"""
+        self.cycle = SyncCycle()
+        success = False
+        try:
+            success = self.run_sync_cycle()
+        finally:
+            self.cycle.finish(success)
+            if self.telemetry:
+                self.telemetry.record(self.cycle)
+
+    def run_sync_cycle(self):
+        """One sync cycle: commit local changes and hand them to the push worker"""
+        self.last_sync_time = time.monotonic()
         try:
             print(f"Scheduled sync started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
             if not self.ensure_branch():
                 self.logger.error("Failed to ensure correct branch, skipping sync")
-                return
-
-            self.repo.git.add(".")
+                return False
 
-            if self.repo.is_dirty() or len(self.repo.untracked_files) > 0:
-                commit_message = f"Automated Commit Update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                self.repo.index.commit(commit_message)
+            changes = self.get_pending_changes()
+            commit_message = f"Automated Commit Update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            if (self.importer.active or self.importer.is_large(changes)) and self.continue_import(changes):
+                pass
+            elif changes and self.commit_changes(commit_message, list(changes)):
                 self.logger.info(f"Created scheduled commit: {commit_message}")
                 print(f"New commit created: {commit_message}")
-
-                try:
-                    self.logger.info(f"Pushing to origin/{self.branch}...")
-                    origin = self.repo.remote("origin")
-                    push_info = origin.push(self.branch, force=True)
-                    for info in push_info:
-                        self.logger.info(f"Push result: {info.summary}")
-                        print(f"Push result: {info.summary}")
-                except Exception as e:
-                    self.logger.error(f"Push failed: {str(e)}")
-                    self.logger.error(traceback.format_exc())
-                    print(f"Push failed: {str(e)}")
+                # The push worker sends it; sync does not wait for the network
+                self.push_worker.refresh_backlog()
+                self.push_worker.notify()
             else:
                 self.logger.info("No changes to sync")
                 print("No changes to sync.")
 
+            if self.push_worker.pending_count:
+                self.logger.info(self.push_worker.describe_backlog())
+                print(self.push_worker.describe_backlog())
+
             # Display next execution time
             next_run = schedule.next_run()
             if next_run:
                 print(f"Next sync scheduled at: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
             else:
                 print("No next sync scheduled.")
+            return True
 
         except Exception as e:
+            self.cycle.outcome = "error"
             self.logger.error(f"Error during sync: {str(e)}")
             self.logger.error(traceback.format_exc())
             print(f"Error occurred during sync: {str(e)}")
+            return False
 
 
 class GitAutoSyncService(win32serviceutil.ServiceFramework):
@@ -218,6 +979,7 @@ class GitAutoSyncService(win32serviceutil.ServiceFramework):
                 servicemanager.LogMsg(servicemanager.EVENTLOG_INFORMATION_TYPE, 0, ("Initial push completed", ""))
             else:
                 servicemanager.LogMsg(servicemanager.EVENTLOG_WARNING_TYPE, 0, ("Initial push failed", ""))
+            git_sync.push_worker.start()
 
             schedule.every(10).minutes.do(git_sync.sync)
 
@@ -229,9 +991,11 @@ class GitAutoSyncService(win32serviceutil.ServiceFramework):
 
             while not self.stop_requested:
                 schedule.run_pending()
+                git_sync.maintenance.run_if_idle(git_sync.last_sync_time)
                 time.sleep(1)  # Check scheduler every 1 second
                 if win32event.WaitForSingleObject(self.hWaitStop, 1000) == win32event.WAIT_OBJECT_0:
                     break
+            git_sync.push_worker.stop()
 
         except Exception as e:
             servicemanager.LogMsg(
@@ -264,6 +1028,13 @@ def run_foreground():
     branch = "GitHub Branch"
                 
 #######################################################################
+    # python git_commit.py --stats [hours, default 24]: print recorded sync statistics and exit
+    if "--stats" in sys.argv:
+        stats_args = sys.argv[sys.argv.index("--stats") + 1:]
+        hours = float(stats_args[0]) if stats_args and stats_args[0].replace(".", "", 1).isdigit() else 24
+        SyncTelemetry(os.path.join(repo_path, ".git"), Path(repo_path).name, logging.getLogger("GitAutoSync")).print_summary(hours)
+        return
+
     # If executed from bat file, restart in background
     if from_bat and "--background" not in sys.argv:
         restart_as_background()
@@ -283,7 +1054,9 @@ def run_foreground():
         if git_sync.force_push():
             print("Initial push completed!")
         else:
-            print("Initial push failed. Please check the logs.")
+            print("Initial push failed. It will be retried in the background.")
+            print(git_sync.push_worker.describe_backlog())
+        git_sync.push_worker.start()
         
         # Setup scheduler
         print(f"\nGit auto sync has been configured. Syncing {branch} branch every 10 minutes.")
@@ -307,6 +1080,7 @@ def run_foreground():
             
             while True:
                 schedule.run_pending()
+                git_sync.maintenance.run_if_idle(git_sync.last_sync_time)
                 
                 # Log output every minute
                 if count % 60 == 0 and count > 0:
@@ -316,7 +1090,10 @@ def run_foreground():
                     
                     minutes = time_left // 60
                     seconds = time_left % 60
-                    print(f"{now.strftime('%Y-%m-%d %H:%M:%S')} - {minutes} minutes {seconds} seconds until next sync.")
+                    status = f"{now.strftime('%Y-%m-%d %H:%M:%S')} - {minutes} minutes {seconds} seconds until next sync."
+                    if git_sync.push_worker.pending_count:
+                        status += f" ({git_sync.push_worker.describe_backlog()})"
+                    print(status)
                 
                 time.sleep(1)
                 count += 1
@@ -1,16 +1,212 @@
 #!/usr/bin/env python3
 # image_splitter.py
+import gzip
+import io
+import json
 import os
+import queue
 import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Enter the paths here
 source_dir = r"image_path"      # Source directory path where original images are located
 output_dir = r"save_path"       # Directory path to save divided images
+restore_dir = r"restore_path"   # Directory path to restore the original images into (join mode)
 max_size_mb = 512               # Maximum size per folder (MB)
+archive_format = "zip"          # Archive format: zip, tar, tar.gz, tar.zst (tar.zst requires zstandard)
+compare_backends = False        # Compare the throughput of every archive format on the first folder
+verify_archives = True          # Re-read every archive after it is built and check it against the plan
+verify_workers = None           # Number of verification processes (None: number of CPUs)
+transform_format = None         # Re-encode images before packing: None, "webp", "jpeg" (requires Pillow)
+transform_quality = 85          # Quality used when re-encoding (1-100)
+transform_max_dimension = None  # Longest side in pixels after resizing (None: keep the original size)
+transform_workers = None        # Number of transform processes (None: number of CPUs)
+dedupe_policy = None            # Near-duplicate images: None (off), "keep", "drop", "list" (requires Pillow, NumPy)
+dedupe_threshold = 4            # Maximum differing bits between 64-bit hashes to count as near-duplicates
+dedupe_workers = None           # Number of hashing processes (None: number of CPUs)
+join_workers = 4                # Number of archives extracted at the same time in join mode
+pipeline_memory_mb = 256        # Memory budget for members read ahead and compressed in parallel (MB)
+pipeline_readers = 4            # Number of threads reading members ahead
+pipeline_workers = None         # Number of compression threads (None: number of CPUs)
+progress_interval = 0.5         # Seconds between progress line redraws
+
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024     # Write buffer size for archive output (8MB)
+VERIFY_READ_SIZE = 1024 * 1024          # Read size while verifying archive members (1MB)
+COPY_BUFFER_SIZE = 1024 * 1024          # Copy buffer size while extracting archive members (1MB)
+PIPELINE_QUEUE_SIZE = 4096              # Maximum number of members waiting in the archive pipeline
+MANIFEST_NAME = "manifest.json"
+SUMMARY_NAME = "split_summary.json"
+TAR_BLOCK_SIZE = 512
+TRANSFORM_FORMATS = {"webp": ("WEBP", ".webp"), "jpeg": ("JPEG", ".jpg")}
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+class ProgressReporter:
+    """Progress of one stage, redrawn at most once per progress_interval instead of once per file
+    
+    On a terminal the line is redrawn in place; otherwise (redirected to a log) each redraw is a new line.
+    update() may be called from several threads. finish() prints the final line and returns the stage stats.
+    """
+    def __init__(self, stage, total_files=0, total_bytes=0, display=True):
+        self.stage = stage
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.display = display
+        self.files = 0
+        self.bytes = 0
+        self.start_time = time.perf_counter()
+        self._last_draw = self.start_time
+        self._drawn_counts = None
+        self._width = 0
+        self._tty = sys.stdout.isatty()
+        self._lock = threading.Lock()
+
+    def update(self, files=1, nbytes=0):
+        with self._lock:
+            self.files += files
+            self.bytes += nbytes
+            now = time.perf_counter()
+            if self.display and now - self._last_draw >= progress_interval:
+                self._last_draw = now
+                self._draw(self._line(now - self.start_time))
+
+    def log(self, message):
+        """Print a message without mixing it into the progress line"""
+        with self._lock:
+            self._clear()
+            print(message)
+            self._last_draw = 0.0
+
+    def finish(self):
+        seconds = time.perf_counter() - self.start_time
+        with self._lock:
+            if self.display:
+                # A log file does not need the last line again if nothing changed since it was drawn
+                if self._tty or self._drawn_counts != (self.files, self.bytes):
+                    self._draw(self._line(seconds))
+                if self._tty:
+                    sys.stdout.write("\n")
+                self._width = 0
+        elapsed = max(seconds, 1e-6)
+        return {
+            "stage": self.stage,
+            "files": self.files,
+            "bytes": self.bytes,
+            "seconds": round(seconds, 3),
+            "files_per_second": round(self.files / elapsed, 1),
+            "mb_per_second": round(self.bytes / (1024 * 1024) / elapsed, 1),
+        }
+
+    def _line(self, seconds):
+        elapsed = max(seconds, 1e-6)
+        rate = f"{self.files / elapsed:,.0f} files/s {self.bytes / (1024 * 1024) / elapsed:.1f}MB/s"
+        if not self.total_files:
+            return f"[{self.stage}] {self.files:,} files {self.bytes / (1024 * 1024):.1f}MB | {rate}"
+        
+        # Estimate by bytes when they are known, since file sizes vary far more than per-file costs
+        if self.total_bytes and self.bytes:
+            done = min(self.bytes / self.total_bytes, 1.0)
+        else:
+            done = min(self.files / self.total_files, 1.0)
+        eta = format_duration(seconds * (1 - done) / done) if done else "--:--:--"
+        return (f"[{self.stage}] {self.files:,}/{self.total_files:,} files ({done * 100:.1f}%) "
+                f"{self.bytes / (1024 * 1024):.1f}MB | {rate} | ETA {eta}")
+
+    def _draw(self, line):
+        self._drawn_counts = (self.files, self.bytes)
+        if self._tty:
+            sys.stdout.write("\r" + line.ljust(self._width))
+            sys.stdout.flush()
+            self._width = len(line)
+        else:
+            print(line)
+
+    def _clear(self):
+        if self._tty and self._width:
+            sys.stdout.write("\r" + " " * self._width + "\r")
+            self._width = 0
+
+def get_peak_rss():
+    """Peak resident memory of this process and of its largest finished worker process, in bytes (None if unknown)"""
+    try:
+        import resource
+    except ImportError:
+        return get_windows_peak_rss(), None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+def get_windows_peak_rss():
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except ImportError:
+        pass
+    
+    import ctypes
+    from ctypes import wintypes
+    
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+    
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+    return None
+
+def write_summary(summary_path, summary):
+    """Save the run statistics as JSON so that runs can be compared by other tools"""
+    peak_rss, peak_worker_rss = get_peak_rss()
+    summary["peak_rss_bytes"] = peak_rss
+    summary["peak_worker_rss_bytes"] = peak_worker_rss
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(f"Run summary saved: {summary_path}")
 
-def get_all_image_files(source_dir):
+def get_all_image_files(source_dir, progress=None):
     image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
     image_files = []
     
@@ -20,9 +216,209 @@ def get_all_image_files(source_dir):
                 file_path = os.path.join(root, file)
                 file_size = os.path.getsize(file_path)
                 image_files.append((file_path, file_size))
+                if progress:
+                    progress.update(1, file_size)
+    
+    return image_files
+
+def compute_image_hash(file_path):
+    """64-bit difference hash (dHash): brightness gradients of a 9x8 grayscale thumbnail"""
+    try:
+        with Image.open(file_path) as img:
+            # Let JPEG decode at a reduced scale, which is much faster than a full decode
+            img.draft("L", (64, 64))
+            pixels = list(img.convert("L").resize((9, 8), Image.BILINEAR).getdata())
+    except Exception:
+        return None
+    
+    image_hash = 0
+    for row in range(8):
+        for col in range(8):
+            image_hash = (image_hash << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return image_hash
+
+def popcount64(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    byte_counts = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return byte_counts[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+def find_near_duplicates(hashes, threshold, priority=None):
+    """Group hashes around kept hashes within the Hamming distance threshold; returns the kept position for each hash
+    
+    Hashes are taken in priority order (e.g. largest file first): an ungrouped hash becomes a kept hash and
+    takes every ungrouped hash within the threshold of it. Groups are never chained through A~B, B~C pairs,
+    so every member is within the threshold of the hash its group keeps.
+    
+    Multi-index hashing: the 64 bits are split into threshold + 1 chunks, and two hashes within the
+    threshold must match exactly on at least one chunk. Only hashes sharing a chunk value are
+    compared, and all comparisons are vectorized over sorted chunk values instead of a Python loop.
+    """
+    count = len(hashes)
+    chunk_count = min(threshold + 1, 64)
+    chunk_bits = [64 // chunk_count + (1 if i < 64 % chunk_count else 0) for i in range(chunk_count)]
+    left_parts = []
+    right_parts = []
+    
+    shift = 0
+    for bits in chunk_bits:
+        mask = np.uint64((1 << bits) - 1)
+        keys = (hashes >> np.uint64(shift)) & mask
+        shift += bits
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        
+        # Compare each hash with the ones d positions later while they still share the chunk value
+        offset = 1
+        active = np.flatnonzero(sorted_keys[:-1] == sorted_keys[1:])
+        while active.size:
+            left = order[active]
+            right = order[active + offset]
+            close = popcount64(hashes[left] ^ hashes[right]) <= threshold
+            left_parts.append(left[close])
+            right_parts.append(right[close])
+            
+            offset += 1
+            active = active[active + offset < count]
+            active = active[sorted_keys[active] == sorted_keys[active + offset]]
+    
+    labels = np.arange(count)
+    if not left_parts:
+        return labels
+    left = np.concatenate(left_parts)
+    right = np.concatenate(right_parts)
+    
+    # Adjacency in both directions (neighbors of each hash stored contiguously); only hashes with neighbors are visited
+    source = np.concatenate([left, right])
+    target = np.concatenate([right, left])
+    edge_order = np.argsort(source, kind="stable")
+    source, target = source[edge_order], target[edge_order]
+    starts = np.searchsorted(source, np.arange(count + 1))
+    priority = np.arange(count) if priority is None else np.asarray(priority)
+    priority = priority[starts[priority + 1] > starts[priority]]
+    assigned = np.zeros(count, dtype=bool)
+    for index in priority.tolist():
+        if assigned[index]:
+            continue
+        assigned[index] = True
+        neighbors = target[starts[index]:starts[index + 1]]
+        neighbors = neighbors[~assigned[neighbors]]
+        labels[neighbors] = index
+        assigned[neighbors] = True
+    return labels
+
+def dedupe_images(image_files, policy, list_path, progress=None):
+    if Image is None or np is None:
+        print("Pillow or NumPy is not installed. Skipping near-duplicate detection. (pip install pillow numpy)")
+        return image_files
+    
+    start_time = time.perf_counter()
+    hash_values = []
+    with ProcessPoolExecutor(max_workers=dedupe_workers) as pool:
+        for (_, file_size), value in zip(image_files, pool.map(compute_image_hash, [path for path, _ in image_files], chunksize=256)):
+            hash_values.append(value)
+            if progress:
+                progress.update(1, file_size)
+    hashed = [i for i, value in enumerate(hash_values) if value is not None]
+    hash_seconds = time.perf_counter() - start_time
+    
+    hashes = np.array([hash_values[i] for i in hashed], dtype=np.uint64)
+    # Larger files (usually the highest quality) are kept first; only files within the threshold of a kept file are duplicates
+    sizes = np.array([image_files[i][1] for i in hashed], dtype=np.int64)
+    labels = find_near_duplicates(hashes, dedupe_threshold, np.argsort(-sizes, kind="stable"))
+    
+    groups = {}
+    for position, label in enumerate(labels.tolist()):
+        groups.setdefault(label, []).append(hashed[position])
+    duplicate_groups = []
+    for label, members in groups.items():
+        if len(members) > 1:
+            # Kept file first
+            members.sort(key=lambda i: (i != hashed[label], -image_files[i][1]))
+            duplicate_groups.append(members)
+    duplicates = {i for members in duplicate_groups for i in members[1:]}
     
+    duplicate_mb = sum(image_files[i][1] for i in duplicates) / (1024 * 1024)
+    print(f"Near-duplicates: {len(duplicates)} files in {len(duplicate_groups)} groups ({duplicate_mb:.2f}MB), "
+          f"hashing {hash_seconds:.2f}s, comparing {time.perf_counter() - start_time - hash_seconds:.2f}s")
+    
+    if policy in ("list", "drop") and duplicate_groups:
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for members in duplicate_groups:
+                f.write(f"{image_files[members[0]][0]}\n")
+                for i in members[1:]:
+                    f.write(f"    {image_files[i][0]}\n")
+        print(f"Near-duplicate list saved: {list_path}")
+    
+    if policy == "drop":
+        return [image_file for i, image_file in enumerate(image_files) if i not in duplicates]
     return image_files
 
+def transform_image(task):
+    """Resize and/or re-encode one image; returns the path and size that should be packed"""
+    source_path, dest_path, image_format, quality, max_dimension = task
+    try:
+        with Image.open(source_path) as img:
+            needs_resize = max_dimension and max(img.size) > max_dimension
+            # Animated images would lose their frames, and images already within limits need no work
+            if getattr(img, "is_animated", False) or (not image_format and not needs_resize):
+                return source_path, os.path.getsize(source_path), None
+            
+            save_format = TRANSFORM_FORMATS[image_format][0] if image_format else img.format
+            if needs_resize:
+                img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+            if save_format == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            img.save(dest_path, format=save_format, quality=quality)
+        file_size = os.path.getsize(dest_path)
+        source_size = os.path.getsize(source_path)
+        # A re-encode without a resize that did not shrink the file (high-quality JPEG -> WebP, an already small PNG) only costs space
+        if not needs_resize and file_size >= source_size:
+            os.remove(dest_path)
+            return source_path, source_size, None
+        return dest_path, file_size, None
+    except Exception as e:
+        return source_path, os.path.getsize(source_path), str(e)
+
+def transform_images(image_files, source_dir, transform_dir, progress=None):
+    if Image is None:
+        print("Pillow is not installed. Skipping the transform stage. (pip install pillow)")
+        return image_files
+    
+    tasks = []
+    for file_path, _ in image_files:
+        relative_path = os.path.relpath(file_path, source_dir)
+        if transform_format:
+            # Keep the original extension so a.png and a.jpg do not both become a.webp (a.png.webp, a.jpg.webp)
+            relative_path += TRANSFORM_FORMATS[transform_format][1]
+        dest_path = os.path.join(transform_dir, relative_path)
+        tasks.append((file_path, dest_path, transform_format, transform_quality, transform_max_dimension))
+    
+    transformed_files = []
+    failed = 0
+    kept = 0
+    with ProcessPoolExecutor(max_workers=transform_workers) as pool:
+        for (source_path, original_size), (file_path, file_size, error) in zip(image_files, pool.map(transform_image, tasks, chunksize=64)):
+            if error:
+                failed += 1
+                message = f"Transform failed, using the original: {file_path} ({error})"
+                if progress:
+                    progress.log(message)
+                else:
+                    print(message)
+            elif file_path == source_path:
+                kept += 1
+            transformed_files.append((file_path, file_size))
+            if progress:
+                progress.update(1, original_size)
+    
+    before_mb = sum(size for _, size in image_files) / (1024 * 1024)
+    after_mb = sum(size for _, size in transformed_files) / (1024 * 1024)
+    print(f"Transform completed: {before_mb:.2f}MB -> {after_mb:.2f}MB ({kept} kept as the original, {failed} failed)")
+    return transformed_files
+
 def create_output_folders(output_dir, num_folders):
     folders = []
     for i in range(1, num_folders + 1):
@@ -31,7 +427,7 @@ def create_output_folders(output_dir, num_folders):
         folders.append(folder_name)
     return folders
 
-def distribute_images(image_files, output_folders, max_size_bytes):
+def distribute_images(image_files, output_folders, max_size_bytes, member_overhead=None, progress=None):
     current_folder_index = 0
     current_size = 0
     distribution = {folder: [] for folder in output_folders}
@@ -39,6 +435,10 @@ def distribute_images(image_files, output_folders, max_size_bytes):
     image_files.sort(key=lambda x: x[1], reverse=True)
     
     for file_path, file_size in image_files:
+        if progress:
+            progress.update(1, file_size)
+        if member_overhead:
+            file_size += member_overhead(os.path.basename(file_path), file_size)
         if current_size + file_size > max_size_bytes and current_folder_index + 1 < len(output_folders):
             current_folder_index += 1
             current_size = 0
@@ -48,64 +448,683 @@ def distribute_images(image_files, output_folders, max_size_bytes):
     
     return distribution
 
-def copy_images(distribution):
-    total_files = sum(len(files) for files in distribution.values())
-    copied_files = 0
-    
+def unique_member_names(files):
+    """File names inside one folder; same-named files from different directories get a _1, _2 suffix"""
+    names = []
+    used = set()
+    for file_path in files:
+        name = os.path.basename(file_path)
+        stem, extension = os.path.splitext(name)
+        counter = 1
+        # Compare case-insensitively so names stay distinct on Windows as well
+        while name.lower() in used:
+            name = f"{stem}_{counter}{extension}"
+            counter += 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+def copy_images(distribution, progress=None):
     for folder, files in distribution.items():
-        for file_path in files:
-            dest_path = os.path.join(folder, os.path.basename(file_path))
+        for file_path, name in zip(files, unique_member_names(files)):
+            dest_path = os.path.join(folder, name)
             shutil.copy2(file_path, dest_path)
-            copied_files += 1
-            print(f"Progress: {copied_files}/{total_files} ({(copied_files/total_files)*100:.1f}%) - {file_path} -> {dest_path}")
+            if progress:
+                progress.update(1, os.path.getsize(dest_path))
 
-def zip_folders(output_folders):
-    print("Compressing folders...")
-    for folder in output_folders:
-        zip_path = f"{folder}.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, _, files in os.walk(folder):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, os.path.dirname(folder))
+class _SequentialWriter:
+    """Write-only file wrapper without seek, so archives are written in one forward pass"""
+    def __init__(self, path):
+        self._file = open(path, 'wb', buffering=WRITE_BUFFER_SIZE)
+
+    def write(self, data):
+        return self._file.write(data)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_folder_members(folder):
+    for root, _, files in os.walk(folder):
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            arcname = os.path.relpath(file_path, os.path.dirname(folder))
+            yield file_path, arcname
+
+class _MemoryBudget:
+    """Byte budget shared by the pipeline stages; acquire blocks until enough memory is released"""
+    def __init__(self, limit):
+        self.limit = limit
+        self._used = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self, amount):
+        with self._condition:
+            while not self._closed and self._used and self._used + amount > self.limit:
+                self._condition.wait()
+            self._used += amount
+            return not self._closed
+
+    def release(self, amount):
+        with self._condition:
+            self._used -= amount
+            self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+def iter_prefetched_members(folder, prepare=None):
+    """Yield (file_path, arcname, payload) in archive order while later members are read ahead
+    
+    Reader threads load upcoming files and, if given, prepare() turns the data into the payload on a
+    separate pool (e.g. compression). Everything in flight is capped by pipeline_memory_mb; members
+    that do not fit in the budget are yielded with payload None so the caller can stream them.
+    """
+    budget = _MemoryBudget(pipeline_memory_mb * 1024 * 1024)
+    pending = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    read_pool = ThreadPoolExecutor(max_workers=pipeline_readers)
+    work_pool = ThreadPoolExecutor(max_workers=pipeline_workers or os.cpu_count() or 1) if prepare else None
+    
+    def load(file_path, size):
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if prepare is None:
+            return data
+        
+        def run():
+            try:
+                return prepare(data)
+            finally:
+                # The raw data is dropped once it is compressed
+                budget.release(size)
+        return work_pool.submit(run)
+    
+    def schedule():
+        for file_path, arcname in iter_folder_members(folder):
+            size = os.path.getsize(file_path)
+            # Raw data and its compressed copy exist together while prepare() runs
+            reserved = size * 2 if prepare else size
+            if reserved > budget.limit:
+                pending.put((file_path, arcname, None, 0))
+                continue
+            if not budget.acquire(reserved):
+                return
+            pending.put((file_path, arcname, read_pool.submit(load, file_path, size), size))
+        pending.put(None)
+    
+    scheduler = threading.Thread(target=schedule, daemon=True)
+    scheduler.start()
+    try:
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            file_path, arcname, future, size = item
+            if future is None:
+                yield file_path, arcname, None
+                continue
+            payload = future.result()
+            if prepare:
+                payload = payload.result()
+            try:
+                yield file_path, arcname, payload
+            finally:
+                budget.release(size)
+    finally:
+        # Unblock the scheduler if the writer stopped early
+        budget.close()
+        while scheduler.is_alive():
+            try:
+                pending.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        read_pool.shutdown(cancel_futures=True)
+        if work_pool:
+            work_pool.shutdown(cancel_futures=True)
+
+def deflate_member(data):
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return zlib.crc32(data), compressor.compress(data) + compressor.flush(), len(data)
+
+# Private ZipFile members used by write_precompressed_member (checked on CPython 3.9-3.13)
+PRECOMPRESSED_ZIP_MEMBERS = ("_writecheck", "_didModify", "fp", "start_dir", "filelist", "NameToInfo")
+
+def supports_precompressed_members(zipf):
+    """Whether this Python's zipfile lets us append pre-deflated data (otherwise ZipFile.writestr compresses)"""
+    return hasattr(zipfile.ZipInfo, "FileHeader") and all(hasattr(zipf, name) for name in PRECOMPRESSED_ZIP_MEMBERS)
+
+def write_precompressed_member(zipf, zinfo, crc, compressed, file_size):
+    """Append already-deflated data to an open ZipFile (zipfile has no public API for this)"""
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.compress_size = len(compressed)
+    zinfo.file_size = file_size
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+def write_zip_archive(folder, archive_path, progress=None):
+    # Members are read ahead and deflated in parallel; this thread only appends them in order.
+    # ZipFile falls back to data descriptors when the file cannot seek, so headers are never rewritten
+    with _SequentialWriter(archive_path) as out:
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # On a Python whose zipfile internals changed, members are only read ahead and writestr compresses them
+            precompress = supports_precompressed_members(zipf)
+            for file_path, arcname, payload in iter_prefetched_members(folder, deflate_member if precompress else None):
+                if payload is None:
                     zipf.write(file_path, arcname)
-        print(f"Compression completed: {zip_path}")
+                    file_size = os.path.getsize(file_path)
+                elif precompress:
+                    write_precompressed_member(zipf, zipfile.ZipInfo.from_file(file_path, arcname), *payload)
+                    file_size = payload[2]
+                else:
+                    zipf.writestr(zipfile.ZipInfo.from_file(file_path, arcname), payload, compress_type=zipfile.ZIP_DEFLATED)
+                    file_size = len(payload)
+                if progress:
+                    progress.update(1, file_size)
+
+def add_tar_members(tarf, folder, progress=None):
+    for file_path, arcname, data in iter_prefetched_members(folder):
+        if data is None:
+            tarf.add(file_path, arcname)
+            file_size = os.path.getsize(file_path)
+        else:
+            tarinfo = tarf.gettarinfo(file_path, arcname)
+            tarinfo.size = file_size = len(data)
+            tarf.addfile(tarinfo, io.BytesIO(data))
+        if progress:
+            progress.update(1, file_size)
+
+def write_tar_archive(folder, archive_path, compression="", progress=None):
+    # GNU format: the default PAX format adds a 1KB PAX header for every fractional mtime or non-ASCII name, overshooting the plan
+    with _SequentialWriter(archive_path) as out:
+        if compression == "zst":
+            cctx = zstandard.ZstdCompressor(level=3, threads=-1, write_checksum=True)
+            with cctx.stream_writer(out, closefd=False) as zst_out:
+                with tarfile.open(fileobj=zst_out, mode="w|", bufsize=WRITE_BUFFER_SIZE, format=tarfile.GNU_FORMAT) as tarf:
+                    add_tar_members(tarf, folder, progress)
+        else:
+            with tarfile.open(fileobj=out, mode=f"w|{compression}", bufsize=WRITE_BUFFER_SIZE, format=tarfile.GNU_FORMAT) as tarf:
+                add_tar_members(tarf, folder, progress)
+
+def deflate_overhead(size):
+    # Already-compressed images end up in stored blocks: 5 bytes per block of at most 16KB
+    return 5 * (size // 16384 + 1)
+
+def zip_member_overhead(name, size):
+    # Local file header + data descriptor + central directory entry, each holding the member name
+    arcname_length = len(f"images_000/{name}".encode('utf-8'))
+    return 30 + arcname_length + 16 + 46 + arcname_length + deflate_overhead(size)
+
+def tar_member_overhead(name, size):
+    # 512-byte header, a GNU long-name header for names over 100 bytes, and padding of the data to a block boundary
+    arcname_length = len(f"images_000/{name}".encode('utf-8'))
+    overhead = 2 * TAR_BLOCK_SIZE
+    if arcname_length > 100:
+        overhead += 2 * TAR_BLOCK_SIZE + arcname_length
+    return overhead
+
+def compressed_tar_member_overhead(name, size):
+    return tar_member_overhead(name, size) + deflate_overhead(size)
+
+ARCHIVE_BACKENDS = {
+    "zip": {
+        "extension": ".zip",
+        "writer": write_zip_archive,
+        "member_overhead": zip_member_overhead,
+        "archive_overhead": 22,
+    },
+    "tar": {
+        "extension": ".tar",
+        "writer": write_tar_archive,
+        "member_overhead": tar_member_overhead,
+        "archive_overhead": tarfile.RECORDSIZE,
+    },
+    "tar.gz": {
+        "extension": ".tar.gz",
+        "writer": lambda folder, archive_path, progress=None: write_tar_archive(folder, archive_path, "gz", progress),
+        "member_overhead": compressed_tar_member_overhead,
+        "archive_overhead": tarfile.RECORDSIZE,
+    },
+    "tar.zst": {
+        "extension": ".tar.zst",
+        "writer": lambda folder, archive_path, progress=None: write_tar_archive(folder, archive_path, "zst", progress),
+        "member_overhead": compressed_tar_member_overhead,
+        "archive_overhead": tarfile.RECORDSIZE,
+    },
+}
+
+def available_archive_formats():
+    return [name for name in ARCHIVE_BACKENDS if name != "tar.zst" or zstandard is not None]
+
+def get_archive_backend(archive_format):
+    if archive_format not in ARCHIVE_BACKENDS:
+        raise ValueError(f"Unknown archive format: {archive_format} (available: {', '.join(ARCHIVE_BACKENDS)})")
+    if archive_format not in available_archive_formats():
+        raise ValueError(f"The {archive_format} format requires the zstandard module: pip install zstandard")
+    return ARCHIVE_BACKENDS[archive_format]
+
+def get_folder_size(folder):
+    return sum(os.path.getsize(file_path) for file_path, _ in iter_folder_members(folder))
+
+def build_expected_members(distribution, file_sizes):
+    expected_members = {}
+    for folder, files in distribution.items():
+        folder_name = os.path.basename(folder)
+        expected_members[folder] = {
+            f"{folder_name}/{name}": file_sizes[path] for path, name in zip(files, unique_member_names(files))
+        }
+    return expected_members
+
+def write_manifest(manifest_path, distribution, file_sizes, archive_format, source_roots):
+    """Record, for every archive member, the original relative path and size used by join mode"""
+    extension = ARCHIVE_BACKENDS[archive_format]["extension"]
+    archives = []
+    for folder, files in distribution.items():
+        folder_name = os.path.basename(folder)
+        members = []
+        for path, name in zip(files, unique_member_names(files)):
+            absolute_path = os.path.abspath(path)
+            root = next(root for root in source_roots if os.path.commonpath([root, absolute_path]) == root)
+            members.append({
+                "name": f"{folder_name}/{name}",
+                "path": os.path.relpath(absolute_path, root).replace(os.sep, "/"),
+                "size": file_sizes[path],
+            })
+        archives.append({"archive": folder_name + extension, "members": members})
+    
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({"archive_format": archive_format, "files": sum(len(files) for files in distribution.values()),
+                   "archives": archives}, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"Manifest saved: {manifest_path}")
+
+def read_member_size(member):
+    size = 0
+    while True:
+        chunk = member.read(VERIFY_READ_SIZE)
+        if not chunk:
+            return size
+        size += len(chunk)
+
+def read_zip_members(archive_path):
+    members = {}
+    errors = []
+    with zipfile.ZipFile(archive_path) as zipf:
+        for info in zipf.infolist():
+            # Reading a member to the end makes zipfile compare its CRC-32
+            try:
+                with zipf.open(info) as member:
+                    members[info.filename] = read_member_size(member)
+            except Exception as e:
+                members[info.filename] = None
+                errors.append((info.filename, str(e)))
+    return members, errors
+
+def read_tar_members(archive_path, archive_format):
+    members = {}
+    errors = []
+    current_name = "(archive header)"
+    with open(archive_path, 'rb') as f:
+        if archive_format == "tar.zst":
+            stream = zstandard.ZstdDecompressor().stream_reader(f)
+        elif archive_format == "tar.gz":
+            stream = gzip.GzipFile(fileobj=f)
+        else:
+            # Plain tar has no data checksum, so only headers, sizes and truncation can be checked
+            stream = f
+        try:
+            with tarfile.open(fileobj=stream, mode="r|") as tarf:
+                for info in tarf:
+                    current_name = info.name
+                    if info.isfile():
+                        members[info.name] = read_member_size(tarf.extractfile(info))
+            # Read to the end of the compressed stream so its trailing checksum is compared too
+            current_name = "(archive end)"
+            read_member_size(stream)
+        except Exception as e:
+            # A damaged stream cannot be resumed, so report the member being read when it broke
+            errors.append((current_name, str(e)))
+    return members, errors
+
+def verify_archive(archive_path, archive_format, expected):
+    """Re-read an archive (checking CRCs) and compare its members with the distribution plan"""
+    try:
+        if archive_format == "zip":
+            members, errors = read_zip_members(archive_path)
+        else:
+            members, errors = read_tar_members(archive_path, archive_format)
+    except Exception as e:
+        return {"archive": archive_path, "members": 0, "errors": [("(archive)", f"Cannot open archive: {e}")]}
+    
+    unreadable = {name for name, _ in errors}
+    for name, size in expected.items():
+        if name in unreadable:
+            continue
+        if name not in members:
+            errors.append((name, "Missing from archive"))
+        elif members[name] != size:
+            errors.append((name, f"Size mismatch: {members[name]} bytes (planned {size} bytes)"))
+    for name in members:
+        if name not in expected:
+            errors.append((name, "Not in distribution plan"))
+    if len(members) != len(expected):
+        errors.append(("(archive)", f"Member count mismatch: {len(members)} (planned {len(expected)})"))
+    
+    return {"archive": archive_path, "members": len(members), "errors": errors}
+
+def report_verification(results):
+    failed = [result for result in results if result["errors"]]
+    total_members = sum(result["members"] for result in results)
+    if not failed:
+        print(f"Verification passed: {len(results)} archives, {total_members} files")
+        return True
+    
+    print(f"Verification failed: {len(failed)}/{len(results)} archives")
+    for result in failed:
+        print(f"  {result['archive']}")
+        for name, message in result["errors"]:
+            print(f"    - {name}: {message}")
+    return False
 
-def calculate_required_folders(image_files, max_size_bytes):
+def archive_folders(output_folders, archive_format="zip", expected_members=None, progress=None, verify_progress=None,
+                    max_archive_bytes=None):
+    backend = get_archive_backend(archive_format)
+    print(f"Compressing folders... ({archive_format})")
+    log = progress.log if progress else print
+    total_input_bytes = 0
+    total_output_bytes = 0
+    total_seconds = 0.0
+    
+    # Each archive is verified in a separate process while the next one is being built
+    verify_pool = ProcessPoolExecutor(max_workers=verify_workers) if expected_members is not None else None
+    verify_futures = []
+    oversized = {}
+    
+    for folder in output_folders:
+        archive_path = f"{folder}{backend['extension']}"
+        input_bytes = get_folder_size(folder)
+        start_time = time.perf_counter()
+        backend["writer"](folder, archive_path, progress=progress)
+        seconds = time.perf_counter() - start_time
+        output_bytes = os.path.getsize(archive_path)
+        
+        total_input_bytes += input_bytes
+        total_output_bytes += output_bytes
+        total_seconds += seconds
+        log(f"Compression completed: {archive_path} ({input_bytes / (1024 * 1024) / max(seconds, 1e-6):.1f}MB/s)")
+        if max_archive_bytes and output_bytes > max_archive_bytes:
+            oversized[archive_path] = output_bytes
+            log(f"⚠️ Over the size limit: {archive_path} ({output_bytes:,} bytes, limit {max_archive_bytes:,} bytes)")
+        
+        if verify_pool:
+            future = verify_pool.submit(verify_archive, archive_path, archive_format, expected_members[folder])
+            if verify_progress:
+                # Counted silently while compression is still drawing its own progress line
+                future.add_done_callback(lambda f, nbytes=input_bytes: verify_progress.update(f.result()["members"], nbytes))
+            verify_futures.append(future)
+    
+    stages = [progress.finish()] if progress else []
+    throughput = total_input_bytes / (1024 * 1024) / max(total_seconds, 1e-6)
+    print(f"{archive_format} throughput: {total_input_bytes / (1024 * 1024):.2f}MB in {total_seconds:.2f}s ({throughput:.1f}MB/s)")
+    stats = {
+        "format": archive_format,
+        "archives": len(output_folders),
+        "input_bytes": total_input_bytes,
+        "output_bytes": total_output_bytes,
+        "seconds": total_seconds,
+        "stages": stages,
+    }
+    
+    if verify_pool:
+        start_time = time.perf_counter()
+        if verify_progress:
+            verify_progress.display = True
+        stats["verification"] = [future.result() for future in verify_futures]
+        verify_pool.shutdown()
+        if verify_progress:
+            stages.append(verify_progress.finish())
+        print(f"Waited {time.perf_counter() - start_time:.2f}s for verification after the last archive")
+        # Unless a single file is larger than the limit, an oversized archive means the plan was wrong
+        for folder, result in zip(output_folders, stats["verification"]):
+            if result["archive"] in oversized and len(expected_members[folder]) > 1:
+                result["errors"].append(("(size)", f"Archive is {oversized[result['archive']]:,} bytes, over the {max_archive_bytes:,} byte limit"))
+    stats["oversized"] = len(oversized)
+    
+    return stats
+
+def zip_folders(output_folders):
+    return archive_folders(output_folders, "zip")
+
+def compare_archive_backends(folder):
+    """Archive one folder with every available format into a temporary directory and report throughput"""
+    print(f"Comparing archive format throughput: {folder}")
+    input_mb = get_folder_size(folder) / (1024 * 1024)
+    results = []
+    
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(folder)) as temp_dir:
+        for name in available_archive_formats():
+            backend = ARCHIVE_BACKENDS[name]
+            archive_path = os.path.join(temp_dir, os.path.basename(folder) + backend["extension"])
+            start_time = time.perf_counter()
+            backend["writer"](folder, archive_path)
+            seconds = max(time.perf_counter() - start_time, 1e-6)
+            output_mb = os.path.getsize(archive_path) / (1024 * 1024)
+            results.append((name, input_mb / seconds, output_mb))
+            os.remove(archive_path)
+    
+    results.sort(key=lambda x: x[1], reverse=True)
+    for name, throughput, output_mb in results:
+        print(f"  {name:8s} {throughput:8.1f}MB/s  {output_mb:.2f}MB")
+    return results
+
+def iter_archive_members(archive_path, archive_format):
+    """Yield (member name, readable file object) in the order the members are stored"""
+    if archive_format == "zip":
+        with zipfile.ZipFile(archive_path) as zipf:
+            for info in zipf.infolist():
+                if not info.is_dir():
+                    with zipf.open(info) as member:
+                        yield info.filename, member
+        return
+    
+    with open(archive_path, 'rb') as f:
+        if archive_format == "tar.zst":
+            stream = zstandard.ZstdDecompressor().stream_reader(f)
+        elif archive_format == "tar.gz":
+            stream = gzip.GzipFile(fileobj=f)
+        else:
+            stream = f
+        with tarfile.open(fileobj=stream, mode="r|") as tarf:
+            for info in tarf:
+                if info.isfile():
+                    yield info.name, tarf.extractfile(info)
+
+def extract_archive(archive_path, archive_format, members, restore_root):
+    """Extract one archive in stored order to the original relative paths and check each size"""
+    expected = {member["name"]: member for member in members}
+    restored = set()
+    restored_paths = set()
+    errors = []
+    restored_bytes = 0
+    
+    for name, source in iter_archive_members(archive_path, archive_format):
+        member = expected.get(name)
+        if member is None:
+            errors.append((name, "Not in manifest"))
+            continue
+        target_path = os.path.normpath(os.path.join(restore_root, member["path"]))
+        if os.path.commonpath([restore_root, target_path]) != restore_root:
+            errors.append((name, f"Path outside the restore directory: {member['path']}"))
+            continue
+        
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        with open(target_path, 'wb') as target:
+            shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+            written = target.tell()
+        restored.add(name)
+        restored_paths.add(target_path)
+        restored_bytes += written
+        if written != member["size"]:
+            errors.append((name, f"Size mismatch: {written} bytes (manifest {member['size']} bytes)"))
+    
+    failed = {error_name for error_name, _ in errors}
+    for name in expected:
+        if name not in restored and name not in failed:
+            errors.append((name, "Missing from archive"))
+    return {"archive": archive_path, "files": len(restored), "bytes": restored_bytes, "errors": errors, "paths": restored_paths}
+
+def join_archives(archive_dir, restore_root):
+    """Restore the original directory tree from split archives, extracting several archives at once"""
+    manifest_path = os.path.join(archive_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        print(f"Manifest not found: {manifest_path}")
+        return False
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    archive_format = manifest["archive_format"]
+    get_archive_backend(archive_format)
+    restore_root = os.path.abspath(restore_root)
+    os.makedirs(restore_root, exist_ok=True)
+    print(f"Restoring {len(manifest['archives'])} archives ({archive_format}) to {restore_root}")
+    
+    # Every worker reads its archive front to back and writes members in that order; the worker
+    # count bounds how many write streams the target disk has to interleave at once
+    archives = sorted(manifest["archives"], key=lambda a: sum(m["size"] for m in a["members"]), reverse=True)
+    start_time = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=join_workers) as pool:
+        futures = [
+            pool.submit(extract_archive, os.path.join(archive_dir, archive["archive"]), archive_format,
+                        archive["members"], restore_root)
+            for archive in archives
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"Extraction completed: {result['archive']} ({result['files']} files)")
+    
+    seconds = max(time.perf_counter() - start_time, 1e-6)
+    total_bytes = sum(result["bytes"] for result in results)
+    print(f"Restored {sum(result['files'] for result in results)} files, "
+          f"{total_bytes / (1024 * 1024):.2f}MB in {seconds:.2f}s ({total_bytes / (1024 * 1024) / seconds:.1f}MB/s)")
+    # Two source files restored to the same path (overwritten) pass the per-member checks but leave the count short
+    source_files = manifest.get("files", sum(len(archive["members"]) for archive in manifest["archives"]))
+    restored_files = len(set().union(*(result["paths"] for result in results)))
+    verification = [
+        {"archive": result["archive"], "members": result["files"], "errors": result["errors"]} for result in results
+    ]
+    if restored_files != source_files:
+        verification.append({"archive": restore_root, "members": 0,
+                             "errors": [("(restore)", f"Restored file count mismatch: {restored_files} files (source {source_files} files)")]})
+    return report_verification(verification)
+
+def calculate_required_folders(image_files, max_size_bytes, member_overhead=None):
     total_size = sum(size for _, size in image_files)
+    if member_overhead:
+        total_size += sum(member_overhead(os.path.basename(path), size) for path, size in image_files)
     num_folders = (total_size + max_size_bytes - 1) // max_size_bytes
     return max(1, int(num_folders))
 
 def main():
-    max_size_bytes = max_size_mb * 1024 * 1024
+    backend = get_archive_backend(archive_format)
+    if transform_format not in (None, *TRANSFORM_FORMATS):
+        raise ValueError(f"Unknown transform format: {transform_format} (available: {', '.join(TRANSFORM_FORMATS)})")
+    if dedupe_policy not in (None, "keep", "drop", "list"):
+        raise ValueError(f"Unknown near-duplicate policy: {dedupe_policy} (available: keep, drop, list)")
+    # Leave room for the end-of-archive structures of the chosen format
+    max_size_bytes = max_size_mb * 1024 * 1024 - backend["archive_overhead"]
     
     print(f"Source directory: {source_dir}")
     print(f"Output directory: {output_dir}")
     print(f"Maximum size per folder: {max_size_mb}MB")
+    print(f"Archive format: {archive_format}")
     
     os.makedirs(output_dir, exist_ok=True)
     
+    run_start = time.perf_counter()
+    stages = []
+    
     print("Scanning image files...")
-    image_files = get_all_image_files(source_dir)
+    progress = ProgressReporter("scan")
+    image_files = get_all_image_files(source_dir, progress)
+    stages.append(progress.finish())
     print(f"Found {len(image_files)} image files in total.")
     
     if not image_files:
         print("No image files found. Exiting.")
         return
     
-    num_folders = calculate_required_folders(image_files, max_size_bytes)
+    if dedupe_policy:
+        print("Finding near-duplicate images...")
+        progress = ProgressReporter("dedupe", len(image_files), sum(size for _, size in image_files))
+        image_files = dedupe_images(image_files, dedupe_policy, os.path.join(output_dir, "near_duplicates.txt"), progress)
+        stages.append(progress.finish())
+    
+    transform_dir = None
+    if transform_format or transform_max_dimension:
+        print("Transforming image files...")
+        transform_dir = os.path.join(output_dir, "_transformed")
+        progress = ProgressReporter("transform", len(image_files), sum(size for _, size in image_files))
+        image_files = transform_images(image_files, source_dir, transform_dir, progress)
+        stages.append(progress.finish())
+    
+    total_files = len(image_files)
+    total_bytes = sum(size for _, size in image_files)
+    num_folders = calculate_required_folders(image_files, max_size_bytes, backend["member_overhead"])
     print(f"Number of folders required: {num_folders}")
     
     output_folders = create_output_folders(output_dir, num_folders)
     
     print("Creating image file distribution plan...")
-    distribution = distribute_images(image_files, output_folders, max_size_bytes)
+    progress = ProgressReporter("plan", total_files, total_bytes)
+    distribution = distribute_images(image_files, output_folders, max_size_bytes, backend["member_overhead"], progress)
+    stages.append(progress.finish())
     
     print("Copying image files...")
-    copy_images(distribution)
+    progress = ProgressReporter("copy", total_files, total_bytes)
+    copy_images(distribution, progress)
+    stages.append(progress.finish())
     
-    # Create zip files from folders
-    zip_folders(output_folders)
+    source_roots = [os.path.abspath(root) for root in (transform_dir, source_dir) if root]
+    write_manifest(os.path.join(output_dir, MANIFEST_NAME), distribution, dict(image_files), archive_format, source_roots)
+    
+    if transform_dir and os.path.exists(transform_dir):
+        shutil.rmtree(transform_dir)
+    
+    if compare_backends:
+        compare_archive_backends(output_folders[0])
+    
+    expected_members = None
+    if verify_archives:
+        expected_members = build_expected_members(distribution, dict(image_files))
+    
+    # Create archive files from folders
+    progress = ProgressReporter("compress", total_files, total_bytes)
+    verify_progress = ProgressReporter("verify", total_files, total_bytes, display=False) if verify_archives else None
+    archive_stats = archive_folders(output_folders, archive_format, expected_members, progress, verify_progress,
+                                    max_archive_bytes=int(max_size_mb * 1024 * 1024))
+    stages.extend(archive_stats["stages"])
+    verified = report_verification(archive_stats["verification"]) if verify_archives else True
     
     # Print folder information after compression
     print("Task completed!")
@@ -113,9 +1132,25 @@ def main():
     for folder in output_folders:
         folder_size_bytes = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f)))
         folder_size_mb = folder_size_bytes / (1024 * 1024)
-        zip_size_bytes = os.path.getsize(f"{folder}.zip") if os.path.exists(f"{folder}.zip") else 0
-        zip_size_mb = zip_size_bytes / (1024 * 1024)
-        print(f"{folder}: {len(os.listdir(folder))} files, {folder_size_mb:.2f}MB (zip file: {zip_size_mb:.2f}MB)")
+        archive_path = f"{folder}{backend['extension']}"
+        archive_size_bytes = os.path.getsize(archive_path) if os.path.exists(archive_path) else 0
+        archive_size_mb = archive_size_bytes / (1024 * 1024)
+        print(f"{folder}: {len(os.listdir(folder))} files, {folder_size_mb:.2f}MB (archive file: {archive_size_mb:.2f}MB)")
+    
+    write_summary(os.path.join(output_dir, SUMMARY_NAME), {
+        "archive_format": archive_format,
+        "files": total_files,
+        "input_bytes": archive_stats["input_bytes"],
+        "archives": archive_stats["archives"],
+        "output_bytes": archive_stats["output_bytes"],
+        "verified": verified if verify_archives else None,
+        "seconds": round(time.perf_counter() - run_start, 3),
+        "stages": stages,
+    })
+    
+    if not verified:
+        print("Archive verification failed. Keeping the original folders.")
+        return
     
     # Ask whether to delete original folders after compression
     delete_folders = input("Compression is complete. Would you like to delete the original folders? (y/n): ")
@@ -125,4 +1160,10 @@ def main():
             print(f"Deleted: {folder}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python image_splitter.py join [archive directory] [restore directory]
+    if len(sys.argv) > 1 and sys.argv[1] == "join":
+        archive_dir = sys.argv[2] if len(sys.argv) > 2 else output_dir
+        restore_root = sys.argv[3] if len(sys.argv) > 3 else restore_dir
+        join_archives(archive_dir, restore_root)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# image_splitter_bench.py
+"""
+Benchmark and regression suite for image_splitter packing and I/O
+
+Usage:
+    python image_splitter_bench.py plan [--entries 10000,100000,1000000] [--output result.json]
+    python image_splitter_bench.py e2e [--files 2000] [--formats zip,tar] [--output result.json]
+    python image_splitter_bench.py all [--output result.json]
+    python image_splitter_bench.py compare baseline.json result.json [--tolerance 10]
+
+plan : distribute_images quality (bins used compared with the lower bound, fill variance) and speed
+e2e  : scan, plan, copy, archive and verify times on generated files in tmpfs (/dev/shm when available)
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import image_splitter
+
+MB = 1024 * 1024
+
+def uniform_sizes(rng, count):
+    return [rng.randint(200 * 1024, 8 * MB) for _ in range(count)]
+
+def heavy_tailed_sizes(rng, count):
+    # Mostly small thumbnails with a long tail of very large panoramas/scans (Pareto, alpha 1.2)
+    return [min(int(50 * 1024 * rng.paretovariate(1.2)), 400 * MB) for _ in range(count)]
+
+def bimodal_sizes(rng, count):
+    # RAW + JPEG pairs from cameras: ~25MB RAW files next to ~4MB JPEG files
+    sizes = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            sizes.append(max(int(rng.gauss(25 * MB, 4 * MB)), MB))
+        else:
+            sizes.append(max(int(rng.gauss(4 * MB, MB)), 100 * 1024))
+    return sizes
+
+DISTRIBUTIONS = {
+    "uniform": uniform_sizes,
+    "heavy_tailed": heavy_tailed_sizes,
+    "bimodal": bimodal_sizes,
+}
+
+def generate_sizes(distribution, count, seed=0):
+    return DISTRIBUTIONS[distribution](random.Random(f"{distribution}-{count}-{seed}"), count)
+
+def measure_plan(distribution, count, max_size_mb, archive_format, seed=0):
+    """Run calculate_required_folders + distribute_images on synthetic entries and score the plan"""
+    backend = image_splitter.get_archive_backend(archive_format)
+    capacity = max_size_mb * MB - backend["archive_overhead"]
+    member_overhead = backend["member_overhead"]
+    image_files = [(f"IMG_{i:08d}.jpg", size) for i, size in enumerate(generate_sizes(distribution, count, seed))]
+    effective_sizes = {path: size + member_overhead(path, size) for path, size in image_files}
+    
+    start_time = time.perf_counter()
+    num_folders = image_splitter.calculate_required_folders(image_files, capacity, member_overhead)
+    folders = [f"images_{i:03d}" for i in range(1, num_folders + 1)]
+    plan = image_splitter.distribute_images(image_files, folders, capacity, member_overhead)
+    seconds = time.perf_counter() - start_time
+    
+    fills = [sum(effective_sizes[path] for path in files) for files in plan.values() if files]
+    fill_ratios = [fill / capacity for fill in fills]
+    lower_bound = math.ceil(sum(effective_sizes.values()) / capacity)
+    return {
+        "distribution": distribution,
+        "entries": count,
+        "max_size_mb": max_size_mb,
+        "archive_format": archive_format,
+        "bins_used": len(fills),
+        "lower_bound": lower_bound,
+        "excess_bins": len(fills) - lower_bound,
+        "overfull_bins": sum(1 for fill in fills if fill > capacity),
+        "max_fill": max(fill_ratios),
+        "fill_mean": statistics.mean(fill_ratios),
+        "fill_variance": statistics.pvariance(fill_ratios),
+        "seconds": seconds,
+        "entries_per_second": count / max(seconds, 1e-9),
+    }
+
+def default_e2e_dir():
+    # tmpfs keeps the benchmark about CPU and code paths rather than the disk under test
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+def create_fixture(source_dir, distribution, count, scale, seed=0):
+    block = random.Random(seed).randbytes(4 * MB)
+    total_bytes = 0
+    for i, size in enumerate(generate_sizes(distribution, count, seed)):
+        size = max(int(size * scale), 1)
+        sub_dir = os.path.join(source_dir, f"dir_{i % 50:02d}")
+        os.makedirs(sub_dir, exist_ok=True)
+        with open(os.path.join(sub_dir, f"IMG_{i:07d}.jpg"), 'wb') as f:
+            remaining = size
+            offset = (i * 7919) % len(block)
+            while remaining > 0:
+                chunk = block[offset:offset + remaining]
+                f.write(chunk)
+                remaining -= len(chunk)
+                offset = 0
+        total_bytes += size
+    return total_bytes
+
+def timed(function, *args):
+    start_time = time.perf_counter()
+    # image_splitter prints progress for every step; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args)
+    return result, time.perf_counter() - start_time
+
+def measure_e2e(distribution, count, scale, max_size_mb, archive_formats, base_dir, seed=0):
+    """Time scan, plan, copy, archive and verify on a generated fixture for each archive format"""
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="image_splitter_bench_", dir=base_dir)
+    try:
+        source_dir = os.path.join(work_dir, "source")
+        total_bytes = create_fixture(source_dir, distribution, count, scale, seed)
+        
+        for archive_format in archive_formats:
+            output_dir = os.path.join(work_dir, f"output_{archive_format}")
+            os.makedirs(output_dir)
+            backend = image_splitter.get_archive_backend(archive_format)
+            capacity = max_size_mb * MB - backend["archive_overhead"]
+            
+            image_files, scan_seconds = timed(image_splitter.get_all_image_files, source_dir)
+            start_time = time.perf_counter()
+            num_folders = image_splitter.calculate_required_folders(image_files, capacity, backend["member_overhead"])
+            folders = image_splitter.create_output_folders(output_dir, num_folders)
+            plan = image_splitter.distribute_images(image_files, folders, capacity, backend["member_overhead"])
+            plan_seconds = time.perf_counter() - start_time
+            _, copy_seconds = timed(image_splitter.copy_images, plan)
+            
+            expected_members = image_splitter.build_expected_members(plan, dict(image_files))
+            stats, archive_seconds = timed(image_splitter.archive_folders, folders, archive_format, expected_members)
+            failures = sum(1 for result in stats["verification"] if result["errors"])
+            
+            results.append({
+                "distribution": distribution,
+                "files": count,
+                "total_mb": total_bytes / MB,
+                "archive_format": archive_format,
+                "archives": num_folders,
+                "scan_seconds": scan_seconds,
+                "plan_seconds": plan_seconds,
+                "copy_seconds": copy_seconds,
+                "archive_seconds": archive_seconds,
+                "archive_mb_per_second": stats["input_bytes"] / MB / max(stats["seconds"], 1e-9),
+                "verification_failures": failures,
+            })
+            shutil.rmtree(output_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def print_plan_result(result):
+    print(f"{result['distribution']:13s} {result['entries']:>10,d}  bins {result['bins_used']:>6,d} "
+          f"(lower bound {result['lower_bound']:,d}, overfull {result['overfull_bins']})  "
+          f"fill var {result['fill_variance']:.4f}  {result['seconds']:.2f}s "
+          f"({result['entries_per_second']:,.0f} entries/s)")
+
+def print_e2e_result(result):
+    print(f"{result['distribution']:13s} {result['archive_format']:8s} {result['files']:,d} files "
+          f"{result['total_mb']:.1f}MB  scan {result['scan_seconds']:.2f}s  plan {result['plan_seconds']:.2f}s  "
+          f"copy {result['copy_seconds']:.2f}s  archive {result['archive_seconds']:.2f}s "
+          f"({result['archive_mb_per_second']:.1f}MB/s)  verification failures {result['verification_failures']}")
+
+def run_benchmarks(args):
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "plan": [],
+        "e2e": [],
+    }
+    distributions = args.distributions.split(",")
+    
+    if args.command in ("plan", "all"):
+        print("== Packing plan ==")
+        for distribution in distributions:
+            for count in (int(entries) for entries in args.entries.split(",")):
+                result = measure_plan(distribution, count, args.max_size_mb, args.plan_format, args.seed)
+                print_plan_result(result)
+                report["plan"].append(result)
+    
+    if args.command in ("e2e", "all"):
+        print(f"== End to end ({args.e2e_dir}) ==")
+        formats = [name for name in args.formats.split(",") if name in image_splitter.available_archive_formats()]
+        for distribution in distributions:
+            for result in measure_e2e(distribution, args.files, args.scale, args.e2e_max_size_mb, formats,
+                                      args.e2e_dir, args.seed):
+                print_e2e_result(result)
+                report["e2e"].append(result)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved: {args.output}")
+
+# Time fields are compared as regressions beyond the tolerance; quality fields must not grow at all
+PLAN_KEYS = ("distribution", "entries", "max_size_mb", "archive_format")
+E2E_KEYS = ("distribution", "files", "archive_format")
+TIME_FIELDS = ("seconds", "scan_seconds", "plan_seconds", "copy_seconds", "archive_seconds")
+QUALITY_FIELDS = ("bins_used", "overfull_bins", "verification_failures")
+MIN_TIME_DELTA = 0.05   # Time differences below this (seconds) are treated as noise
+
+def compare_reports(baseline_path, current_path, tolerance):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(current_path, encoding='utf-8') as f:
+        current = json.load(f)
+    
+    regressions = 0
+    for section, keys in (("plan", PLAN_KEYS), ("e2e", E2E_KEYS)):
+        baseline_results = {tuple(result[key] for key in keys): result for result in baseline.get(section, [])}
+        for result in current.get(section, []):
+            key = tuple(result[key] for key in keys)
+            if key not in baseline_results:
+                continue
+            old = baseline_results[key]
+            for field in TIME_FIELDS + QUALITY_FIELDS:
+                if field not in result or field not in old:
+                    continue
+                if field in TIME_FIELDS:
+                    change = (result[field] - old[field]) / max(old[field], 1e-9) * 100
+                    regressed = change > tolerance and result[field] - old[field] > MIN_TIME_DELTA
+                    detail = f"{old[field]:.3f}s -> {result[field]:.3f}s ({change:+.1f}%)"
+                else:
+                    regressed = result[field] > old[field]
+                    detail = f"{old[field]} -> {result[field]}"
+                if regressed:
+                    regressions += 1
+                print(f"{'REGRESSION' if regressed else 'ok':10s} {section} {'/'.join(map(str, key))} {field}: {detail}")
+    
+    print(f"{regressions} regressions (time tolerance {tolerance}%)")
+    return regressions == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="image_splitter benchmark and regression suite")
+    parser.add_argument("command", choices=["plan", "e2e", "all", "compare"])
+    parser.add_argument("reports", nargs="*", help="compare: baseline.json current.json")
+    parser.add_argument("--distributions", default=",".join(DISTRIBUTIONS))
+    parser.add_argument("--entries", default="10000,100000,1000000", help="plan: entry counts (up to 10000000)")
+    parser.add_argument("--max-size-mb", type=int, default=512, help="plan: maximum size per folder")
+    parser.add_argument("--plan-format", default="zip", help="plan: archive format used for overhead")
+    parser.add_argument("--files", type=int, default=2000, help="e2e: number of generated files")
+    parser.add_argument("--scale", type=float, default=0.01, help="e2e: multiplier applied to generated sizes")
+    parser.add_argument("--e2e-max-size-mb", type=int, default=16, help="e2e: maximum size per folder")
+    parser.add_argument("--formats", default="zip,tar,tar.gz,tar.zst", help="e2e: archive formats")
+    parser.add_argument("--e2e-dir", default=default_e2e_dir(), help="e2e: directory for the fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=10.0, help="compare: allowed time increase (%%)")
+    parser.add_argument("--output", help="JSON file to save the results to")
+    args = parser.parse_args()
+    
+    if args.command == "compare":
+        if len(args.reports) != 2:
+            parser.error("compare needs baseline.json and current.json")
+        sys.exit(0 if compare_reports(args.reports[0], args.reports[1], args.tolerance) else 1)
+    run_benchmarks(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# autosync_store_filter.py
+"""
+Git 고급 자동 동기화 v3.1의 대용량 파일 보관소 필터 (표준 라이브러리만 사용)
+
+git_advanced_automate.py가 보관 대상 파일을 처음 등록할 때 저장소 설정에 필터로 등록한다:
+    [filter "autosync-store"]
+        process = python autosync_store_filter.py <보관소 폴더>
+        required = true
+
+보관 대상 경로에 대한 git 명령(add, checkout, status 등)마다 git이 이 파일을 실행하므로
+GitPython 같은 외부 모듈을 불러오지 않는다. 이 파일을 옮겼다면 git_advanced_automate.py를 한 번 실행하면
+새 위치로 다시 등록된다.
+"""
+import hashlib
+import io
+import os
+import sys
+import tempfile
+
+class LargeFileStore:
+    """대용량 파일 보관소 (Git LFS와 같은 포인터 형식과 폴더 구조)
+    
+    git clean 필터가 파일 내용을 SHA-256 이름의 파일(objects/해시 앞 2자/다음 2자/해시)로 한 번만 저장하고
+    커밋에는 포인터만 넣는다. 같은 내용은 한 번만 보관되고, smudge 필터가 체크아웃 시 원래 내용으로 되돌린다.
+    """
+    FILTER_NAME = "autosync-store"
+    POINTER_HEADER = b"version https://git-lfs.github.com/spec/v1\n"
+    POINTER_MAX_BYTES = 1024
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+
+    def object_path(self, oid):
+        return os.path.join(self.directory, "objects", oid[:2], oid[2:4], oid)
+
+    def has_object(self, oid):
+        return os.path.isfile(self.object_path(oid))
+
+    @staticmethod
+    def make_pointer(oid, size):
+        return LargeFileStore.POINTER_HEADER + f"oid sha256:{oid}\nsize {size}\n".encode("ascii")
+
+    @staticmethod
+    def parse_pointer(data):
+        """포인터 내용이면 (해시, 크기), 아니면 None"""
+        if len(data) > LargeFileStore.POINTER_MAX_BYTES or not data.startswith(LargeFileStore.POINTER_HEADER):
+            return None
+        fields = dict(line.split(" ", 1) for line in data.decode("ascii", "replace").splitlines()[1:] if " " in line)
+        oid = fields.get("oid", "")
+        if not oid.startswith("sha256:") or not fields.get("size", "").isdigit():
+            return None
+        return oid[len("sha256:"):], int(fields["size"])
+
+    def store(self, chunks):
+        """파일 내용을 해시하면서 보관소에 저장하고 포인터 반환 (이미 포인터인 내용은 그대로 반환)"""
+        os.makedirs(self.directory, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
+        with tempfile.NamedTemporaryFile(dir=self.directory, prefix="incoming-", delete=False) as f:
+            temp_path = f.name
+            try:
+                for chunk in chunks:
+                    if size < self.POINTER_MAX_BYTES:
+                        head += chunk[:self.POINTER_MAX_BYTES + 1 - size]
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            except OSError:
+                f.close()
+                os.remove(temp_path)
+                raise
+        
+        if size == len(head) and self.parse_pointer(head):
+            # 보관소에 없어서 포인터로 남아 있던 파일
+            os.remove(temp_path)
+            return head
+        
+        oid = digest.hexdigest()
+        object_path = self.object_path(oid)
+        if os.path.exists(object_path):
+            # 같은 내용이 이미 있음 (다른 경로, 이전 버전, 다른 저장소)
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.replace(temp_path, object_path)
+        return self.make_pointer(oid, size)
+
+def run_store_filter(store_directory):
+    """git이 실행하는 필터 프로세스 (long-running filter process 프로토콜 버전 2)
+    
+    git 명령 하나가 이 프로세스를 한 번만 띄우고 보관 대상 파일마다 clean(작업 트리 → 인덱스)과
+    smudge(인덱스 → 작업 트리)를 요청한다. 표준 출력은 프로토콜 전용이므로 메시지는 표준 오류로 쓴다.
+    """
+    store = LargeFileStore(store_directory)
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    max_packet = 65516
+
+    def read_packet():
+        # pkt-line: 4자리 16진수 길이(자신 포함) + 내용, "0000"은 flush (None 반환)
+        header = stdin.read(4)
+        if len(header) < 4:
+            raise EOFError
+        length = int(header, 16)
+        return stdin.read(length - 4) if length else None
+
+    def read_content():
+        while (packet := read_packet()) is not None:
+            yield packet
+
+    def read_text():
+        return [packet.decode("utf-8", "surrogateescape").rstrip("\n") for packet in read_content()]
+
+    def write_packet(data):
+        stdout.write(f"{len(data) + 4:04x}".encode("ascii") + data)
+
+    def write_text(*lines):
+        for line in lines:
+            write_packet(line.encode("utf-8") + b"\n")
+        stdout.write(b"0000")
+        stdout.flush()
+
+    try:
+        if read_text() != ["git-filter-client", "version=2"]:
+            return 1
+        write_text("git-filter-server", "version=2")
+        capabilities = {line.split("=", 1)[1] for line in read_text() if line.startswith("capability=")}
+        write_text(*(f"capability={name}" for name in ("clean", "smudge") if name in capabilities))
+        
+        while True:
+            request = dict(line.split("=", 1) for line in read_text() if "=" in line)
+            command, pathname = request.get("command"), request.get("pathname", "")
+            content = read_content()
+            if command == "clean":
+                try:
+                    result = store.store(content)
+                except OSError as e:
+                    sys.stderr.write(f"❌ 보관소에 저장하지 못했습니다 ({pathname}): {str(e)}\n")
+                    command = None
+            elif command == "smudge":
+                # 포인터가 아닌 내용(보관 전에 커밋된 파일 등)은 그대로 돌려줌
+                result = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+                for chunk in content:
+                    result.write(chunk)
+                result.seek(0)
+                pointer = store.parse_pointer(result.read(store.POINTER_MAX_BYTES + 1))
+                result.seek(0)
+                if pointer and store.has_object(pointer[0]):
+                    result.close()
+                    result = open(store.object_path(pointer[0]), "rb")
+                elif pointer:
+                    sys.stderr.write(f"⚠️ 보관소에 없는 파일은 포인터로 둡니다: {pathname}\n")
+            
+            if command not in ("clean", "smudge"):
+                for _ in content:
+                    pass
+                write_text("status=error")
+                continue
+            
+            write_text("status=success")
+            if isinstance(result, bytes):
+                result = io.BytesIO(result)
+            with result:
+                while chunk := result.read(max_packet):
+                    write_packet(chunk)
+            # 빈 목록: 위의 status=success 유지
+            stdout.write(b"00000000")
+            stdout.flush()
+    except EOFError:
+        return 0
+
+if __name__ == "__main__":
+    # 사용법: python autosync_store_filter.py <보관소 폴더> (git이 filter.autosync-store.process로 실행)
+    if len(sys.argv) != 2:
+        sys.stderr.write("사용법: python autosync_store_filter.py <보관소 폴더>\n")
+        sys.exit(2)
+    sys.exit(run_store_filter(sys.argv[1]))
@@ -5,50 +5,105 @@ Git 고급 자동 동기화 서비스 v3.1
 
 새로운 기능:
 ✔️ 필요 모듈 자동 설치 (requirements.txt 기반)
-✔️ 자동 merge/rebase 처리
-✔️ 충돌 발생 시 자동으로 에디터 실행
+✔️ 자동 merge/rebase 처리 (rebase 모드: 병합 커밋 없이 히스토리를 한 줄로 유지, 충돌 시에만 병합)
+✔️ 충돌 발생 시 경로별 규칙으로 자동 해결 (ours/theirs/union/newest/keep-both, 규칙에 없는 파일은 격리 브랜치로)
 ✔️ 3-way merge와 rebase 상황 자동 감지 및 처리
 ✔️ 초기 저장소 설정 완전 자동화 (폴더 생성, clone, init)
 ✔️ 원격 변경사항 자동 pull 및 merge
 ✔️ 충돌 해결 후 자동 commit/continue
 ✔️ unrelated histories 오류 자동 해결
-📌 설정 위치: 139-157줄 (CONFIG 섹션)
+✔️ 대용량 저장소용 부분/얕은 클론 (필요할 때 파일 내용·히스토리 추가로 받기)
+✔️ git 프로세스 실행을 줄인 plumbing 커밋 백엔드 (실패 시 GitPython 방식으로 전환)
+✔️ 파일 변경 감지 즉시 동기화 (저장이 몰리면 한 번에 커밋, 안전망 주기 동기화 병행)
+✔️ 대형 작업 트리 자동 감지 (untrackedCache, manyFiles, fsmonitor: Linux는 변경 감지가 fsmonitor 훅에 답함)
+✔️ 선택: 대용량 파일 보호: 크기/형식 기준을 넘는 파일은 해시 이름으로 별도 보관소에 한 번만 저장하고 포인터만 커밋 (체크아웃 시 복원)
+✔️ 동기화가 없는 동안 객체 수 기준으로 저장소 정리 (prune, 팩 묶기, 점진적 재압축, commit-graph)
+✔️ 선택: 오래된 자동 커밋을 하루/주 단위로 합쳐 히스토리 압축 (force-with-lease, 사람이 만든 커밋은 그대로)
+✔️ 여러 저장소를 한 프로세스에서 동시에 동기화 (REPOS_FILE, 시작 시각 분산, 저장소별 재시도 간격)
+✔️ 동기화마다 단계별 시간과 결과를 SQLite에 기록 (--stats로 p50/p95 보기, Prometheus textfile 내보내기)
+✔️ 빠른 시작 (모듈 확인 결과 기록, pywin32는 서비스 모드에서만 사용) 및 Linux 포그라운드 실행 지원
+📌 설정 위치: 216-286줄 (CONFIG 섹션)
 📌 경로 설정 후 vbs파일에 바로가기 형식을 생성하여 시작프로그램으로 등록하세요
 """
 
 # 
 
+import atexit
+import fnmatch
+import importlib.util
+import json
+import math
 import os
+import random
+import shlex
+import signal
+import sqlite3
 import sys
 import subprocess
+import threading
 import time
 import traceback
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 
-# 필요한 모듈 자동 설치 함수
-def check_and_install_requirements():
-    """필요한 모듈을 확인하고 자동으로 설치"""
+STARTUP_TIME = time.perf_counter()
+STARTUP_TARGET_SECONDS = 1.0  # 시작 준비 시간이 이보다 길면 경고
+
+def get_cache_dir():
+    """사용자별 캐시 폴더 (Windows: %LOCALAPPDATA%, 그 외: $XDG_CACHE_HOME 또는 ~/.cache), 저장소 폴더에 파일을 남기지 않음"""
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        base = Path(os.environ["LOCALAPPDATA"])
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"))
+    return base / "git_advanced_automate"
+
+REQUIREMENTS_STAMP = get_cache_dir() / "requirements_ok"  # 필요 모듈 확인 결과 기록
+
+def get_required_modules():
+    """확인할 모듈과 설치할 패키지 (pywin32는 Windows 서비스 모드에만 필요)"""
     required_modules = {
         'git': 'gitpython>=3.1.40',
         'schedule': 'schedule>=1.2.0',
-        'win32service': 'pywin32>=306',
-        'win32serviceutil': 'pywin32>=306',
-        'win32event': 'pywin32>=306',
-        'servicemanager': 'pywin32>=306'
+        'watchdog': 'watchdog>=3.0.0'
     }
+    if sys.platform == "win32":
+        required_modules.update({
+            'win32service': 'pywin32>=306',
+            'win32serviceutil': 'pywin32>=306',
+            'win32event': 'pywin32>=306',
+            'servicemanager': 'pywin32>=306'
+        })
+    return required_modules
+
+def get_requirements_stamp():
+    """파이썬 실행 파일이나 필요 패키지 목록이 바뀌면 달라지는 확인 기록 내용"""
+    packages = sorted(set(get_required_modules().values()))
+    return "\n".join([sys.executable, sys.version.split()[0], *packages])
+
+def requirements_satisfied():
+    """이전 실행에서 같은 환경의 모듈 확인이 끝났는지 확인 (모듈을 import하지 않음)"""
+    try:
+        return REQUIREMENTS_STAMP.read_text(encoding='utf-8') == get_requirements_stamp()
+    except OSError:
+        return False
+
+# 필요한 모듈 자동 설치 함수
+def check_and_install_requirements():
+    """필요한 모듈을 확인하고 자동으로 설치"""
+    required_modules = get_required_modules()
     
     missing_modules = []
     
     print("🔍 필요한 모듈을 확인하는 중...")
     
-    # 각 모듈 확인
+    # 각 모듈 확인 (find_spec은 모듈을 실행하지 않고 설치 여부만 확인)
     for module, package in required_modules.items():
-        try:
-            __import__(module)
+        if importlib.util.find_spec(module) is not None:
             print(f"✅ {module} - 설치됨")
-        except ImportError:
+        else:
             print(f"❌ {module} - 누락됨")
             if package not in missing_modules:
                 missing_modules.append(package)
@@ -96,6 +151,12 @@ def check_and_install_requirements():
     
     else:
         print("✅ 모든 필요한 모듈이 설치되어 있습니다.\n")
+        # 다음 실행부터는 확인을 건너뜀 (기록할 수 없는 위치면 매번 확인)
+        try:
+            REQUIREMENTS_STAMP.parent.mkdir(parents=True, exist_ok=True)
+            REQUIREMENTS_STAMP.write_text(get_requirements_stamp(), encoding='utf-8')
+        except OSError:
+            pass
     
     return True
 
@@ -109,33 +170,49 @@ def create_requirements_file():
         print("📝 requirements.txt 파일을 생성합니다...")
         requirements_content = """gitpython>=3.1.40
 schedule>=1.2.0
-pywin32>=306"""
+watchdog>=3.0.0
+pywin32>=306; sys_platform == 'win32'"""
         
         with open(requirements_path, 'w', encoding='utf-8') as f:
             f.write(requirements_content)
         
         print(f"✅ requirements.txt 파일이 생성되었습니다: {requirements_path}")
 
-# 시작 시 모듈 확인 및 설치
-print("🚀 Git 고급 자동 동기화 시스템 v3.1 시작")
-print("="*60)
+# 스크립트로 실행할 때만 모듈 확인 및 설치 (이전 확인 기록이 있으면 건너뜀)
+if __name__ == "__main__":
+    print("🚀 Git 고급 자동 동기화 시스템 v3.1 시작")
+    print("="*60)
 
-create_requirements_file()
-if not check_and_install_requirements():
-    print("💥 필수 모듈 설치에 실패했습니다. 프로그램을 종료합니다.")
-    input("Enter를 눌러 종료하세요...")
-    sys.exit(1)
+    if not requirements_satisfied():
+        create_requirements_file()
+        if not check_and_install_requirements():
+            print("💥 필수 모듈 설치에 실패했습니다. 프로그램을 종료합니다.")
+            input("Enter를 눌러 종료하세요...")
+            sys.exit(1)
 
-# 이제 모든 모듈이 설치되었으므로 import
-from git import Repo, InvalidGitRepositoryError
-import schedule
-import servicemanager
-import socket
-import win32event
-import win32service
-import win32serviceutil
+# 이제 모든 모듈이 설치되었으므로 import (pywin32는 서비스 모드에서만 불러옴)
+try:
+    from git import Repo, Commit, InvalidGitRepositoryError, GitCommandError
+    from git.objects.util import altz_to_utctz_str
+    import schedule
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    if __name__ != "__main__":
+        raise
+    # 확인 기록 뒤에 모듈이 삭제된 경우: 기록을 지우고 다시 확인 (누락 모듈은 설치 후 재시작)
+    REQUIREMENTS_STAMP.unlink(missing_ok=True)
+    if check_and_install_requirements():
+        raise
+    sys.exit(1)
 import shutil
 
+# 대용량 파일 보관소 (git이 필터로 따로 실행하는 같은 폴더의 표준 라이브러리 전용 모듈, 서비스 모드에서도 찾도록 경로 추가)
+STORE_FILTER_PATH = Path(__file__).resolve().parent / "autosync_store_filter.py"
+if str(STORE_FILTER_PATH.parent) not in sys.path:
+    sys.path.insert(0, str(STORE_FILTER_PATH.parent))
+from autosync_store_filter import LargeFileStore
+
 # ===============================================
 
 # CONFIG 섹션 - 여기만 수정하세요
@@ -143,10 +220,62 @@ REPO_PATH = r"파일경로"  # 로컬 저장소 경로
 REMOTE_URL = "깃허브 주소.git"  # 깃허브 저장소 URL (.git 확장자 포함)
 BRANCH = "브랜치"  # 브랜치명
 SYNC_INTERVAL = 10  # 동기화 간격 (분)
-AUTO_RESOLVE_CONFLICTS = True  # 충돌 시 자동 에디터 실행 여부
+WATCH_CHANGES = True  # 파일 변경을 감지해 바로 동기화 (False: SYNC_INTERVAL 간격으로만 동기화)
+DEBOUNCE_SECONDS = 5  # 마지막 변경 후 이 시간(초) 동안 추가 변경이 없으면 동기화
+SAFETY_SYNC_INTERVAL = 60  # 변경 감지 모드에서 놓친 변경과 원격 변경을 확인하는 동기화 간격 (분)
+SYNC_MODE = "rebase"  # "rebase": 로컬 커밋을 원격 위로 옮겨 히스토리를 한 줄로 유지 (충돌 시 병합으로 전환), "merge": 매번 병합 커밋 생성
+LARGE_TREE_FILES = 20000  # 추적 파일이 이 수 이상이면 git status가 전체 폴더를 훑지 않도록 설정 (untrackedCache, manyFiles, fsmonitor / 0이면 사용 안 함)
+FSMONITOR = True  # 대형 작업 트리에서 fsmonitor 사용 (Windows/macOS: git 내장 데몬, Linux: 변경 감지가 답하는 훅)
+
+# 대용량 파일 보호: 기준을 넘는 파일은 git 대신 별도 보관소에 한 번만 저장하고 커밋에는 포인터(해시, 크기)만 남김
+# 보관소를 다른 PC와 공유하는 폴더(NAS, 클라우드 동기화 폴더 등)로 지정하면 다른 PC에서도 체크아웃 시 원래 파일로 복원
+LARGE_FILE_GUARD = False  # 자동 커밋 전에 파일 크기/형식 확인 (보관 대상이 생기면 저장소 설정에 autosync_store_filter.py를 필터로 등록)
+LARGE_FILE_MB = 50  # 이 크기(MB) 이상인 파일은 보관소로
+LARGE_FILE_TYPES = ["*.mp4", "*.mov", "*.mkv", "*.avi", "*.iso", "*.zip", "*.7z", "*.psd"]  # 이 형식은
+LARGE_FILE_TYPE_MB = 5  # 이 크기(MB) 이상이면 보관소로
+LARGE_FILE_STORE = ""  # 보관소 폴더 (비우면 저장소의 .git/autosync-store)
+
+# 여러 저장소 동기화 설정 (REPOS_FILE을 지정하면 위의 REPO_PATH/REMOTE_URL/BRANCH 대신 사용)
+REPOS_FILE = ""  # 저장소 목록 JSON 파일 경로 (예: r"C:\repos.json")
+MAX_PARALLEL_SYNCS = 4  # 동시에 동기화할 저장소 수
+START_JITTER_SECONDS = 60  # 시작 시 저장소별 첫 동기화를 0~이 시간(초) 사이로 분산
+MAX_BACKOFF_MINUTES = 120  # 동기화가 계속 실패할 때 재시도 간격의 최대값 (분)
+AUTO_RESOLVE_CONFLICTS = True  # 충돌 시 아래 규칙으로 자동 해결 (False면 병합 중단)
+# 충돌 해결 규칙: (경로 패턴, 전략) 위에서부터 처음 맞는 규칙 사용, 맞는 규칙이 없는 파일은 격리 브랜치로
+# 전략: "ours" 로컬, "theirs" 원격, "union" 양쪽 줄 모두, "newest" 마지막으로 수정한 쪽, "keep-both" 원격 내용을 다른 이름으로 함께 보관
+CONFLICT_RULES = [
+    ("*.md", "union"),
+    ("*.txt", "union"),
+]
+QUARANTINE_BRANCH_PREFIX = "conflict/"  # 격리 브랜치 이름 앞부분 (충돌 표시가 남은 파일을 저장해 원격에 푸시)
+INTERACTIVE_CONFLICTS = False  # True: 규칙에 맞지 않는 파일을 에디터로 직접 해결 (Windows 터미널에서 실행 중일 때만)
+
+# 저장소 정리 (동기화가 없는 동안 객체 수가 기준을 넘었을 때만 실행)
+MAINTENANCE = True  # 자동 정리 사용 여부
+MAINTENANCE_LOOSE_OBJECTS = 1000  # 느슨한 객체가 이 수 이상이면 오래된 불필요 객체를 지우고 나머지를 팩으로 묶음
+MAINTENANCE_PACKS = 20  # 팩 파일이 이 수 이상이면 multi-pack-index로 점진적 재압축
+MAINTENANCE_IDLE_SECONDS = 300  # 마지막 동기화 후 이 시간(초) 동안 조용할 때만 실행
+MAINTENANCE_CHECK_MINUTES = 30  # 객체 수 확인 간격 (분)
+
+# 자동 커밋 히스토리 압축 (선택): 오래된 자동 커밋을 하루/주 단위 커밋 하나로 합치고 원격 브랜치를 force-with-lease로 갱신
+# 같은 원격 저장소를 동기화하는 다른 PC도 SYNC_MODE = "rebase"여야 합친 히스토리를 그대로 받음
+HISTORY_COMPACTION = False  # True로 설정하면 하루에 한 번, 동기화가 없는 동안 실행
+COMPACT_AFTER_DAYS = 7  # 이 기간(일)보다 오래된 자동 커밋만 합침
+COMPACT_PERIOD = "day"  # 합치는 단위: "day" (하루) 또는 "week" (한 주)
+
+# 동기화 기록 (저장소의 .git/autosync-telemetry.sqlite, 통계 보기: python git_advanced_automate.py --stats [시간])
+TELEMETRY = True  # 동기화마다 단계별 시간(status/add/commit/fetch/merge/push)과 결과 기록
+TELEMETRY_RETENTION_DAYS = 30  # 주기별 기록 보관 기간 (일), 지난 기록은 시간별 합계로만 남음
+PROMETHEUS_TEXTFILE_DIR = ""  # node_exporter textfile 수집 폴더 (예: "/var/lib/node_exporter/textfile"), 비우면 내보내지 않음
+
+# 첫 클론 설정 (저장소가 없을 때만 사용)
+CLONE_MODE = "full"  # "full": 전체, "partial": 파일 내용은 필요할 때 받음 (--filter=blob:none), "shallow": 최근 커밋만 (--depth)
+CLONE_DEPTH = 50  # shallow 모드에서 받을 커밋 수 (병합에 필요하면 자동으로 더 받음)
+CLONE_SINGLE_BRANCH = False  # True로 설정하면 BRANCH만 클론
 
 # VS Code 호환 설정
 AUTO_COMMIT = True  # False로 설정하면 VS Code에서 수동 커밋 가능
+GIT_BACKEND = "plumbing"  # 자동 커밋 방식: "plumbing" (git 프로세스 최소화), "gitpython" (기존 방식)
 VSCODE_COMPATIBLE = False  # True로 설정하면 VS Code 워크플로우 우선
 
 # 커밋 메시지 설정
@@ -158,16 +287,605 @@ CUSTOM_COMMIT_PREFIX = "메세지 | "  # 커밋 메시지 앞에 붙일 접두
 
 INCLUDE_FILE_COUNT = True
 from_bat = "--from-bat" in sys.argv
+CONFLICT_STRATEGIES = ("ours", "theirs", "union", "newest", "keep-both")
+SYNC_PHASES = ("status", "add", "commit", "fetch", "merge", "push", "other")
+FSMONITOR_JOURNAL_BYTES = 8 * 1024 * 1024  # fsmonitor 기록 파일이 이 크기를 넘으면 새로 시작 (다음 status 한 번은 전체 확인)
+
+def can_prompt_user():
+    """입력을 기다려도 되는지 확인 (서비스/백그라운드 실행에서는 아무도 답할 수 없음)"""
+    return (sys.platform == "win32" and "--background" not in sys.argv
+            and sys.stdin is not None and sys.stdin.isatty())
+
+class GitPlumbing:
+    """git 프로세스를 적게 띄우는 자동 커밋 백엔드
+    
+    커밋/트리 조회는 계속 살아 있는 git cat-file --batch-check 프로세스 하나로 처리하고,
+    커밋은 update-index → write-tree → commit-tree → update-ref로 만든다.
+    (GitPython의 index.commit처럼 인덱스 전체를 Python에서 읽고 트리를 만들지 않음)
+    """
+    def __init__(self, repo_path):
+        self.repo_path = str(repo_path)
+        self.batch_process = None
+        atexit.register(self.close)
+
+    def run(self, *args, input=None):
+        result = subprocess.run(["git", *args], cwd=self.repo_path, input=input, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout.decode("utf-8", "surrogateescape")
+
+    def resolve(self, revision):
+        """리비전의 객체 ID 반환 (없으면 None). 조회마다 프로세스를 새로 띄우지 않음"""
+        if self.batch_process is None or self.batch_process.poll() is not None:
+            self.batch_process = subprocess.Popen(
+                ["git", "cat-file", "--batch-check"], cwd=self.repo_path,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        self.batch_process.stdin.write(revision.encode("utf-8") + b"\n")
+        self.batch_process.stdin.flush()
+        line = self.batch_process.stdout.readline()
+        if not line:
+            self.close()
+            raise RuntimeError("git cat-file --batch-check 프로세스가 종료되었습니다.")
+        
+        # "<객체 ID> <종류> <크기>" 또는 "<리비전> missing"
+        fields = line.decode("utf-8", "replace").split()
+        return fields[0] if len(fields) == 3 and fields[1] in ("commit", "tree", "blob", "tag") else None
+
+    def commit(self, message, paths=None, cycle=None):
+        """변경 파일을 인덱스에 반영하고 커밋. 트리가 HEAD와 같으면 커밋하지 않고 None 반환
+        
+        paths를 주지 않으면 git ls-files로 변경/삭제/추적 안 된 파일을 찾는다.
+        cycle(SyncCycle)을 주면 단계별 시간과 커밋한 파일 수를 기록한다.
+        """
+        if paths is None:
+            if cycle:
+                cycle.enter("status")
+            output = self.run("ls-files", "--modified", "--deleted", "--others", "--exclude-standard", "-z")
+            paths = list(dict.fromkeys(path for path in output.split("\0") if path))
+        if cycle:
+            cycle.enter("add")
+        if paths:
+            # --remove: 작업 트리에서 지워진 파일은 인덱스에서도 제거
+            self.run("update-index", "--add", "--remove", "--replace", "-z", "--stdin",
+                     input="\0".join(paths).encode("utf-8", "surrogateescape") + b"\0")
+        
+        if cycle:
+            cycle.enter("commit")
+        tree = self.run("write-tree").strip()
+        parent = self.resolve("HEAD")
+        if parent and tree == self.resolve("HEAD^{tree}"):
+            return None
+        
+        args = ["commit-tree", tree, "-m", message]
+        if parent:
+            args += ["-p", parent]
+        commit = self.run(*args).strip()
+        # 그 사이 다른 프로그램이 HEAD를 옮겼다면 덮어쓰지 않도록 이전 값을 함께 확인
+        self.run("update-ref", "-m", f"commit: {message}", "HEAD", commit, parent or "")
+        if cycle:
+            cycle.files_changed = len(paths)
+        return commit
+
+    def close(self):
+        if self.batch_process and self.batch_process.poll() is None:
+            self.batch_process.stdin.close()
+            self.batch_process.wait()
+        self.batch_process = None
+
+class RepoMaintenance:
+    """동기화가 없는 동안 객체 수를 확인해 필요한 정리 작업만 실행
+    
+    자동 커밋(plumbing, GitPython)은 git commit과 달리 gc --auto를 부르지 않아
+    느슨한 객체와 작은 팩이 계속 쌓인다. 동기화와 같은 스레드에서 실행해 동기화와 겹치지 않는다.
+    """
+    def __init__(self, repo_path):
+        self.repo_path = str(repo_path)
+        self.next_check = 0.0
+        self.last_result = None
+
+    def git(self, *args):
+        result = subprocess.run(["git", *args], cwd=self.repo_path, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} 실패: {result.stderr.strip()}")
+        return result.stdout
+
+    def count_objects(self):
+        """git count-objects -v 결과 (count: 느슨한 객체 수, packs: 팩 파일 수 등)"""
+        stats = {}
+        for line in self.git("count-objects", "-v").splitlines():
+            key, value = line.split(": ", 1)
+            stats[key] = int(value)
+        return stats
+
+    def has_commit_graph(self):
+        info_dir = Path(self.git("rev-parse", "--git-path", "objects/info").strip())
+        if not info_dir.is_absolute():
+            info_dir = Path(self.repo_path) / info_dir
+        return (info_dir / "commit-graph").exists() or (info_dir / "commit-graphs").exists()
+
+    def plan_tasks(self, stats):
+        """기준을 넘은 항목에 해당하는 작업만 골라 실행 순서대로 반환"""
+        tasks = []
+        if stats["count"] >= MAINTENANCE_LOOSE_OBJECTS:
+            tasks += ["prune", "loose-objects"]
+        if stats["packs"] >= MAINTENANCE_PACKS:
+            tasks.append("incremental-repack")
+        if tasks or not self.has_commit_graph():
+            tasks.append("commit-graph")
+        return tasks
+
+    def run_task(self, task):
+        if task == "prune":
+            # 2주 넘게 어디에서도 참조하지 않는 느슨한 객체 삭제 (git gc 기본값과 같음)
+            self.git("prune", "--expire=2.weeks.ago")
+        elif task == "commit-graph":
+            # log/merge-base/fetch 협상이 커밋을 풀지 않고 그래프 파일만 읽도록
+            self.git("commit-graph", "write", "--reachable", "--changed-paths", "--split")
+        elif task == "incremental-repack":
+            self.git("multi-pack-index", "write")
+            self.git("maintenance", "run", "--task=incremental-repack")
+        elif task == "loose-objects":
+            self.git("maintenance", "run", "--task=loose-objects")
+            # 이 작업은 팩으로 묶은 느슨한 객체를 다음 실행 때 지우므로 바로 정리
+            self.git("prune-packed")
+        else:
+            self.git("maintenance", "run", f"--task={task}")
+
+    def is_due(self, idle_seconds):
+        return idle_seconds >= MAINTENANCE_IDLE_SECONDS and time.monotonic() >= self.next_check
+
+    def run(self):
+        """객체 수를 확인하고 필요한 작업 실행. 실행했으면 전후 객체 수와 소요 시간을 반환"""
+        self.next_check = time.monotonic() + MAINTENANCE_CHECK_MINUTES * 60
+        try:
+            before = self.count_objects()
+            tasks = self.plan_tasks(before)
+            if not tasks:
+                return None
+            
+            start = time.perf_counter()
+            timings = {}
+            for task in tasks:
+                task_start = time.perf_counter()
+                self.run_task(task)
+                timings[task] = round(time.perf_counter() - task_start, 3)
+            after = self.count_objects()
+        except Exception as e:
+            print(f"⚠️ 저장소 정리 실패: {str(e)}")
+            return None
+        
+        self.last_result = {
+            "time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "tasks": timings,
+            "seconds": round(time.perf_counter() - start, 3),
+            "before": before,
+            "after": after,
+        }
+        print(f"🧹 저장소 정리 ({', '.join(tasks)}): 느슨한 객체 {before['count']}→{after['count']}개, "
+              f"팩 {before['packs']}→{after['packs']}개, "
+              f"{(before['size'] + before['size-pack']) / 1024:.1f}→{(after['size'] + after['size-pack']) / 1024:.1f}MB, "
+              f"{self.last_result['seconds']:.2f}초")
+        return self.last_result
+
+def percentile(values, fraction):
+    """정렬하지 않은 값 목록의 백분위수 (nearest-rank, 값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+class SyncCycle:
+    """동기화 한 번의 단계별 시간과 결과
+    
+    enter()로 단계를 바꾸면 그때까지 걸린 시간이 이전 단계에 더해진다 (어느 단계도 아니면 "other").
+    """
+    def __init__(self, kind="sync"):
+        self.kind = kind
+        self.started = time.time()
+        self.start_counter = time.perf_counter()
+        self.phase_seconds = dict.fromkeys(SYNC_PHASES, 0.0)
+        self.phase = "other"
+        self.phase_start = self.start_counter
+        self.files_changed = 0
+        self.bytes_pushed = 0
+        self.round_trips = 0  # ls-remote/fetch/push처럼 원격 저장소에 접속한 횟수
+        self.outcome = None
+        self.seconds = None
+
+    def enter(self, phase):
+        now = time.perf_counter()
+        self.phase_seconds[self.phase] += now - self.phase_start
+        self.phase, self.phase_start = phase, now
+
+    def finish(self, success):
+        self.enter("other")
+        self.seconds = time.perf_counter() - self.start_counter
+        if self.outcome is None:
+            if not success:
+                self.outcome = "failed"
+            elif self.files_changed or self.round_trips > 1:
+                self.outcome = "ok"
+            else:
+                # 커밋할 변경도 원격 변경도 없었던 주기 (ls-remote만 실행)
+                self.outcome = "idle"
+
+class SyncTelemetry:
+    """동기화 기록 저장소 (SQLite, 저장소의 .git/autosync-telemetry.sqlite)
+    
+    주기별 기록(cycles)은 TELEMETRY_RETENTION_DAYS 동안만 보관하고 시간별 합계(hourly)는 계속 남겨서
+    오래 실행해도 파일이 거의 커지지 않는다. 기록할 때마다 PROMETHEUS_TEXTFILE_DIR의 지표 파일도 갱신한다.
+    """
+    def __init__(self, git_dir, name):
+        self.path = os.path.join(git_dir, "autosync-telemetry.sqlite")
+        self.name = name
+
+    def connect(self):
+        # 동기화 스레드마다 따로 연결 (여러 저장소 모드에서도 저장소마다 파일이 따로 있음)
+        connection = sqlite3.connect(self.path, timeout=10)
+        phase_columns = ", ".join(f"{phase}_seconds REAL" for phase in SYNC_PHASES)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS cycles (started REAL, kind TEXT, outcome TEXT, seconds REAL, {phase_columns}, "
+            "files_changed INTEGER, bytes_pushed INTEGER, round_trips INTEGER)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS cycles_started ON cycles (started)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS hourly (hour INTEGER, kind TEXT, outcome TEXT, cycles INTEGER, seconds REAL, "
+            "max_seconds REAL, files_changed INTEGER, bytes_pushed INTEGER, round_trips INTEGER, PRIMARY KEY (hour, kind, outcome))"
+        )
+        return connection
+
+    def record(self, cycle):
+        row = (
+            cycle.started, cycle.kind, cycle.outcome, cycle.seconds,
+            *(cycle.phase_seconds[phase] for phase in SYNC_PHASES),
+            cycle.files_changed, cycle.bytes_pushed, cycle.round_trips,
+        )
+        try:
+            with closing(self.connect()) as connection, connection:
+                connection.execute(f"INSERT INTO cycles VALUES ({', '.join('?' * len(row))})", row)
+                connection.execute(
+                    "INSERT INTO hourly VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?) ON CONFLICT (hour, kind, outcome) DO UPDATE SET "
+                    "cycles = cycles + 1, seconds = seconds + excluded.seconds, max_seconds = max(max_seconds, excluded.max_seconds), "
+                    "files_changed = files_changed + excluded.files_changed, bytes_pushed = bytes_pushed + excluded.bytes_pushed, "
+                    "round_trips = round_trips + excluded.round_trips",
+                    (int(cycle.started // 3600 * 3600), cycle.kind, cycle.outcome, cycle.seconds, cycle.seconds,
+                     cycle.files_changed, cycle.bytes_pushed, cycle.round_trips),
+                )
+                connection.execute("DELETE FROM cycles WHERE started < ?", (time.time() - TELEMETRY_RETENTION_DAYS * 24 * 60 * 60,))
+            if PROMETHEUS_TEXTFILE_DIR:
+                self.write_prometheus()
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ 동기화 기록 실패: {str(e)}")
+
+    def summarize(self, hours=24, kind="sync"):
+        """최근 hours시간 동안의 주기 수, 결과별 횟수, 전체와 단계별 p50/p95 (기록이 없으면 None)"""
+        with closing(self.connect()) as connection:
+            rows = connection.execute(
+                f"SELECT outcome, seconds, {', '.join(f'{phase}_seconds' for phase in SYNC_PHASES)}, files_changed, bytes_pushed, round_trips "
+                "FROM cycles WHERE kind = ? AND started >= ?", (kind, time.time() - hours * 60 * 60)
+            ).fetchall()
+        if not rows:
+            return None
+        
+        outcomes = {}
+        for row in rows:
+            outcomes[row[0]] = outcomes.get(row[0], 0) + 1
+        seconds = [row[1] for row in rows]
+        phases = {}
+        for index, phase in enumerate(SYNC_PHASES, start=2):
+            values = [row[index] for row in rows if row[index]]
+            if values:
+                phases[phase] = (percentile(values, 0.5), percentile(values, 0.95))
+        return {
+            "cycles": len(rows),
+            "outcomes": outcomes,
+            "p50": percentile(seconds, 0.5),
+            "p95": percentile(seconds, 0.95),
+            "max": max(seconds),
+            "phases": phases,
+            "files_changed": sum(row[-3] for row in rows),
+            "bytes_pushed": sum(row[-2] for row in rows),
+            "round_trips": sum(row[-1] for row in rows),
+        }
+
+    def print_summary(self, hours=24):
+        for kind in ("sync", "push"):
+            summary = self.summarize(hours, kind)
+            if not summary:
+                continue
+            outcomes = ", ".join(f"{outcome} {count}" for outcome, count in sorted(summary["outcomes"].items()))
+            print(f"📊 [{self.name}] 최근 {hours}시간 {kind}: {summary['cycles']}회 ({outcomes})")
+            print(f"   주기 p50 {summary['p50']:.3f}초 | p95 {summary['p95']:.3f}초 | 최대 {summary['max']:.3f}초")
+            print("   단계별 p50/p95: " + ", ".join(
+                f"{phase} {p50:.3f}/{p95:.3f}초" for phase, (p50, p95) in summary["phases"].items()
+            ))
+            print(f"   변경 파일 {summary['files_changed']}개 | 푸시 {summary['bytes_pushed'] / 1024:.1f} KB | 원격 접속 {summary['round_trips']}회")
+
+    def write_prometheus(self):
+        """node_exporter textfile 수집기용 지표 파일을 원자적으로 교체"""
+        repo_label = self.name.replace("\\", "\\\\").replace('"', '\\"')
+        with closing(self.connect()) as connection:
+            totals = connection.execute(
+                "SELECT kind, outcome, SUM(cycles), SUM(seconds), SUM(files_changed), SUM(bytes_pushed), SUM(round_trips) "
+                "FROM hourly GROUP BY kind, outcome"
+            ).fetchall()
+            last = connection.execute(
+                "SELECT started, seconds FROM cycles WHERE kind = 'sync' ORDER BY started DESC LIMIT 1"
+            ).fetchone()
+            last_success = connection.execute(
+                "SELECT MAX(started) FROM cycles WHERE kind = 'sync' AND outcome IN ('ok', 'idle')"
+            ).fetchone()[0]
+        
+        metrics = {
+            "git_autosync_cycles_total": ("counter", "Sync cycles by kind and outcome", []),
+            "git_autosync_cycle_seconds_total": ("counter", "Time spent in sync cycles", []),
+            "git_autosync_files_changed_total": ("counter", "Files committed by sync cycles", []),
+            "git_autosync_pushed_bytes_total": ("counter", "On-disk size of pushed objects", []),
+            "git_autosync_remote_round_trips_total": ("counter", "Connections to the remote (ls-remote, fetch, push)", []),
+            "git_autosync_last_cycle_timestamp_seconds": ("gauge", "Start time of the last sync cycle", []),
+            "git_autosync_last_cycle_duration_seconds": ("gauge", "Duration of the last sync cycle", []),
+            "git_autosync_last_success_timestamp_seconds": ("gauge", "Start time of the last successful sync cycle", []),
+            "git_autosync_cycle_duration_seconds": ("gauge", "Sync cycle duration quantiles over the last 24 hours", []),
+        }
+        for kind, outcome, cycles, seconds, files_changed, bytes_pushed, round_trips in totals:
+            labels = f'repo="{repo_label}",kind="{kind}",outcome="{outcome}"'
+            metrics["git_autosync_cycles_total"][2].append((labels, cycles))
+            metrics["git_autosync_cycle_seconds_total"][2].append((labels, round(seconds, 3)))
+            metrics["git_autosync_files_changed_total"][2].append((labels, files_changed))
+            metrics["git_autosync_pushed_bytes_total"][2].append((labels, bytes_pushed))
+            metrics["git_autosync_remote_round_trips_total"][2].append((labels, round_trips))
+        labels = f'repo="{repo_label}"'
+        if last:
+            metrics["git_autosync_last_cycle_timestamp_seconds"][2].append((labels, round(last[0], 3)))
+            metrics["git_autosync_last_cycle_duration_seconds"][2].append((labels, round(last[1], 3)))
+        if last_success:
+            metrics["git_autosync_last_success_timestamp_seconds"][2].append((labels, round(last_success, 3)))
+        summary = self.summarize(24)
+        if summary:
+            for quantile in ("0.5", "0.95"):
+                value = summary["p50" if quantile == "0.5" else "p95"]
+                metrics["git_autosync_cycle_duration_seconds"][2].append((f'{labels},quantile="{quantile}"', round(value, 3)))
+        
+        lines = []
+        for metric, (metric_type, help_text, samples) in metrics.items():
+            if samples:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"]
+                lines += [f"{metric}{{{labels}}} {value}" for labels, value in samples]
+        
+        file_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.name)
+        path = os.path.join(PROMETHEUS_TEXTFILE_DIR, f"git_autosync_{file_name}.prom")
+        # 수집기가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        with open(path + ".tmp", 'w', encoding='utf-8', newline='\n') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(path + ".tmp", path)
+
+class StatusSnapshot:
+    """git status --porcelain=v2 -z 한 번의 결과. 한 동기화 주기의 판단은 모두 이 결과를 재사용한다"""
+    def __init__(self, output):
+        self.head = None  # 현재 커밋 (첫 커밋 전이면 None)
+        self.branch = None
+        self.upstream = None
+        self.ahead = 0
+        self.behind = 0
+        self.staged = []  # 인덱스에 올라간 변경
+        self.unstaged = []  # 작업 트리에만 있는 변경
+        self.untracked = []
+        self.conflicted = []
+        
+        entries = output.split("\0")
+        index = 0
+        while index < len(entries):
+            entry = entries[index]
+            index += 1
+            if not entry:
+                continue
+            
+            kind = entry[0]
+            if kind == "#":
+                key, _, value = entry[2:].partition(" ")
+                if key == "branch.oid" and value != "(initial)":
+                    self.head = value
+                elif key == "branch.head" and value != "(detached)":
+                    self.branch = value
+                elif key == "branch.upstream":
+                    self.upstream = value
+                elif key == "branch.ab":
+                    ahead, behind = value.split()
+                    self.ahead, self.behind = int(ahead), -int(behind)
+            elif kind in "12":
+                # 1 XY sub mH mI mW hH hI 경로 / 2 XY sub mH mI mW hH hI Xscore 경로 NUL 원래 경로
+                fields = entry.split(" ", 8 if kind == "1" else 9)
+                xy, path = fields[1], fields[-1]
+                if kind == "2":
+                    index += 1
+                if xy[0] != ".":
+                    self.staged.append(path)
+                if xy[1] != ".":
+                    self.unstaged.append(path)
+            elif kind == "u":
+                self.conflicted.append(entry.split(" ", 10)[-1])
+            elif kind == "?":
+                self.untracked.append(entry[2:])
+
+    @property
+    def changed_files(self):
+        return list(dict.fromkeys(self.staged + self.unstaged + self.conflicted + self.untracked))
+
+    @property
+    def is_clean(self):
+        return not (self.staged or self.unstaged or self.untracked or self.conflicted)
+
+class FsmonitorJournal:
+    """변경 감지가 본 경로를 git fsmonitor 훅(버전 2)에 넘겨주는 기록 파일 (Linux)
+    
+    git status는 훅이 알려준 경로만 다시 확인하므로 파일마다 lstat하지 않는다. 토큰은 "<세션>:<기록 위치>"이고,
+    감지가 멈췄거나(프로세스 종료 포함) 세션이 바뀌었으면 훅이 "/"를 돌려줘서 git이 전체를 다시 확인한다.
+    """
+    HOOK_SCRIPT = """#!/bin/sh
+# git fsmonitor 훅 (버전 2): git_advanced_automate.py의 변경 감지가 기록한 경로를 알려줌
+# 감지가 실행 중이 아니거나 토큰이 현재 세션이 아니면 "/" (전체 확인)
+dir=$(dirname "$0")
+pid= session=
+[ -f "$dir/session" ] && read -r pid session < "$dir/session"
+size=$(wc -c 2>/dev/null < "$dir/journal" || echo 0)
+size=$((size + 0))
+offset=${2#*:}
+if [ -n "$session" ] && kill -0 "$pid" 2>/dev/null && [ "${2%%:*}" = "$session" ] && [ "$offset" -le "$size" ] 2>/dev/null; then
+    printf '%s:%s\\0' "$session" "$size"
+    tail -c +$((offset + 1)) "$dir/journal" | head -c $((size - offset))
+else
+    printf '%s:%s\\0/\\0' "$session" "$size"
+fi
+"""
+
+    def __init__(self, repo_path, git_dir):
+        self.repo_path = str(repo_path)
+        self.directory = os.path.join(git_dir, "autosync-fsmonitor")
+        self.hook_path = os.path.join(self.directory, "fsmonitor-hook")
+        self.session_path = os.path.join(self.directory, "session")
+        self.journal = None
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def git_config(self, *args):
+        subprocess.run(["git", "config", *args], cwd=self.repo_path, capture_output=True)
+
+    def new_session(self):
+        """기록을 비우고 세션을 바꿈 (이전 토큰으로 묻는 git은 전체를 다시 확인)"""
+        self.journal.truncate(0)
+        self.size = 0
+        temp_path = self.session_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(f"{os.getpid()} {os.urandom(8).hex()}\n")
+        os.replace(temp_path, self.session_path)
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.hook_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(self.HOOK_SCRIPT)
+        os.chmod(self.hook_path, 0o755)
+        self.journal = open(os.path.join(self.directory, "journal"), "ab", buffering=0)
+        self.new_session()
+        self.git_config("core.fsmonitor", shlex.quote(self.hook_path))
+        self.git_config("core.fsmonitorHookVersion", "2")
+
+    def record(self, paths):
+        data = b"".join(os.fsencode(path) + b"\0" for path in paths)
+        with self.lock:
+            if not self.journal:
+                return
+            if self.size + len(data) > FSMONITOR_JOURNAL_BYTES:
+                self.new_session()
+            self.journal.write(data)
+            self.size += len(data)
+
+    def stop(self):
+        """훅 설정을 지움 (직접 실행하는 git은 다시 전체를 확인)"""
+        with self.lock:
+            if not self.journal:
+                return
+            self.git_config("--unset", "core.fsmonitor")
+            self.git_config("--unset", "core.fsmonitorHookVersion")
+            try:
+                os.remove(self.session_path)
+            except OSError:
+                pass
+            self.journal.close()
+            self.journal = None
+
+class ChangeWatcher(FileSystemEventHandler):
+    """저장소 파일 변경 감지 (Linux는 inotify, Windows는 ReadDirectoryChangesW)
+    
+    .git 내부 변경은 무시하고, 마지막 변경 후 DEBOUNCE_SECONDS 동안 조용해지면
+    그동안 모인 경로를 한 번에 넘겨줘서 연속 저장이 커밋 하나로 묶이게 한다.
+    """
+    def __init__(self, repo_path, observer=None):
+        self.repo_path = os.path.abspath(repo_path)
+        self.pending = set()
+        self.last_event_time = 0.0
+        self.lock = threading.Lock()
+        # 여러 저장소를 감시할 때는 실행 중인 Observer 하나를 함께 사용
+        self.observer = observer
+        self.owns_observer = observer is None
+        self.watch = None
+        self.fsmonitor = None  # FsmonitorJournal (대형 작업 트리, Linux)
+
+    def start(self):
+        try:
+            if self.owns_observer:
+                self.observer = Observer()
+            self.watch = self.observer.schedule(self, self.repo_path, recursive=True)
+            if self.owns_observer:
+                self.observer.start()
+            return True
+        except OSError as e:
+            # inotify 감시 개수 한도(fs.inotify.max_user_watches) 초과 등
+            print(f"⚠️ 파일 변경 감지를 시작할 수 없습니다: {str(e)}")
+            if self.owns_observer:
+                self.observer = None
+            return False
+
+    def stop(self):
+        if self.fsmonitor:
+            self.fsmonitor.stop()
+        if not self.observer:
+            return
+        if self.owns_observer:
+            self.observer.stop()
+            self.observer.join()
+        elif self.watch:
+            self.observer.unschedule(self.watch)
+
+    def on_any_event(self, event):
+        # 읽기용 열기/닫기와 폴더 수정 시각 변경은 내용 변경이 아님
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        if event.is_directory and event.event_type == "modified":
+            return
+        
+        changed = []
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if not path:
+                continue
+            relative_path = os.path.relpath(os.fsdecode(path), self.repo_path)
+            if relative_path.split(os.sep)[0] in (".git", os.curdir, os.pardir):
+                continue
+            relative_path = relative_path.replace(os.sep, "/")
+            changed.append(relative_path + "/" if event.is_directory else relative_path)
+            with self.lock:
+                self.pending.add(relative_path)
+                self.last_event_time = time.monotonic()
+        if changed and self.fsmonitor:
+            self.fsmonitor.record(changed)
+
+    def take_changes(self):
+        """조용한 시간이 지났으면 모인 변경 경로를 반환하고 비움 (아니면 None)"""
+        with self.lock:
+            if not self.pending or time.monotonic() - self.last_event_time < DEBOUNCE_SECONDS:
+                return None
+            changes = self.pending
+            self.pending = set()
+        return changes
 
 class GitAdvancedAutoSync:
-    def __init__(self, repo_path, remote_url, branch="main"):
+    def __init__(self, repo_path, remote_url, branch="main", name=None):
         self.repo_path = Path(repo_path)
         self.remote_url = remote_url
         self.branch = branch
         self.repo = None
+        self.last_remote_tip = None  # 마지막으로 병합/푸시한 원격 브랜치 커밋
+        self.plumbing = GitPlumbing(self.repo_path) if GIT_BACKEND == "plumbing" else None
+        self.maintenance = RepoMaintenance(self.repo_path)
+        self.last_sync_time = time.monotonic()
+        self.next_compaction = 0.0
+        self.large_tree = False
+        self.large_file_store = None  # LargeFileStore (LARGE_FILE_GUARD)
+        self.cycle = SyncCycle()
         
         # 초기 설정 및 저장소 준비
         self.setup_repository()
+        self.telemetry = SyncTelemetry(self.repo.git_dir, name or self.repo_path.name) if TELEMETRY else None
 
     def setup_repository(self):
         """저장소 초기 설정 및 자동화"""
@@ -200,6 +918,12 @@ class GitAdvancedAutoSync:
             # 4. 브랜치 설정
             self.ensure_branch()
             
+            # 5. 대형 작업 트리 설정
+            self.configure_large_tree()
+            
+            # 6. 대용량 파일 보관소 필터 설정
+            self.configure_large_file_store()
+            
             print("저장소 설정 완료!")
             
         except Exception as e:
@@ -207,16 +931,226 @@ class GitAdvancedAutoSync:
             print(traceback.format_exc())
             raise
 
+    def get_tracked_file_count(self):
+        """인덱스 파일 헤더에서 추적 파일 수를 읽음 (git을 실행하지 않음)"""
+        try:
+            with open(os.path.join(self.repo.git_dir, "index"), "rb") as f:
+                header = f.read(12)
+        except OSError:
+            return 0
+        if len(header) < 12 or header[:4] != b"DIRC":
+            return 0
+        return int.from_bytes(header[8:12], "big")
+
+    def measure_status_seconds(self):
+        start = time.perf_counter()
+        self.get_status_snapshot()
+        return time.perf_counter() - start
+
+    def configure_large_tree(self):
+        """추적 파일이 LARGE_TREE_FILES개 이상이면 git status/add가 매번 모든 폴더와 파일을 훑지 않도록 설정
+        
+        feature.manyFiles와 core.untrackedCache를 켜고, 동기화에 쓰는 --untracked-files=all에서도
+        untracked cache가 쓰이도록 status.showUntrackedFiles=all로 맞춘다. 인덱스 버전 4는 GitPython이
+        읽지 못하므로 index.version은 2로 둔다. Windows/macOS는 git 내장 fsmonitor 데몬을 켜고,
+        Linux는 변경 감지가 시작될 때 attach_fsmonitor에서 훅을 연결한다.
+        """
+        if not LARGE_TREE_FILES:
+            return
+        file_count = self.get_tracked_file_count()
+        if file_count < LARGE_TREE_FILES:
+            return
+        self.large_tree = True
+        
+        settings = {
+            "feature.manyFiles": "true",
+            "core.untrackedCache": "true",
+            "status.showUntrackedFiles": "all",
+            "index.version": "2",
+        }
+        if FSMONITOR and sys.platform in ("win32", "darwin") and self.repo.git.version_info >= (2, 36):
+            settings["core.fsmonitor"] = "true"
+        
+        try:
+            with self.repo.config_reader() as reader:
+                changed = {
+                    key: value for key, value in settings.items()
+                    if str(reader.get_value(*key.split("."), default="")).lower() != value
+                }
+            if not changed:
+                return
+            
+            # 처음 켤 때만 전후 status 시간을 측정 (켠 뒤 첫 status가 캐시를 만드는 비용)
+            before_seconds = self.measure_status_seconds()
+            with self.repo.config_writer() as writer:
+                for key, value in changed.items():
+                    writer.set_value(*key.split("."), value)
+            first_seconds = self.measure_status_seconds()
+            after_seconds = self.measure_status_seconds()
+            print(f"⚡ 대형 작업 트리 ({file_count}개 파일): {', '.join(changed)} 설정")
+            print(f"   git status {before_seconds:.3f}초 → {after_seconds:.3f}초 (캐시 생성 {first_seconds:.3f}초)")
+        except Exception as e:
+            print(f"⚠️ 대형 작업 트리 설정 실패: {str(e)}")
+
+    def attach_fsmonitor(self, watcher):
+        """Linux 대형 작업 트리: 변경 감지가 기록한 경로로 git fsmonitor 훅에 답함"""
+        if not (self.large_tree and FSMONITOR and sys.platform.startswith("linux")):
+            return
+        try:
+            before_seconds = self.measure_status_seconds()
+            fsmonitor = FsmonitorJournal(self.repo_path, self.repo.git_dir)
+            fsmonitor.start()
+            watcher.fsmonitor = fsmonitor
+            # 첫 status는 전체 확인("/") 후 인덱스에 토큰을 기록, 그 다음부터 변경된 경로만 확인
+            first_seconds = self.measure_status_seconds()
+            after_seconds = self.measure_status_seconds()
+            print(f"⚡ fsmonitor 훅 연결: git status {before_seconds:.3f}초 → {after_seconds:.3f}초 (첫 확인 {first_seconds:.3f}초)")
+        except Exception as e:
+            print(f"⚠️ fsmonitor 훅 연결 실패: {str(e)}")
+            if watcher.fsmonitor:
+                watcher.fsmonitor.stop()
+                watcher.fsmonitor = None
+
+    def configure_large_file_store(self):
+        """보관소를 준비하고, 이미 보관 대상으로 등록된 파일이 있으면 필터를 등록한 뒤 포인터로 남은 파일을 복원
+        
+        보관 대상이 없는 저장소에는 필터 설정을 쓰지 않는다 (처음 등록은 guard_large_files가 함).
+        """
+        if not LARGE_FILE_GUARD:
+            return
+        store_directory = LARGE_FILE_STORE or os.path.join(self.repo.git_dir, "autosync-store")
+        self.large_file_store = LargeFileStore(store_directory)
+        try:
+            # 다른 PC에서 등록해 받아온 경로도 포함
+            guarded_paths = [path for path in self.repo.git.ls_files("-z", f":(attr:filter={LargeFileStore.FILTER_NAME})").split("\0") if path]
+            if guarded_paths:
+                self.register_store_filter()
+                self.restore_large_files(guarded_paths)
+        except Exception as e:
+            print(f"⚠️ 대용량 파일 보관소 설정 실패: {str(e)}")
+
+    def register_store_filter(self):
+        """보관소 필터를 git 설정에 등록 (시작할 때마다 다시 써서 스크립트나 Python 위치가 바뀌어도 따라감)
+        
+        필터는 표준 라이브러리만 쓰는 autosync_store_filter.py를 실행한다 (git 명령 하나에 프로세스 하나).
+        required = true라서 필터를 실행할 수 없으면 원본을 그대로 커밋하지 않고 git 명령이 실패한다.
+        """
+        command = " ".join(shlex.quote(arg) for arg in (
+            sys.executable, str(STORE_FILTER_PATH), self.large_file_store.directory
+        ))
+        section = f'filter "{LargeFileStore.FILTER_NAME}"'
+        with self.repo.config_writer() as writer:
+            writer.set_value(section, "process", command)
+            writer.set_value(section, "required", "true")
+
+    def restore_large_files(self, guarded_paths):
+        """작업 트리에 포인터로 남은 보관 대상 파일을 보관소 내용으로 다시 체크아웃
+        
+        (필터 설정 전에 클론했거나, 체크아웃할 때 다른 PC의 파일이 아직 공유 보관소에 없었던 경우)
+        """
+        restore_paths = []
+        missing_count = 0
+        for path in guarded_paths:
+            full_path = self.repo_path / path
+            try:
+                if full_path.stat().st_size > LargeFileStore.POINTER_MAX_BYTES:
+                    continue
+                pointer = LargeFileStore.parse_pointer(full_path.read_bytes())
+            except OSError:
+                continue
+            if pointer and self.large_file_store.has_object(pointer[0]):
+                restore_paths.append(path)
+            elif pointer:
+                missing_count += 1
+        
+        if missing_count:
+            print(f"⚠️ 보관소에 없는 대용량 파일 {missing_count}개는 포인터로 둡니다 (보관소: {self.large_file_store.directory})")
+        if restore_paths:
+            # 인덱스와 같은 파일은 checkout-index가 건너뛰므로 포인터 파일을 지운 뒤 smudge 필터로 다시 체크아웃 (-u: 인덱스의 파일 정보도 갱신)
+            for path in restore_paths:
+                (self.repo_path / path).unlink()
+            subprocess.run(["git", "checkout-index", "-u", "-z", "--stdin"], cwd=self.repo_path,
+                           input="\0".join(restore_paths).encode("utf-8", "surrogateescape"), capture_output=True, check=True)
+            print(f"📦 보관소에서 대용량 파일 {len(restore_paths)}개를 복원했습니다.")
+
+    def guard_large_files(self, paths):
+        """커밋 전 크기/형식 검사: 기준을 넘는 파일을 .gitattributes에 보관소 필터로 등록
+        
+        등록된 파일은 git add(update-index) 때 clean 필터를 거쳐 포인터만 인덱스에 들어가므로
+        파일이 아무리 커도 커밋/푸시되는 양은 포인터 크기로 정해진다. 새로 등록했으면 .gitattributes도 커밋 대상에 넣는다.
+        """
+        if not self.large_file_store:
+            return paths
+        
+        large_files = []
+        for path in paths:
+            try:
+                size = os.lstat(self.repo_path / path).st_size
+            except OSError:
+                continue  # 삭제된 파일
+            name = os.path.basename(path).lower()
+            if size >= LARGE_FILE_MB * 1024 * 1024 or (
+                size >= LARGE_FILE_TYPE_MB * 1024 * 1024 and any(fnmatch.fnmatch(name, pattern.lower()) for pattern in LARGE_FILE_TYPES)
+            ):
+                large_files.append(path)
+        if not large_files:
+            return paths
+        
+        # 이미 필터가 적용된 경로는 제외 (출력: 경로 NUL 속성 NUL 값 NUL)
+        result = subprocess.run(["git", "check-attr", "-z", "--stdin", "filter"], cwd=self.repo_path,
+                                input="\0".join(large_files), capture_output=True, encoding="utf-8", check=True)
+        fields = result.stdout.split("\0")
+        filtered = {fields[index] for index in range(0, len(fields) - 2, 3) if fields[index + 2] == LargeFileStore.FILTER_NAME}
+        new_files = [path for path in large_files if path not in filtered]
+        if not new_files:
+            return paths
+        
+        # .gitattributes보다 먼저 등록해야 이번 커밋의 git add부터 필터를 거침
+        self.register_store_filter()
+        attributes_path = self.repo_path / ".gitattributes"
+        existing = attributes_path.read_bytes() if attributes_path.exists() else b""
+        with open(attributes_path, 'a', encoding='utf-8', newline='\n') as f:
+            if existing and not existing.endswith(b"\n"):
+                f.write("\n")
+            for path in new_files:
+                f.write(f"{self.attribute_pattern(path)} filter={LargeFileStore.FILTER_NAME} -text -diff\n")
+        print(f"📦 대용량 파일 {len(new_files)}개는 보관소에 저장하고 포인터만 커밋합니다: {', '.join(new_files[:5])}"
+              + (" ..." if len(new_files) > 5 else ""))
+        return list(paths) + ([".gitattributes"] if ".gitattributes" not in paths else [])
+
+    @staticmethod
+    def attribute_pattern(path):
+        """경로 하나에만 맞는 .gitattributes 패턴 (와일드카드 문자 이스케이프, 공백/따옴표가 있으면 C 방식 따옴표)"""
+        pattern = "/" + "".join("\\" + char if char in "*?[\\" else char for char in path)
+        if any(char in pattern for char in ' \t"'):
+            pattern = '"' + pattern.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        return pattern
+
     def clone_repository(self):
         """원격 저장소 클론"""
+        if CLONE_MODE not in ("full", "partial", "shallow"):
+            raise ValueError(f"알 수 없는 CLONE_MODE: {CLONE_MODE} (full, partial, shallow)")
+        
         try:
             # 빈 디렉터리인지 확인
             if any(self.repo_path.iterdir()):
                 print("디렉터리가 비어있지 않습니다. 클론을 건너뜁니다.")
                 return False
                 
-            print(f"클론 시작: {self.remote_url}")
-            self.repo = Repo.clone_from(self.remote_url, self.repo_path, branch=self.branch)
+            options = {"branch": self.branch}
+            if CLONE_MODE == "partial":
+                options["filter"] = "blob:none"
+            elif CLONE_MODE == "shallow":
+                options["depth"] = CLONE_DEPTH
+            
+            if CLONE_SINGLE_BRANCH:
+                options["single_branch"] = True
+            elif CLONE_MODE == "shallow":
+                # --depth는 기본적으로 단일 브랜치 클론이 되므로 명시적으로 해제
+                options["no_single_branch"] = True
+            
+            print(f"클론 시작 ({CLONE_MODE}): {self.remote_url}")
+            self.repo = Repo.clone_from(self.remote_url, self.repo_path, **options)
             return True
             
         except Exception as e:
@@ -279,32 +1213,242 @@ class GitAdvancedAutoSync:
 
     def is_merge_in_progress(self):
         """병합이 진행 중인지 확인"""
-        merge_head = self.repo_path / ".git" / "MERGE_HEAD"
+        merge_head = Path(self.repo.git_dir) / "MERGE_HEAD"
         return merge_head.exists()
 
     def is_rebase_in_progress(self):
-        """리베이스가 진행 중인지 확인"""
-        rebase_dir = self.repo_path / ".git" / "rebase-merge"
-        rebase_apply = self.repo_path / ".git" / "rebase-apply"
-        return rebase_dir.exists() or rebase_apply.exists()
+        """리베이스가 진행 중인지 확인 (.git이 파일인 worktree/submodule도 실제 git 디렉터리에서 확인)"""
+        git_dir = Path(self.repo.git_dir)
+        return (git_dir / "rebase-merge").exists() or (git_dir / "rebase-apply").exists()
+
+    def is_shallow(self):
+        """얕은 클론인지 확인 (히스토리를 전부 받으면 shallow 파일이 사라짐)"""
+        return (Path(self.repo.git_dir) / "shallow").exists()
+
+    def ensure_merge_base(self, remote_branch):
+        """얕은 클론에서 병합 기준 커밋이 없으면 찾을 때까지 히스토리를 더 받음"""
+        depth = CLONE_DEPTH
+        while self.is_shallow():
+            try:
+                self.repo.git.merge_base("HEAD", remote_branch)
+                return
+            except GitCommandError:
+                print(f"병합 기준 커밋이 없어 히스토리를 {depth}개 더 받습니다...")
+                self.repo.git.fetch("origin", f"--deepen={depth}", f"+refs/heads/{self.branch}:refs/remotes/{remote_branch}")
+                depth *= 2
+
+    def commit_changes(self, message, paths):
+        """변경 파일 커밋 (plumbing 백엔드가 실패하면 이후로는 GitPython 방식 사용)"""
+        paths = self.guard_large_files(paths)
+        if self.plumbing:
+            try:
+                return self.plumbing.commit(message, paths, self.cycle) is not None
+            except Exception as e:
+                print(f"⚠️ plumbing 커밋 실패, GitPython 방식으로 전환합니다: {str(e)}")
+                self.plumbing.close()
+                self.plumbing = None
+        
+        self.cycle.enter("add")
+        self.repo.git.add(".")
+        self.cycle.enter("commit")
+        self.repo.index.commit(message)
+        return True
+
+    def release(self):
+        """동기화 사이에 상주 git 프로세스(GitPython, cat-file)를 종료 (다음 사용 때 다시 시작됨)"""
+        if self.repo:
+            self.repo.close()
+        if self.plumbing:
+            self.plumbing.close()
+
+    def get_remote_tip(self):
+        """ls-remote로 원격 브랜치의 최신 커밋 확인 (브랜치가 없으면 None)"""
+        output = self.repo.git.ls_remote("origin", f"refs/heads/{self.branch}")
+        return output.split()[0] if output else None
+
+    def get_unpushed_bytes(self):
+        """원격에 아직 없는 커밋들이 가진 객체의 디스크 크기 (푸시할 양의 추정치)"""
+        try:
+            return int(self.repo.git.rev_list("--objects", "--disk-usage", "HEAD", "--not", "--remotes=origin"))
+        except (GitCommandError, ValueError):
+            return 0
+
+    def get_status_snapshot(self):
+        """작업 트리를 한 번만 훑어 변경/추적 안 됨/충돌 파일과 브랜치 상태를 가져옴"""
+        output = self.repo.git.status("--porcelain=v2", "-z", "--branch", "--untracked-files=all")
+        return StatusSnapshot(output)
 
     def get_conflicted_files(self):
         """충돌이 발생한 파일 목록 반환"""
         try:
-            # Git status로 충돌 파일 확인
-            result = self.repo.git.status("--porcelain")
-            conflicted_files = []
-            
-            for line in result.split('\n'):
-                if line.startswith('UU ') or line.startswith('AA ') or line.startswith('DD '):
-                    file_path = line[3:].strip()
-                    conflicted_files.append(file_path)
-                    
-            return conflicted_files
+            return self.get_status_snapshot().conflicted
         except Exception as e:
             print(f"Error getting conflicted files: {str(e)}")
             return []
 
+    def filter_ignored(self, paths):
+        """.gitignore에 해당하는 경로 제외 (git check-ignore 한 번으로 일괄 확인)"""
+        try:
+            result = subprocess.run(
+                ["git", "check-ignore", "--stdin", "-z"],
+                cwd=self.repo_path, input="\0".join(paths), capture_output=True, encoding="utf-8"
+            )
+            # 종료 코드 1은 무시되는 경로가 하나도 없다는 뜻
+            if result.returncode not in (0, 1):
+                return list(paths)
+            ignored = set(result.stdout.split("\0"))
+            return [path for path in paths if path not in ignored]
+        except Exception as e:
+            print(f"Error checking ignored files: {str(e)}")
+            return list(paths)
+
+    def git_bytes(self, *args):
+        """git 실행 후 출력을 바이트 그대로 반환 (바이너리 파일 내용용)"""
+        result = subprocess.run(["git", *args], cwd=self.repo_path, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout
+
+    def get_conflict_stages(self):
+        """충돌 파일별 인덱스 단계 {경로: {1: 공통 조상, 2: 로컬, 3: 원격}} (없는 단계는 그쪽에서 삭제된 것)"""
+        stages = {}
+        for entry in self.repo.git.ls_files("-u", "-z").split("\0"):
+            if entry:
+                info, path = entry.split("\t", 1)
+                mode, object_id, stage = info.split()
+                stages.setdefault(path, {})[int(stage)] = (mode, object_id)
+        return stages
+
+    def match_conflict_rule(self, path):
+        """CONFLICT_RULES에서 처음 맞는 전략 반환 (/가 없는 패턴은 파일 이름에도 적용)"""
+        for pattern, strategy in CONFLICT_RULES:
+            if fnmatch.fnmatch(path, pattern) or ("/" not in pattern and fnmatch.fnmatch(os.path.basename(path), pattern)):
+                return strategy
+        return None
+
+    def take_conflict_side(self, path, stages, stage):
+        """한쪽 내용으로 충돌 해결 (그쪽에서 삭제된 파일이면 삭제)"""
+        if stage in stages:
+            self.repo.git.checkout("--ours" if stage == 2 else "--theirs", "--", path)
+            self.repo.git.add("--", path)
+        else:
+            self.repo.git.rm("-q", "--ignore-unmatch", "--", path)
+
+    def apply_conflict_strategy(self, path, stages, strategy):
+        """전략 하나를 적용해 충돌 파일을 해결하고 인덱스에 반영"""
+        if strategy == "ours":
+            self.take_conflict_side(path, stages, 2)
+
+        elif strategy == "theirs":
+            self.take_conflict_side(path, stages, 3)
+
+        elif strategy == "newest":
+            # 원격 파일의 수정 시각은 알 수 없으므로 양쪽에서 이 파일을 마지막으로 바꾼 커밋 시각을 비교
+            ours_time = int(self.repo.git.log("-1", "--format=%ct", "HEAD", "--", path) or 0)
+            theirs_time = int(self.repo.git.log("-1", "--format=%ct", "MERGE_HEAD", "--", path) or 0)
+            self.take_conflict_side(path, stages, 3 if theirs_time > ours_time else 2)
+
+        elif strategy == "union":
+            if 2 not in stages or 3 not in stages:
+                raise RuntimeError("한쪽에서 삭제된 파일은 합칠 수 없음")
+            # git merge-file --union: 충돌 부분의 양쪽 줄을 표시 없이 모두 남김 (바이너리 파일이면 실패)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                files = []
+                for stage in (2, 1, 3):
+                    temp_path = os.path.join(temp_dir, str(stage))
+                    with open(temp_path, "wb") as f:
+                        if stage in stages:
+                            f.write(self.git_bytes("cat-file", "blob", stages[stage][1]))
+                    files.append(temp_path)
+                merged = subprocess.run(["git", "merge-file", "--union", "-p", *files], cwd=self.repo_path, capture_output=True)
+                if merged.returncode < 0 or merged.returncode > 127:
+                    raise RuntimeError(merged.stderr.decode("utf-8", "replace").strip() or "git merge-file 실패")
+            (self.repo_path / path).write_bytes(merged.stdout)
+            self.repo.git.add("--", path)
+
+        elif strategy == "keep-both":
+            if 2 not in stages or 3 not in stages:
+                # 한쪽에서 삭제됐으면 남아 있는 쪽을 그대로 유지
+                self.take_conflict_side(path, stages, 2 if 2 in stages else 3)
+                return
+            # 원격 내용은 "이름.remote-<커밋>.확장자"로 저장
+            short_id = self.repo.git.rev_parse("--short", "MERGE_HEAD")
+            base = Path(path)
+            copy_path = base.with_name(f"{base.stem}.remote-{short_id}{base.suffix}")
+            number = 2
+            while (self.repo_path / copy_path).exists():
+                copy_path = base.with_name(f"{base.stem}.remote-{short_id}-{number}{base.suffix}")
+                number += 1
+            (self.repo_path / copy_path).write_bytes(self.git_bytes("cat-file", "blob", stages[3][1]))
+            self.take_conflict_side(path, stages, 2)
+            self.repo.git.add("--", copy_path.as_posix())
+            print(f"원격 버전을 {copy_path.as_posix()}로 저장했습니다.")
+
+        else:
+            raise ValueError(f"알 수 없는 충돌 해결 전략: {strategy} (사용 가능: {', '.join(CONFLICT_STRATEGIES)})")
+
+    def quarantine_conflicts(self, paths, stages):
+        """규칙에 맞지 않는 충돌 파일을 격리 브랜치에 남기고 병합은 로컬 내용으로 진행
+
+        격리 브랜치 커밋은 원격 커밋(MERGE_HEAD) 위에 충돌 표시가 남은 파일을 올린 것이라
+        git diff MERGE_HEAD <격리 브랜치>로 무엇을 직접 합쳐야 하는지 볼 수 있습니다.
+        """
+        merge_head = self.repo.git.rev_parse("MERGE_HEAD")
+        quarantine_branch = f"{QUARANTINE_BRANCH_PREFIX}{self.branch}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+        # 작업 중인 인덱스는 건드리지 않도록 임시 인덱스에서 트리를 만듦
+        with tempfile.TemporaryDirectory() as temp_dir:
+            env = {"GIT_INDEX_FILE": os.path.join(temp_dir, "index")}
+            self.repo.git.read_tree(merge_head, env=env)
+            for path in paths:
+                if (self.repo_path / path).is_file():
+                    blob = self.repo.git.hash_object("-w", "--", path)
+                    self.repo.git.update_index("--add", "--cacheinfo", f"100644,{blob},{path}", env=env)
+            tree = self.repo.git.write_tree(env=env)
+        message = f"충돌 격리: {', '.join(paths)}"
+        commit = self.repo.git.commit_tree(tree, "-p", merge_head, "-m", message)
+        self.repo.git.branch(quarantine_branch, commit)
+
+        for path in paths:
+            self.take_conflict_side(path, stages.get(path, {}), 2)
+
+        print(f"⚠️ 규칙에 맞지 않는 충돌 파일 {len(paths)}개는 로컬 내용으로 병합하고 {quarantine_branch} 브랜치에 격리했습니다.")
+        try:
+            self.repo.remote("origin").push(quarantine_branch)
+        except Exception as e:
+            print(f"격리 브랜치 푸시 실패 (로컬에는 남아 있음): {str(e)}")
+
+    def resolve_conflicts(self, conflicted_files):
+        """충돌 파일을 경로 규칙으로 자동 해결 (입력을 기다리지 않음)
+
+        규칙에 맞지 않거나 전략을 적용할 수 없는 파일은 격리 브랜치로 보냅니다.
+        INTERACTIVE_CONFLICTS이고 터미널에서 실행 중일 때만 에디터로 직접 해결합니다.
+        """
+        stages = self.get_conflict_stages()
+        unresolved = []
+        for path in list(stages) or conflicted_files:
+            strategy = self.match_conflict_rule(path)
+            if strategy is None:
+                unresolved.append(path)
+                continue
+            try:
+                self.apply_conflict_strategy(path, stages.get(path, {}), strategy)
+                print(f"🔧 {path}: {strategy} 전략으로 해결")
+            except Exception as e:
+                print(f"⚠️ {path}: {strategy} 전략 적용 실패 ({str(e)})")
+                unresolved.append(path)
+
+        if not unresolved:
+            return True
+        if INTERACTIVE_CONFLICTS and can_prompt_user():
+            return self.resolve_conflicts_interactive(unresolved)
+        try:
+            self.quarantine_conflicts(unresolved, stages)
+            return True
+        except Exception as e:
+            print(f"충돌 격리 실패: {str(e)}")
+            return False
+
     def resolve_conflicts_interactive(self, conflicted_files):
         """충돌 파일을 대화형으로 해결"""
         if not conflicted_files:
@@ -389,9 +1533,9 @@ class GitAdvancedAutoSync:
                 return True
                 
             elif self.is_rebase_in_progress():
-                # 리베이스 계속
+                # 리베이스 계속 (커밋 메시지 편집기를 띄우지 않음)
                 print("리베이스 계속 진행 중...")
-                self.repo.git.rebase("--continue")
+                self.repo.git.rebase("--continue", env={"GIT_EDITOR": "true"})
                 print("리베이스가 계속 진행되었습니다!")
                 return True
                 
@@ -402,24 +1546,238 @@ class GitAdvancedAutoSync:
             print(f"병합/리베이스 완료 중 오류: {str(e)}")
             return False
 
+    def rebase_onto_remote(self, remote_branch):
+        """로컬 커밋을 원격 브랜치 위로 옮김 (pull --rebase --autostash와 같음)
+
+        로컬에 새 커밋이 없으면 빨리 감기만 하고, 커밋하지 않은 변경은 잠시 stash했다가 되돌립니다.
+        리베이스 중 충돌이 나면 리베이스를 되돌리고 False를 반환해 병합으로 처리하게 합니다.
+        """
+        print(f"원격 브랜치 {remote_branch} 위로 로컬 커밋을 옮기는 중...")
+        try:
+            # --fork-point: 원격 히스토리가 압축(force push)돼도 원격에 이미 있던 커밋은 다시 옮기지 않음
+            status, output, error = self.repo.git.rebase(
+                "--autostash", "--fork-point", remote_branch, env={"GIT_EDITOR": "true"}, with_extended_output=True
+            )
+        except GitCommandError:
+            print("리베이스 중 충돌이 발생했습니다. 되돌리고 병합으로 처리합니다...")
+            if self.is_rebase_in_progress():
+                self.repo.git.rebase("--abort")
+            return False
+
+        if "Fast-forwarded" in output + error:
+            print("원격 변경사항으로 빨리 감기했습니다!")
+        elif "is up to date" in output + error:
+            print("원격 변경사항이 이미 반영되어 있습니다.")
+        else:
+            print("로컬 커밋을 원격 변경사항 위로 옮겼습니다!")
+        if "autostash" in error.lower() and "conflict" in error.lower():
+            print("⚠️ 커밋하지 않은 변경을 되돌리다 충돌이 났습니다. 변경 내용은 git stash에 남아 있습니다.")
+        return True
+
+    def get_history_growth(self, days=7):
+        """최근 며칠 동안 하루 평균 커밋 수와 그중 병합 커밋 수 (히스토리가 얼마나 빨리 늘어나는지)"""
+        since = f"--since={days}.days.ago"
+        commits = int(self.repo.git.rev_list("--count", since, "HEAD"))
+        merges = int(self.repo.git.rev_list("--count", "--merges", since, "HEAD"))
+        return commits / days, merges / days
+
+    def get_auto_commit_prefix(self):
+        """자동 커밋 메시지의 고정된 앞부분 (이 문자열로 시작하는 커밋만 자동 커밋으로 봄)"""
+        message = COMMIT_MESSAGE_TEMPLATE.split("{timestamp}")[0]
+        if CUSTOM_COMMIT_PREFIX:
+            message = f"{CUSTOM_COMMIT_PREFIX} {message}"
+        return message
+
+    def recreate_commit(self, source, parent, message=None):
+        """source 커밋의 트리·작성자·시각을 그대로 두고 parent 위에 다시 만듦"""
+        return Commit.create_from_tree(
+            self.repo, source.tree, source.message if message is None else message,
+            parent_commits=[parent] if parent else [], head=False,
+            author=source.author, committer=source.committer,
+            author_date=f"{source.authored_date} {altz_to_utctz_str(source.author_tz_offset)}",
+            commit_date=f"{source.committed_date} {altz_to_utctz_str(source.committer_tz_offset)}",
+        )
+
+    def measure_log_seconds(self, revision):
+        start = time.perf_counter()
+        subprocess.run(["git", "log", "--format=%H", revision], cwd=self.repo_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return time.perf_counter() - start
+
+    def measure_clone(self, revision):
+        """revision까지의 히스토리를 빈 저장소로 처음 받아올 때 걸리는 시간과 팩 크기 (새 PC의 clone/fetch 비용)
+        
+        file:// 주소로 받아서 로컬 복사 대신 원격과 같은 팩 프로토콜을 거치게 함
+        """
+        with tempfile.TemporaryDirectory(prefix="autosync-clone-") as clone_dir:
+            subprocess.run(["git", "init", "-q", "--bare", clone_dir], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            start = time.perf_counter()
+            # 브랜치에서 빠진 이전 HEAD도 커밋 ID로 받을 수 있게 허용
+            subprocess.run(
+                ["git", "-c", "uploadpack.allowAnySHA1InWant=true", "fetch", "-q", "--no-tags",
+                 Path(self.repo_path).resolve().as_uri(), f"{revision}:refs/heads/measure"],
+                cwd=clone_dir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            seconds = time.perf_counter() - start
+            pack_bytes = sum(path.stat().st_size for path in Path(clone_dir, "objects", "pack").glob("*.pack"))
+        return seconds, pack_bytes
+
+    def compaction_due(self):
+        return HISTORY_COMPACTION and time.monotonic() >= self.next_compaction
+
+    def compact_history(self):
+        """COMPACT_AFTER_DAYS보다 오래된 자동 커밋을 COMPACT_PERIOD 단위 커밋 하나씩으로 합침
+        
+        가장 최근의 사람이 만든 커밋(또는 병합 커밋) 이후의 자동 커밋만 다시 만들기 때문에
+        사람이 만든 커밋은 절대 바뀌지 않는다. 새 히스토리는 섀도 브랜치(compact/<브랜치>)에 먼저 만들고
+        마지막 트리가 같은지 확인한 뒤, 원격 브랜치가 마지막으로 본 커밋 그대로일 때만
+        --force-with-lease로 바꾼다. 조건이 하나라도 맞지 않으면 아무것도 바꾸지 않는다.
+        """
+        self.next_compaction = time.monotonic() + 24 * 60 * 60
+        prefix = self.get_auto_commit_prefix()
+        if not prefix.strip():
+            print("⚠️ 자동 커밋 메시지에 고정된 앞부분이 없어 히스토리를 압축하지 않습니다.")
+            return None
+        if SYNC_MODE != "rebase":
+            print("⚠️ 히스토리 압축은 SYNC_MODE = \"rebase\"에서만 실행합니다.")
+            return None
+
+        head = self.repo.head.commit
+        # 원격과 같은 커밋이고 작업 트리가 깨끗할 때만 (푸시 안 된 커밋이나 진행 중인 병합이 있으면 다음에)
+        if head.hexsha != self.last_remote_tip or self.is_merge_in_progress() or self.is_rebase_in_progress():
+            return None
+        if not self.get_status_snapshot().is_clean:
+            return None
+
+        # 최신 커밋부터 거슬러 올라가며 사람이 만든 커밋이나 병합 커밋을 만나면 멈춤
+        anchor = None
+        chain = []
+        for commit in self.repo.iter_commits(self.branch, first_parent=True):
+            if len(commit.parents) > 1 or not commit.message.startswith(prefix):
+                anchor = commit
+                break
+            chain.append(commit)
+        chain.reverse()
+
+        cutoff = time.time() - COMPACT_AFTER_DAYS * 24 * 60 * 60
+        period_format = "%G-W%V" if COMPACT_PERIOD == "week" else "%Y-%m-%d"
+        groups = []
+        recent_index = len(chain)
+        for index, commit in enumerate(chain):
+            if commit.committed_date >= cutoff:
+                recent_index = index
+                break
+            period = time.strftime(period_format, time.localtime(commit.committed_date))
+            if groups and groups[-1][0] == period:
+                groups[-1][1].append(commit)
+            else:
+                groups.append((period, [commit]))
+        old_count = recent_index
+        if old_count == len(groups):
+            # 합칠 커밋이 없음 (기간마다 하나뿐이거나 오래된 자동 커밋이 없음)
+            return None
+
+        print(f"🗜️ 히스토리 압축: {COMPACT_AFTER_DAYS}일보다 오래된 자동 커밋 {old_count}개를 {len(groups)}개로 합치는 중...")
+        parent = anchor
+        for period, commits in groups:
+            message = None
+            if len(commits) > 1:
+                message = f"{prefix}{period} (자동 커밋 {len(commits)}개 합침)"
+            parent = self.recreate_commit(commits[-1], parent, message)
+        for commit in chain[recent_index:]:
+            parent = self.recreate_commit(commit, parent)
+        new_head = parent
+
+        if new_head.tree.hexsha != head.tree.hexsha:
+            print("⚠️ 압축한 히스토리의 마지막 트리가 달라 취소합니다.")
+            return None
+
+        shadow_branch = f"compact/{self.branch}"
+        self.repo.git.branch("-f", shadow_branch, new_head.hexsha)
+        try:
+            # 원격 브랜치가 마지막으로 본 커밋(head) 그대로일 때만 교체
+            self.repo.git.push(
+                f"--force-with-lease=refs/heads/{self.branch}:{head.hexsha}",
+                "origin", f"{new_head.hexsha}:refs/heads/{self.branch}"
+            )
+        except GitCommandError as e:
+            print(f"원격 브랜치가 그사이 바뀌어 히스토리 압축을 취소합니다: {str(e).strip().splitlines()[0]}")
+            return None
+        finally:
+            self.repo.git.branch("-D", shadow_branch)
+
+        # 트리가 같으므로 작업 트리와 인덱스는 그대로 두고 브랜치만 옮김
+        self.repo.git.update_ref("-m", "history compaction", f"refs/heads/{self.branch}", new_head.hexsha, head.hexsha)
+        self.repo.git.update_ref(f"refs/remotes/origin/{self.branch}", new_head.hexsha)
+        self.last_remote_tip = new_head.hexsha
+
+        before_count = int(self.repo.git.rev_list("--count", head.hexsha))
+        after_count = int(self.repo.git.rev_list("--count", new_head.hexsha))
+        before_seconds = self.measure_log_seconds(head.hexsha)
+        after_seconds = self.measure_log_seconds(new_head.hexsha)
+        try:
+            clone_before = self.measure_clone(head.hexsha)
+            clone_after = self.measure_clone(new_head.hexsha)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️ clone 비용 측정 실패: {e}")
+            clone_before = clone_after = None
+        result = {
+            "compacted": old_count,
+            "into": len(groups),
+            "commits_before": before_count,
+            "commits_after": after_count,
+            "log_seconds_before": round(before_seconds, 3),
+            "log_seconds_after": round(after_seconds, 3),
+            "previous_head": head.hexsha,
+        }
+        print(f"🗜️ 히스토리 압축 완료: 커밋 {before_count}→{after_count}개, git log {before_seconds:.3f}→{after_seconds:.3f}초")
+        if clone_before and clone_after:
+            result.update({
+                "clone_seconds_before": round(clone_before[0], 3),
+                "clone_seconds_after": round(clone_after[0], 3),
+                "pack_bytes_before": clone_before[1],
+                "pack_bytes_after": clone_after[1],
+            })
+            print(f"   처음 clone/fetch: {clone_before[0]:.3f}→{clone_after[0]:.3f}초, "
+                  f"팩 {clone_before[1] / (1024 * 1024):.2f}→{clone_after[1] / (1024 * 1024):.2f}MB")
+        print(f"   이전 HEAD {head.hexsha[:10]} (git reflog로 되돌릴 수 있음, 원격 저장소 용량은 서버 정리 후 줄어듦)")
+        return result
+
     def sync_with_remote(self):
-        """원격 저장소와 동기화"""
+        """원격 저장소와 동기화 (TELEMETRY가 켜져 있으면 단계별 시간과 결과를 기록)"""
+        self.cycle = SyncCycle()
+        success = False
+        try:
+            success = self.run_sync_cycle()
+        finally:
+            # 충돌이 남아 병합이 멈춘 채로 끝났으면 실패 원인을 충돌로 기록
+            if not success and self.cycle.outcome is None and self.repo and self.is_merge_in_progress():
+                self.cycle.outcome = "conflict"
+            self.cycle.finish(success)
+            if self.telemetry:
+                self.telemetry.record(self.cycle)
+        return success
+
+    def run_sync_cycle(self):
+        """동기화 한 주기: status → 커밋 → 원격 확인/fetch → 리베이스/병합 → push"""
+        self.last_sync_time = time.monotonic()
         try:
             print(f"\n원격 저장소 동기화 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # 현재 브랜치 확인
-            if not self.ensure_branch():
-                return False
+            # 이번 주기의 작업 트리 상태 (git status 한 번)
+            self.cycle.enter("status")
+            snapshot = self.get_status_snapshot()
 
             # 진행 중인 병합/리베이스 확인 및 처리
+            self.cycle.enter("merge")
             if self.is_merge_in_progress():
                 print("⚠️ 진행 중인 병합을 감지했습니다. 자동으로 해결합니다...")
-                conflicted_files = self.get_conflicted_files()
+                conflicted_files = snapshot.conflicted
                 
                 if conflicted_files:
                     print(f"충돌 파일 감지: {', '.join(conflicted_files)}")
                     if AUTO_RESOLVE_CONFLICTS:
-                        if self.resolve_conflicts_interactive(conflicted_files):
+                        if self.resolve_conflicts(conflicted_files):
                             self.complete_merge_or_rebase()
                         else:
                             print("충돌 해결 실패. 병합을 중단합니다.")
@@ -431,135 +1789,177 @@ class GitAdvancedAutoSync:
                     # 충돌이 없는 경우 병합 완료
                     self.complete_merge_or_rebase()
                     
+                # 병합을 마무리하거나 중단하면 작업 트리가 바뀌므로 다시 확인
+                snapshot = self.get_status_snapshot()
+                    
             elif self.is_rebase_in_progress():
-                print("⚠️ 진행 중인 리베이스를 감지했습니다. 중단합니다...")
-                self.repo.git.rebase("--abort")
+                # 충돌 없이 멈춘 리베이스(예: 중간에 종료됨)는 마저 진행, 충돌이 남아 있으면 되돌림
+                print("⚠️ 진행 중인 리베이스를 감지했습니다.")
+                if snapshot.conflicted or not self.complete_merge_or_rebase():
+                    print("리베이스를 중단합니다...")
+                    self.repo.git.rebase("--abort")
+                snapshot = self.get_status_snapshot()
+
+            # 현재 브랜치 확인 (리베이스 중에는 HEAD가 브랜치를 가리키지 않으므로 위에서 먼저 정리)
+            self.cycle.enter("other")
+            if not self.ensure_branch():
+                return False
 
             # VS Code 호환 모드 확인
             if VSCODE_COMPATIBLE:
                 print("VS Code 호환 모드: 기존 커밋만 동기화합니다.")
                 
                 # staged 변경사항이 있는지 확인
-                if self.repo.index.diff("HEAD"):
+                if snapshot.staged:
                     print("⚠️ staged 변경사항이 있습니다. VS Code에서 먼저 커밋해주세요.")
                     return False
                     
                 # unstaged 변경사항이 있는지 확인  
-                if self.repo.is_dirty():
+                if snapshot.unstaged:
                     print("📝 unstaged 변경사항이 있습니다. VS Code에서 작업 후 커밋해주세요.")
                     print("현재는 기존 커밋만 동기화합니다.")
                     
             elif AUTO_COMMIT:
-                # 자동 커밋 모드
-                self.repo.git.add(".")
-                
-                if self.repo.is_dirty() or len(self.repo.untracked_files) > 0:
-                    # 변경된 파일 개수 계산
-                    file_count = len(self.repo.untracked_files) + len([item.a_path for item in self.repo.index.diff(None)])
+                # 자동 커밋 모드 (변경이 없으면 git add도 건너뜀)
+                if not snapshot.is_clean:
+                    file_count = len(snapshot.changed_files)
                     commit_message = self.generate_commit_message(file_count)
-                    self.repo.index.commit(commit_message)
-                    print(f"로컬 변경사항 커밋: {commit_message}")
+                    if self.commit_changes(commit_message, snapshot.staged + snapshot.unstaged + snapshot.untracked):
+                        self.cycle.files_changed = file_count
+                        print(f"로컬 변경사항 커밋: {commit_message}")
                     
             else:
                 # 수동 커밋 모드
-                if self.repo.is_dirty() or len(self.repo.untracked_files) > 0:
+                if not snapshot.is_clean:
                     print("📝 커밋되지 않은 변경사항이 있습니다.")
                     print("VS Code나 git 명령어로 먼저 커밋해주세요.")
                     print("현재는 기존 커밋만 동기화합니다.")
 
-            # 원격 저장소에서 변경사항 가져오기
-            print("원격 저장소에서 변경사항을 가져오는 중...")
+            # 원격 브랜치의 최신 커밋만 먼저 확인 (객체는 받지 않음)
+            print("원격 브랜치 상태를 확인하는 중...")
+            self.cycle.enter("fetch")
             try:
                 origin = self.repo.remote("origin")
-                origin.fetch()
-                
-                # 원격 브랜치 존재 확인
+                self.cycle.round_trips += 1
+                remote_tip = self.get_remote_tip()
                 remote_branch = f"origin/{self.branch}"
-                if remote_branch in [str(ref) for ref in self.repo.refs]:
-                    print(f"원격 브랜치 {remote_branch}와 병합 시도...")
+                
+                if remote_tip is None:
+                    print(f"원격 브랜치 {self.branch}가 존재하지 않습니다. 새 브랜치로 푸시합니다.")
+                elif remote_tip == self.last_remote_tip:
+                    print("원격 브랜치에 새 커밋이 없습니다. fetch/merge를 건너뜁니다.")
+                else:
+                    # 원격 저장소에서 변경사항 가져오기 (동기화하는 브랜치만)
+                    print("원격 저장소에서 변경사항을 가져오는 중...")
+                    self.cycle.round_trips += 1
+                    origin.fetch(f"+refs/heads/{self.branch}:refs/remotes/{remote_branch}")
+                    self.ensure_merge_base(remote_branch)
+                    self.cycle.enter("merge")
+                    # rebase 모드: 히스토리를 한 줄로 유지하고 리베이스할 수 없을 때만 병합
+                    if SYNC_MODE != "rebase" or not self.rebase_onto_remote(remote_branch):
+                        print(f"원격 브랜치 {remote_branch}와 병합 시도...")
                     
-                    try:
-                        # 먼저 일반 병합 시도
-                        self.repo.git.merge(remote_branch, "--no-ff")
-                        print("원격 변경사항이 성공적으로 병합되었습니다!")
+                        try:
+                            # 먼저 일반 병합 시도
+                            self.repo.git.merge(remote_branch, "--no-ff")
+                            print("원격 변경사항이 성공적으로 병합되었습니다!")
                         
-                    except Exception as merge_error:
-                        error_msg = str(merge_error).lower()
+                        except Exception as merge_error:
+                            error_msg = str(merge_error).lower()
                         
-                        if "refusing to merge unrelated histories" in error_msg:
-                            print("관련 없는 히스토리 오류 감지. --allow-unrelated-histories 옵션으로 병합을 시도합니다...")
-                            try:
-                                self.repo.git.merge(remote_branch, "--no-ff", "--allow-unrelated-histories")
-                                print("관련 없는 히스토리가 성공적으로 병합되었습니다!")
-                            except Exception as force_merge_error:
-                                if "conflict" in str(force_merge_error).lower():
-                                    print("히스토리 병합 시 충돌이 발생했습니다!")
+                            if "refusing to merge unrelated histories" in error_msg:
+                                print("관련 없는 히스토리 오류 감지. --allow-unrelated-histories 옵션으로 병합을 시도합니다...")
+                                try:
+                                    self.repo.git.merge(remote_branch, "--no-ff", "--allow-unrelated-histories")
+                                    print("관련 없는 히스토리가 성공적으로 병합되었습니다!")
+                                except Exception as force_merge_error:
+                                    if "conflict" in str(force_merge_error).lower():
+                                        print("히스토리 병합 시 충돌이 발생했습니다!")
                                     
-                                    # 충돌 파일 확인
-                                    conflicted_files = self.get_conflicted_files()
+                                        # 충돌 파일 확인
+                                        conflicted_files = self.get_conflicted_files()
                                     
-                                    if conflicted_files and AUTO_RESOLVE_CONFLICTS:
-                                        print("자동 충돌 해결을 시작합니다...")
+                                        if conflicted_files and AUTO_RESOLVE_CONFLICTS:
+                                            print("자동 충돌 해결을 시작합니다...")
                                         
-                                        if self.resolve_conflicts_interactive(conflicted_files):
-                                            # 충돌 해결 후 병합/리베이스 완료
-                                            if self.complete_merge_or_rebase():
-                                                print("충돌 해결 및 병합이 완료되었습니다!")
+                                            if self.resolve_conflicts(conflicted_files):
+                                                # 충돌 해결 후 병합/리베이스 완료
+                                                if self.complete_merge_or_rebase():
+                                                    print("충돌 해결 및 병합이 완료되었습니다!")
+                                                else:
+                                                    print("병합 완료 중 오류가 발생했습니다.")
+                                                    return False
                                             else:
-                                                print("병합 완료 중 오류가 발생했습니다.")
+                                                print("충돌 해결에 실패했습니다.")
                                                 return False
                                         else:
-                                            print("충돌 해결에 실패했습니다.")
+                                            print("수동으로 충돌을 해결해야 합니다.")
                                             return False
                                     else:
-                                        print("수동으로 충돌을 해결해야 합니다.")
-                                        return False
-                                else:
-                                    raise force_merge_error
+                                        raise force_merge_error
                                     
-                        elif "conflict" in error_msg:
-                            print("일반 병합에서 충돌이 발생했습니다!")
+                            elif "conflict" in error_msg:
+                                print("일반 병합에서 충돌이 발생했습니다!")
                             
-                            # 충돌 파일 확인
-                            conflicted_files = self.get_conflicted_files()
+                                # 충돌 파일 확인
+                                conflicted_files = self.get_conflicted_files()
                             
-                            if conflicted_files and AUTO_RESOLVE_CONFLICTS:
-                                print("자동 충돌 해결을 시작합니다...")
+                                if conflicted_files and AUTO_RESOLVE_CONFLICTS:
+                                    print("자동 충돌 해결을 시작합니다...")
                                 
-                                if self.resolve_conflicts_interactive(conflicted_files):
-                                    # 충돌 해결 후 병합/리베이스 완료
-                                    if self.complete_merge_or_rebase():
-                                        print("충돌 해결 및 병합이 완료되었습니다!")
+                                    if self.resolve_conflicts(conflicted_files):
+                                        # 충돌 해결 후 병합/리베이스 완료
+                                        if self.complete_merge_or_rebase():
+                                            print("충돌 해결 및 병합이 완료되었습니다!")
+                                        else:
+                                            print("병합 완료 중 오류가 발생했습니다.")
+                                            return False
                                     else:
-                                        print("병합 완료 중 오류가 발생했습니다.")
+                                        print("충돌 해결에 실패했습니다.")
                                         return False
                                 else:
-                                    print("충돌 해결에 실패했습니다.")
+                                    print("수동으로 충돌을 해결해야 합니다.")
                                     return False
                             else:
-                                print("수동으로 충돌을 해결해야 합니다.")
-                                return False
-                        else:
-                            raise merge_error
-                else:
-                    print(f"원격 브랜치 {self.branch}가 존재하지 않습니다. 새 브랜치로 푸시합니다.")
+                                raise merge_error
+                    
+                    self.last_remote_tip = remote_tip
 
-                # 원격으로 푸시
-                print("원격 저장소로 푸시 중...")
-                push_info = origin.push(self.branch)
-                
-                for info in push_info:
-                    print(f"푸시 결과: {info.summary}")
+                # 원격으로 푸시 (원격 브랜치보다 앞선 커밋이 없으면 건너뜀)
+                self.cycle.enter("push")
+                local_head = self.repo.head.commit.hexsha
+                if local_head == remote_tip:
+                    print("푸시할 새 커밋이 없습니다.")
+                else:
+                    print("원격 저장소로 푸시 중...")
+                    unpushed_bytes = self.get_unpushed_bytes()
+                    self.cycle.round_trips += 1
+                    push_info = origin.push(self.branch)
+                    
+                    pushed = True
+                    for info in push_info:
+                        print(f"푸시 결과: {info.summary}")
+                        if info.flags & (info.ERROR | info.REJECTED | info.REMOTE_REJECTED | info.REMOTE_FAILURE):
+                            pushed = False
+                    
+                    # 푸시에 성공했으면 원격 브랜치는 이제 로컬 HEAD와 같음 (실패하면 다음 주기에 다시 fetch)
+                    self.last_remote_tip = local_head if pushed else None
+                    if pushed:
+                        self.cycle.bytes_pushed = unpushed_bytes
+                    else:
+                        self.cycle.outcome = "push-rejected"
                 
                 print("동기화가 완료되었습니다!")
                 return True
                 
             except Exception as e:
+                self.cycle.outcome = "error"
                 print(f"Remote sync failed: {str(e)}")
                 print(f"원격 동기화 실패: {str(e)}")
                 return False
 
         except Exception as e:
+            self.cycle.outcome = "error"
             print(f"Error during sync: {str(e)}")
             print(f"동기화 중 오류: {str(e)}")
             return False
@@ -580,44 +1980,274 @@ class GitAdvancedAutoSync:
             print(f"❌ 동기화 오류: {str(e)}")
 
 
-class GitAdvancedAutoSyncService(win32serviceutil.ServiceFramework):
-    _svc_name_ = "GitAdvancedAutoSyncService"
-    _svc_display_name_ = "Git Advanced Auto Sync Service"
-    _svc_description_ = "고급 Git 자동 동기화 서비스 (충돌 해결 포함)"
+def start_sync_schedule(git_sync):
+    """동기화 스케줄 등록. 변경 감지를 시작했으면 watcher를 반환"""
+    if WATCH_CHANGES:
+        watcher = ChangeWatcher(REPO_PATH)
+        if watcher.start():
+            git_sync.attach_fsmonitor(watcher)
+            # 이벤트를 놓치거나 원격만 바뀐 경우를 위한 안전망
+            schedule.every(SAFETY_SYNC_INTERVAL).minutes.do(git_sync.sync)
+            return watcher
+        print(f"변경 감지 없이 {SYNC_INTERVAL}분 간격으로 동기화합니다.")
+    
+    schedule.every(SYNC_INTERVAL).minutes.do(git_sync.sync)
+    return None
 
-    def __init__(self, args):
-        win32serviceutil.ServiceFramework.__init__(self, args)
-        self.hWaitStop = win32event.CreateEvent(None, 0, 0, None)
-        socket.setdefaulttimeout(60)
-        self.stop_requested = False
+def run_pending_sync(git_sync, watcher):
+    """예약된 동기화와, 조용해진 변경 묶음에 대한 동기화 실행"""
+    schedule.run_pending()
+    if watcher:
+        changes = watcher.take_changes()
+        if changes and git_sync.filter_ignored(sorted(changes)):
+            print(f"📝 변경 감지: {len(changes)}개 경로")
+            git_sync.sync()
+    
+    # 동기화가 없는 동안에만 저장소 정리 (같은 스레드라 동기화와 겹치지 않음)
+    idle_seconds = time.monotonic() - git_sync.last_sync_time
+    if MAINTENANCE and not (watcher and watcher.pending) and git_sync.maintenance.is_due(idle_seconds):
+        git_sync.maintenance.run()
+    if idle_seconds >= MAINTENANCE_IDLE_SECONDS and not (watcher and watcher.pending) and git_sync.compaction_due():
+        try:
+            git_sync.compact_history()
+        except Exception as e:
+            print(f"⚠️ 히스토리 압축 실패: {str(e)}")
 
-    def SvcStop(self):
-        self.ReportServiceStatus(win32service.SERVICE_STOP_PENDING)
-        win32event.SetEvent(self.hWaitStop)
-        self.stop_requested = True
+class RepoPrefixedOutput:
+    """여러 저장소를 동시에 동기화할 때 출력 줄 앞에 해당 스레드의 저장소 이름을 붙임"""
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
 
-    def SvcDoRun(self):
-        self.main()
+    def set_prefix(self, prefix):
+        self.local.prefix = prefix
 
-    def main(self):
-        try:
-            git_sync = GitAdvancedAutoSync(REPO_PATH, REMOTE_URL, BRANCH)
+    def write(self, text):
+        # 스레드마다 줄 단위로 모았다가 한 번에 써서 다른 저장소 출력과 섞이지 않게 함
+        lines = (getattr(self.local, "buffer", "") + text).split("\n")
+        self.local.buffer = lines.pop()
+        if lines:
+            prefix = getattr(self.local, "prefix", "")
+            with self.lock:
+                for line in lines:
+                    self.stream.write(f"{prefix}{line}\n" if line else "\n")
+        return len(text)
+
+    def flush(self):
+        if getattr(self.local, "buffer", ""):
+            self.write("\n")
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class RepoSyncManager:
+    """REPOS_FILE에 적힌 여러 저장소를 한 프로세스에서 동기화
+    
+    동기화는 MAX_PARALLEL_SYNCS개의 스레드에서만 실행되고, 끝난 저장소는 상주 git 프로세스를 정리하므로
+    저장소 수가 늘어도 프로세스 수와 메모리가 거의 늘지 않는다. 첫 동기화 시각은 START_JITTER_SECONDS
+    안에서 무작위로 분산되고, 실패한 저장소는 혼자 재시도 간격을 두 배씩 늘린다 (최대 MAX_BACKOFF_MINUTES).
+    """
+    def __init__(self, repos_file):
+        with open(repos_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        
+        now = time.monotonic()
+        self.states = []
+        for entry in config["repositories"] if isinstance(config, dict) else config:
+            self.states.append({
+                "path": entry["path"],
+                "remote_url": entry["remote_url"],
+                "branch": entry.get("branch", "main"),
+                "interval": entry.get("interval", SYNC_INTERVAL) * 60,
+                "name": entry.get("name", Path(entry["path"]).name),
+                "git_sync": None,
+                "watcher": None,
+                "failures": 0,
+                "next_run": now + random.uniform(0, START_JITTER_SECONDS),
+                "running": False,
+                "maintenance": RepoMaintenance(entry["path"]),
+                "last_sync": now,
+            })
+        
+        self.max_workers = config.get("max_workers", MAX_PARALLEL_SYNCS) if isinstance(config, dict) else MAX_PARALLEL_SYNCS
+        self.observer = None
+        self.output = None
 
-            if git_sync.sync_with_remote():
-                print("초기 동기화 완료")
+    def schedule_next(self, state, success):
+        if success:
+            state["failures"] = 0
+            interval = SAFETY_SYNC_INTERVAL * 60 if state["watcher"] else state["interval"]
+        else:
+            state["failures"] += 1
+            interval = min(state["interval"] * 2 ** state["failures"], MAX_BACKOFF_MINUTES * 60)
+            print(f"❌ {state['failures']}회 연속 실패, {interval / 60:.0f}분 뒤 재시도")
+        # 모든 저장소가 같은 순간에 원격 저장소에 몰리지 않도록 ±10% 흔들기
+        state["next_run"] = time.monotonic() + interval * random.uniform(0.9, 1.1)
+
+    def run_sync(self, state, changes=None):
+        self.output.set_prefix(f"[{state['name']}] ")
+        state["last_sync"] = time.monotonic()
+        success = False
+        try:
+            if state["git_sync"] is None:
+                state["git_sync"] = GitAdvancedAutoSync(state["path"], state["remote_url"], state["branch"], state["name"])
+                if self.observer:
+                    watcher = ChangeWatcher(state["path"], self.observer)
+                    if watcher.start():
+                        state["git_sync"].attach_fsmonitor(watcher)
+                        state["watcher"] = watcher
+            
+            git_sync = state["git_sync"]
+            if changes is None or git_sync.filter_ignored(sorted(changes)):
+                success = git_sync.sync_with_remote()
+                print("✅ 동기화 완료" if success else "❌ 동기화 실패")
             else:
-                print("초기 동기화 실패")
+                success = True
+        except Exception as e:
+            print(f"❌ 동기화 오류: {str(e)}")
+        finally:
+            if state["git_sync"]:
+                state["git_sync"].release()
+            # 변경 감지로 실행된 동기화는 원래 예약된 다음 동기화 시각을 유지
+            if changes is None or not success:
+                self.schedule_next(state, success)
+            state["running"] = False
+            self.output.flush()
 
-            schedule.every(SYNC_INTERVAL).minutes.do(git_sync.sync)
+    def run_maintenance(self, state):
+        self.output.set_prefix(f"[{state['name']}] ")
+        try:
+            if MAINTENANCE and state["maintenance"].is_due(time.monotonic() - state["last_sync"]):
+                state["maintenance"].run()
+            if state["git_sync"].compaction_due():
+                state["git_sync"].compact_history()
+        except Exception as e:
+            print(f"⚠️ 저장소 정리 실패: {str(e)}")
+        finally:
+            state["git_sync"].release()
+            state["running"] = False
+            self.output.flush()
 
-            while not self.stop_requested:
-                schedule.run_pending()
+    def run(self, should_stop=lambda: False):
+        print(f"📚 저장소 {len(self.states)}개 | 동시 동기화 {self.max_workers}개 | 시작 분산 {START_JITTER_SECONDS}초")
+        self.output = RepoPrefixedOutput(sys.stdout)
+        sys.stdout = self.output
+        
+        if WATCH_CHANGES:
+            try:
+                self.observer = Observer()
+                self.observer.start()
+            except OSError as e:
+                print(f"⚠️ 파일 변경 감지를 시작할 수 없습니다: {str(e)}")
+                self.observer = None
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while not should_stop():
+                now = time.monotonic()
+                for state in self.states:
+                    if state["running"]:
+                        continue
+                    changes = state["watcher"].take_changes() if state["watcher"] else None
+                    if changes or now >= state["next_run"]:
+                        state["running"] = True
+                        pool.submit(self.run_sync, state, changes if now < state["next_run"] else None)
+                    elif (state["git_sync"] and not (state["watcher"] and state["watcher"].pending)
+                          and ((MAINTENANCE and state["maintenance"].is_due(now - state["last_sync"]))
+                               or (now - state["last_sync"] >= MAINTENANCE_IDLE_SECONDS and state["git_sync"].compaction_due()))):
+                        # 저장소별 running 표시를 같이 써서 같은 저장소의 동기화와 겹치지 않음
+                        state["running"] = True
+                        pool.submit(self.run_maintenance, state)
                 time.sleep(1)
-                if win32event.WaitForSingleObject(self.hWaitStop, 1000) == win32event.WAIT_OBJECT_0:
-                    break
+        finally:
+            pool.shutdown(wait=True)
+            for state in self.states:
+                if state["watcher"] and state["watcher"].fsmonitor:
+                    state["watcher"].fsmonitor.stop()
+            if self.observer:
+                self.observer.stop()
+                self.observer.join()
+            sys.stdout = self.output.stream
 
-        except Exception as e:
-            print(f"서비스 오류: {str(e)}")
+def create_service_class():
+    """Windows 서비스 클래스 생성 (pywin32는 서비스로 실행할 때만 불러옴, 없으면 ImportError)"""
+    import socket
+    import win32event
+    import win32service
+    import win32serviceutil
+
+    class GitAdvancedAutoSyncService(win32serviceutil.ServiceFramework):
+        _svc_name_ = "GitAdvancedAutoSyncService"
+        _svc_display_name_ = "Git Advanced Auto Sync Service"
+        _svc_description_ = "고급 Git 자동 동기화 서비스 (충돌 해결 포함)"
+
+        def __init__(self, args):
+            win32serviceutil.ServiceFramework.__init__(self, args)
+            self.hWaitStop = win32event.CreateEvent(None, 0, 0, None)
+            socket.setdefaulttimeout(60)
+            self.stop_requested = False
+
+        def SvcStop(self):
+            self.ReportServiceStatus(win32service.SERVICE_STOP_PENDING)
+            win32event.SetEvent(self.hWaitStop)
+            self.stop_requested = True
+
+        def SvcDoRun(self):
+            self.main()
+
+        def main(self):
+            try:
+                if REPOS_FILE:
+                    RepoSyncManager(REPOS_FILE).run(lambda: self.stop_requested)
+                    return
+            
+                git_sync = GitAdvancedAutoSync(REPO_PATH, REMOTE_URL, BRANCH)
+
+                if git_sync.sync_with_remote():
+                    print("초기 동기화 완료")
+                else:
+                    print("초기 동기화 실패")
+
+                watcher = start_sync_schedule(git_sync)
+
+                while not self.stop_requested:
+                    run_pending_sync(git_sync, watcher)
+                    if win32event.WaitForSingleObject(self.hWaitStop, 1000) == win32event.WAIT_OBJECT_0:
+                        break
+            
+                if watcher:
+                    watcher.stop()
+
+            except Exception as e:
+                print(f"서비스 오류: {str(e)}")
+
+    globals()["GitAdvancedAutoSyncService"] = GitAdvancedAutoSyncService
+    return GitAdvancedAutoSyncService
+
+def print_sync_stats(hours):
+    """--stats: 저장소별 최근 hours시간 동기화 통계 출력 (실행 중인 프로그램의 기록을 읽기만 함)"""
+    if REPOS_FILE:
+        with open(REPOS_FILE, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        entries = config["repositories"] if isinstance(config, dict) else config
+        repos = [(entry.get("name", Path(entry["path"]).name), entry["path"]) for entry in entries]
+    else:
+        repos = [(Path(REPO_PATH).name, REPO_PATH)]
+    
+    for name, path in repos:
+        telemetry = SyncTelemetry(os.path.join(path, ".git"), name)
+        if not os.path.exists(telemetry.path):
+            print(f"📊 [{name}] 동기화 기록이 없습니다.")
+            continue
+        telemetry.print_summary(hours)
+
+def __getattr__(name):
+    # 서비스 관리자가 모듈에서 서비스 클래스를 찾을 때 처음으로 만듦
+    if name == "GitAdvancedAutoSyncService":
+        return create_service_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def restart_as_background():
     """백그라운드로 재시작"""
@@ -633,18 +2263,48 @@ def restart_as_background():
     time.sleep(3)
     sys.exit(0)
 
+def handle_termination(signum, frame):
+    """종료 신호(SIGTERM)를 Ctrl+C처럼 처리해 변경 감지 등을 정리한 뒤 종료"""
+    raise KeyboardInterrupt
+
 def run_foreground():
-    """포그라운드에서 실행"""
+    """포그라운드에서 실행 (Linux에서는 systemd 등으로 데몬처럼 실행 가능)"""
     if from_bat and "--background" not in sys.argv:
         restart_as_background()
         return
     
+    signal.signal(signal.SIGTERM, handle_termination)
+    
     try:
         print("✅ Git 자동 동기화 v3.1 시작")
+        startup_seconds = time.perf_counter() - STARTUP_TIME
+        if startup_seconds > STARTUP_TARGET_SECONDS:
+            print(f"⚠️ 시작 준비 {startup_seconds:.2f}초 (목표 {STARTUP_TARGET_SECONDS}초 초과)")
+        else:
+            print(f"⏱️ 시작 준비 {startup_seconds:.2f}초")
+        
+        if REPOS_FILE:
+            print("🛑 종료: Ctrl+C")
+            try:
+                RepoSyncManager(REPOS_FILE).run()
+            except KeyboardInterrupt:
+                print("\n\n🛑 프로그램을 종료합니다...")
+                sys.exit(0)
+            return
         
         git_sync = GitAdvancedAutoSync(REPO_PATH, REMOTE_URL, BRANCH)
         
-        print(f"📁 {REPO_PATH} | 🌐 {BRANCH} | ⏰ {SYNC_INTERVAL}분")
+        if WATCH_CHANGES:
+            print(f"📁 {REPO_PATH} | 🌐 {BRANCH} | 👀 변경 감지 ({DEBOUNCE_SECONDS}초 대기, 안전망 {SAFETY_SYNC_INTERVAL}분)")
+        else:
+            print(f"📁 {REPO_PATH} | 🌐 {BRANCH} | ⏰ {SYNC_INTERVAL}분")
+        
+        # 동기화 방식별로 히스토리가 얼마나 빨리 늘어나는지 표시 (커밋이 없으면 생략)
+        try:
+            commits_per_day, merges_per_day = git_sync.get_history_growth()
+            print(f"📈 동기화 방식: {SYNC_MODE} | 최근 7일 하루 평균 커밋 {commits_per_day:.1f}개 (병합 커밋 {merges_per_day:.1f}개)")
+        except Exception:
+            pass
         
         # 초기 동기화 실행
         if git_sync.sync_with_remote():
@@ -652,8 +2312,8 @@ def run_foreground():
         else:
             print("❌ 초기 동기화 실패")
         
-        # 스케줄러 설정
-        schedule.every(SYNC_INTERVAL).minutes.do(git_sync.sync)
+        # 스케줄러 및 변경 감지 설정
+        watcher = start_sync_schedule(git_sync)
         
         next_run = schedule.next_run()
         if next_run:
@@ -665,11 +2325,14 @@ def run_foreground():
             print("\n🔄 프로그램 실행 중...")
             
             while True:
-                schedule.run_pending()
-                time.sleep(60)  # 1초 대신 60초로 최적화
+                run_pending_sync(git_sync, watcher)
+                # 변경 감지 중에는 조용해진 변경을 바로 처리하도록 1초마다 확인
+                time.sleep(1 if watcher else 60)
                 
         except KeyboardInterrupt:
             print("\n\n🛑 프로그램을 종료합니다...")
+            if watcher:
+                watcher.stop()
             sys.exit(0)
             
     except Exception as e:
@@ -680,7 +2343,17 @@ def run_foreground():
         sys.exit(1)
 
 if __name__ == "__main__":
-    if "--service" in sys.argv:
-        win32serviceutil.HandleCommandLine(GitAdvancedAutoSyncService)
+    if "--stats" in sys.argv:
+        # 사용법: python git_advanced_automate.py --stats [시간, 기본 24]
+        stats_args = sys.argv[sys.argv.index("--stats") + 1:]
+        print_sync_stats(float(stats_args[0]) if stats_args and stats_args[0].replace(".", "", 1).isdigit() else 24)
+    elif "--service" in sys.argv:
+        try:
+            service_class = create_service_class()
+        except ImportError:
+            print("❌ 서비스 모드에는 Windows와 pywin32가 필요합니다. 포그라운드로 실행하세요.")
+            sys.exit(1)
+        import win32serviceutil
+        win32serviceutil.HandleCommandLine(service_class)
     else:
         run_foreground()
\ No newline at end of file
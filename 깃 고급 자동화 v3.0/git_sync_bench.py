@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# git_sync_bench.py
+"""
+Git 자동 동기화 엔진 벤치마크/회귀 테스트 (네트워크 없이 로컬 bare 저장소를 원격으로 사용)
+
+사용법:
+    python git_sync_bench.py run [--engines v3,v1] [--files 2000] [--cycles 30] [--output result.json]
+    python git_sync_bench.py compare baseline.json result.json [--tolerance 10]
+
+run     : 로컬 bare "원격" 저장소와 작업 클론을 만들고, 주기마다 파일을 바꾼 뒤 엔진의 동기화를 N번 실행
+          (다른 PC 역할의 클론이 --remote-every 주기마다 원격에 푸시하고, --conflict-every 주기마다 같은 파일을 고쳐 충돌을 만듦)
+          주기별 시간(p50/p95/최대), git 프로세스 실행 수, 단계별 시간, 병합/충돌 수, 객체 증가량을 측정
+compare : 두 결과 파일을 비교해 기준보다 느려졌거나 프로세스 실행/실패가 늘어난 항목을 표시 (회귀가 있으면 종료 코드 1)
+
+v3: 같은 폴더의 git_advanced_automate.py (GitAdvancedAutoSync.sync_with_remote)
+v1: ../깃 커밋 자동화 v1.0/git_commit.py (GitAutoSync.sync + 푸시 대기열을 바로 푸시, pywin32가 없으면 서비스 모듈 자리만 채워서 실행)
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+
+import git_advanced_automate
+
+V1_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "깃 커밋 자동화 v1.0", "git_commit.py")
+BRANCH = "main"
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@localhost",
+    "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@localhost",
+}
+
+def default_work_dir():
+    # tmpfs를 사용하여 디스크 성능이 아닌 git 실행과 코드 경로를 측정
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+def git(cwd, *args):
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} 실패: {result.stderr.strip()}")
+    return result.stdout.strip()
+
+def count_objects(path):
+    """git count-objects -v에서 객체 수와 크기(KB)만 추림"""
+    stats = dict(line.split(": ") for line in git(path, "count-objects", "-v").splitlines())
+    return {
+        "objects": int(stats["count"]) + int(stats["in-pack"]),
+        "kb": int(stats["size"]) + int(stats["size-pack"]),
+        "packs": int(stats["packs"]),
+    }
+
+def write_text_file(path, rng, size):
+    # 줄 단위 텍스트라 union 규칙으로 충돌을 풀 수 있고, 무작위 내용이라 압축으로 크기가 줄지 않음
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    line_count = max(size // 65, 1)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.writelines(rng.randbytes(32).hex() + "\n" for _ in range(line_count))
+
+def file_path(root, index):
+    return os.path.join(root, f"dir_{index % 50:02d}", f"file_{index:06d}.txt")
+
+@contextlib.contextmanager
+def count_git_spawns():
+    """이 안에서 실행된 git 프로세스 수 (subprocess와 GitPython 모두 subprocess.Popen을 거침)"""
+    counter = {"spawns": 0}
+    original_init = subprocess.Popen.__init__
+
+    def counting_init(self, args, *rest, **kwargs):
+        command = args if isinstance(args, (list, tuple)) else [args]
+        if command and os.path.basename(str(command[0])).startswith("git"):
+            counter["spawns"] += 1
+        original_init(self, args, *rest, **kwargs)
+
+    subprocess.Popen.__init__ = counting_init
+    try:
+        yield counter
+    finally:
+        subprocess.Popen.__init__ = original_init
+
+def create_fixture(base_dir, files, file_size, rng):
+    """bare 원격 저장소, 초기 파일을 올린 다른 PC 역할의 클론, 동기화할 작업 클론을 만듦"""
+    remote = os.path.join(base_dir, "remote.git")
+    other = os.path.join(base_dir, "other")
+    work = os.path.join(base_dir, "work")
+    git(base_dir, "init", "-q", "--bare", "-b", BRANCH, remote)
+    git(base_dir, "clone", "-q", remote, other)
+    for index in range(files):
+        write_text_file(file_path(other, index), rng, file_size)
+    git(other, "add", "-A")
+    git(other, "commit", "-q", "-m", "initial")
+    git(other, "push", "-q", "origin", BRANCH)
+    git(base_dir, "clone", "-q", remote, work)
+    return remote, other, work
+
+def push_from_other(other, paths, rng, file_size, force_sync):
+    """다른 PC에서 파일을 고쳐 푸시 (v1처럼 원격을 덮어쓰는 엔진이면 먼저 원격 상태로 맞춤)"""
+    git(other, "fetch", "-q", "origin")
+    if force_sync:
+        git(other, "reset", "-q", "--hard", f"origin/{BRANCH}")
+    else:
+        git(other, "rebase", "-q", f"origin/{BRANCH}")
+    for path in paths:
+        write_text_file(path, rng, file_size)
+    git(other, "add", "-A")
+    git(other, "commit", "-q", "-m", "remote change")
+    git(other, "push", "-q", "origin", BRANCH)
+
+def stub_win32_modules():
+    """pywin32가 없는 환경(Linux, CI)에서도 v1을 불러올 수 있도록 서비스 모듈 자리만 채움
+    
+    v1은 Windows 서비스 클래스 때문에 모듈 맨 위에서 pywin32를 불러오지만, 벤치마크는 서비스 코드를 실행하지 않는다.
+    """
+    for name in ("servicemanager", "win32event", "win32service", "win32serviceutil"):
+        if name in sys.modules or importlib.util.find_spec(name):
+            continue
+        module = types.ModuleType(name)
+        if name == "win32serviceutil":
+            module.ServiceFramework = type("ServiceFramework", (), {})
+        sys.modules[name] = module
+
+def load_engine(name):
+    """엔진별로 (동기화 함수를 만드는 함수, v1처럼 원격을 덮어쓰는지) 반환"""
+    if name == "v3":
+        module = git_advanced_automate
+        # 변경 감지 스레드와 기록 파일 없이 동기화 한 주기만 측정
+        module.WATCH_CHANGES = False
+        module.TELEMETRY = False
+
+        def create(work, remote):
+            engine = module.GitAdvancedAutoSync(work, remote, BRANCH)
+            return engine, engine.sync_with_remote
+        return create, False
+
+    spec = importlib.util.spec_from_file_location("git_commit_v1", V1_PATH)
+    module = importlib.util.module_from_spec(spec)
+    stub_win32_modules()
+    spec.loader.exec_module(module)
+    module.TELEMETRY = False
+
+    def create(work, remote):
+        engine = module.GitAutoSync(work, remote, BRANCH)
+
+        def sync():
+            # 백그라운드 푸시 스레드 대신 같은 주기 안에서 바로 푸시해서 주기 시간에 포함
+            engine.sync()
+            if not engine.push_worker.refresh_backlog():
+                return True
+            start_time = time.perf_counter()
+            pushed = engine.push_worker.push_pending()
+            # 푸시는 별도 주기로 기록되므로 동기화 주기의 단계별 시간에 합쳐서 보여줌
+            engine.cycle.phase_seconds["push"] = time.perf_counter() - start_time
+            return pushed
+        return engine, sync
+    return create, True
+
+def measure_engine(name, args):
+    create, force_sync = load_engine(name)
+    rng = random.Random(f"{name}-{args.seed}")
+    base_dir = tempfile.mkdtemp(prefix="git_sync_bench_", dir=args.work_dir)
+    saved_environ = dict(os.environ)
+    os.environ.update(GIT_IDENTITY)
+    try:
+        remote, other, work = create_fixture(base_dir, args.files, args.file_size, rng)
+        remote_before, work_before = count_objects(remote), count_objects(work)
+
+        # 엔진의 출력(print, 로그)은 결과 화면에서 숨김
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            engine, sync = create(work, remote)
+
+        cycles = []
+        for cycle in range(1, args.cycles + 1):
+            changed = rng.sample(range(args.files), max(int(args.files * args.change_rate), 1))
+            conflict = args.conflict_every and cycle % args.conflict_every == 0
+            if conflict:
+                # 다른 PC가 같은 파일을 먼저 고쳐 푸시한 상황
+                push_from_other(other, [file_path(other, changed[0])], rng, args.file_size, force_sync)
+            elif args.remote_every and cycle % args.remote_every == 0:
+                push_from_other(other, [file_path(other, args.files + 100000 + cycle)], rng, args.file_size, force_sync)
+
+            for index in changed:
+                write_text_file(file_path(work, index), rng, args.file_size)
+            for new_index in range(args.new_files):
+                write_text_file(file_path(work, args.files + cycle * args.new_files + new_index), rng, args.file_size)
+
+            with count_git_spawns() as counter, contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                start_time = time.perf_counter()
+                success = sync()
+                seconds = time.perf_counter() - start_time
+            phases = {phase: value for phase, value in engine.cycle.phase_seconds.items() if value}
+            cycles.append({
+                "seconds": seconds,
+                "spawns": counter["spawns"],
+                "success": bool(success),
+                "conflict": bool(conflict),
+                "phases": phases,
+            })
+
+        seconds = [cycle["seconds"] for cycle in cycles]
+        spawns = [cycle["spawns"] for cycle in cycles]
+        remote_after, work_after = count_objects(remote), count_objects(work)
+        phase_means = {}
+        for cycle in cycles:
+            for phase, value in cycle["phases"].items():
+                phase_means[phase] = phase_means.get(phase, 0.0) + value / len(cycles)
+        in_sync = git(work, "rev-parse", "HEAD") == git(remote, "rev-parse", BRANCH)
+        return {
+            "engine": name,
+            "files": args.files,
+            "file_size": args.file_size,
+            "cycles": len(cycles),
+            "p50_seconds": statistics.median(seconds),
+            "p95_seconds": sorted(seconds)[max(0, -(-len(seconds) * 95 // 100) - 1)],
+            "max_seconds": max(seconds),
+            "mean_seconds": statistics.mean(seconds),
+            "spawns_per_cycle": statistics.mean(spawns),
+            "max_spawns": max(spawns),
+            "phase_mean_seconds": phase_means,
+            "failures": sum(1 for cycle in cycles if not cycle["success"]),
+            "conflict_cycles": sum(1 for cycle in cycles if cycle["conflict"]),
+            "merge_commits": int(git(work, "rev-list", "--count", "--merges", "HEAD")),
+            "commits": int(git(work, "rev-list", "--count", "HEAD")),
+            "in_sync": in_sync,
+            "remote_objects": {"before": remote_before, "after": remote_after},
+            "work_objects": {"before": work_before, "after": work_after},
+            "cycle_details": cycles if args.details else None,
+        }
+    finally:
+        if hasattr(locals().get("engine"), "release"):
+            engine.release()
+        os.environ.clear()
+        os.environ.update(saved_environ)
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+def print_result(result):
+    growth = result["remote_objects"]["after"]["kb"] - result["remote_objects"]["before"]["kb"]
+    print(f"{result['engine']:3s} {result['files']:,d}개 파일 {result['cycles']}주기  "
+          f"p50 {result['p50_seconds']:.3f}s  p95 {result['p95_seconds']:.3f}s  최대 {result['max_seconds']:.3f}s  "
+          f"git 실행 {result['spawns_per_cycle']:.1f}회/주기  실패 {result['failures']}  "
+          f"병합 커밋 {result['merge_commits']}  원격 +{growth:,d}KB  일치 {result['in_sync']}")
+    phases = ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in result["phase_mean_seconds"].items())
+    print(f"    단계별 평균: {phases}")
+
+def run_benchmarks(args):
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git": git(".", "version"),
+        "parameters": {
+            key: getattr(args, key)
+            for key in ("files", "file_size", "cycles", "change_rate", "new_files", "remote_every", "conflict_every", "seed")
+        },
+        "results": [],
+    }
+    print(f"== Git 동기화 벤치마크 ({args.work_dir}) ==")
+    for name in args.engines.split(","):
+        try:
+            result = measure_engine(name, args)
+        except ImportError as e:
+            print(f"{name:3s} 건너뜀: {str(e)}")
+            continue
+        print_result(result)
+        report["results"].append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"결과 저장: {args.output}")
+
+# 시간 항목은 허용 범위를 넘으면 회귀, 프로세스 실행 수와 실패 수는 늘어나기만 해도 회귀
+RESULT_KEYS = ("engine", "files", "file_size", "cycles")
+TIME_FIELDS = ("p50_seconds", "p95_seconds")
+COUNT_FIELDS = ("spawns_per_cycle", "failures")
+MIN_TIME_DELTA = 0.005   # 이보다 작은 시간 차이(초)는 오차로 봄
+
+def compare_reports(baseline_path, current_path, tolerance):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(current_path, encoding='utf-8') as f:
+        current = json.load(f)
+
+    regressions = 0
+    baseline_results = {tuple(result[key] for key in RESULT_KEYS): result for result in baseline.get("results", [])}
+    for result in current.get("results", []):
+        key = tuple(result[key] for key in RESULT_KEYS)
+        if key not in baseline_results:
+            continue
+        old = baseline_results[key]
+        for field in TIME_FIELDS + COUNT_FIELDS:
+            if field in TIME_FIELDS:
+                change = (result[field] - old[field]) / max(old[field], 1e-9) * 100
+                regressed = change > tolerance and result[field] - old[field] > MIN_TIME_DELTA
+                detail = f"{old[field]:.3f}s -> {result[field]:.3f}s ({change:+.1f}%)"
+            else:
+                regressed = result[field] > old[field] + 1e-9
+                detail = f"{old[field]:g} -> {result[field]:g}"
+            if regressed:
+                regressions += 1
+            print(f"{'REGRESSION' if regressed else 'ok':10s} {'/'.join(map(str, key))} {field}: {detail}")
+
+    print(f"회귀 {regressions}건 (시간 허용 범위 {tolerance}%)")
+    return regressions == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Git 자동 동기화 엔진 벤치마크/회귀 테스트")
+    parser.add_argument("command", choices=["run", "compare"])
+    parser.add_argument("reports", nargs="*", help="compare: 기준.json 현재.json")
+    parser.add_argument("--engines", default="v3,v1", help="측정할 엔진 (v3, v1)")
+    parser.add_argument("--files", type=int, default=2000, help="초기 파일 수")
+    parser.add_argument("--file-size", type=int, default=4096, help="파일 크기 (바이트)")
+    parser.add_argument("--cycles", type=int, default=30, help="동기화 주기 수")
+    parser.add_argument("--change-rate", type=float, default=0.005, help="주기마다 수정할 파일 비율")
+    parser.add_argument("--new-files", type=int, default=2, help="주기마다 새로 만들 파일 수")
+    parser.add_argument("--remote-every", type=int, default=3, help="이 주기마다 다른 PC가 원격에 푸시 (0이면 안 함)")
+    parser.add_argument("--conflict-every", type=int, default=10, help="이 주기마다 같은 파일을 고쳐 충돌 발생 (0이면 안 함)")
+    parser.add_argument("--work-dir", default=default_work_dir(), help="테스트 저장소를 만들 폴더")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--details", action="store_true", help="주기별 결과도 저장")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="compare: 허용하는 시간 증가 (%%)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        if len(args.reports) != 2:
+            parser.error("compare에는 기준.json과 현재.json이 필요합니다")
+        sys.exit(0 if compare_reports(args.reports[0], args.reports[1], args.tolerance) else 1)
+    run_benchmarks(args)
+
+if __name__ == "__main__":
+    main()
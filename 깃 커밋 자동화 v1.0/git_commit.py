@@ -4,8 +4,20 @@ Git 자동 동기화 서비스
 ✔️ 커밋 메시지는 아래와 같은 형식입니다:
     Automated Commit Update at (업데이트 된 시간))
 
+✔️ 오프라인이어도 커밋은 로컬에 바로 기록되고 푸시는 백그라운드에서 진행됩니다
+    (지수 백오프 + 지터로 재시도, 대기 중인 커밋 수와 경과 시간을 로그에 표시)
+
+✔️ 동기화 사이에 객체 수가 기준을 넘으면 저장소 정리
+    (prune, 느슨한 객체 팩 묶기, 점진적 재압축, commit-graph)
+
+✔️ 동기화와 푸시 시도마다 단계별 시간과 결과를 .git/autosync-telemetry.sqlite에 기록
+    (python git_commit.py --stats [시간]으로 p50/p95 확인, Prometheus textfile 내보내기 선택)
+
+✔️ 처음 동기화할 양이 많으면 폴더 순서로 일정 크기씩 나눠 커밋하고 한 묶음씩 푸시
+    (실패하면 마지막으로 푸시한 묶음 다음부터 이어서 진행, 진행률(MB, 파일 수)을 로그에 기록)
+
 📌 아래 위치에서 경로와 URL, 브랜치 양식을 알맞게 수정 후 사용하세요!:
-    ▶ 205줄, 260줄
+    ▶ 965줄, 1023줄
 """
 # ─────────────────────────────────────────────────────
 # 사용 전 필수 확인 사항:
@@ -21,14 +33,22 @@ Git 자동 동기화 서비스
 # Git_Automate.vbs는 바로가기 생성 후 시작프로그램에 등록하세요! --바로가기 생성 중요!--
 # ─────────────────────────────────────────────────────
 
+import atexit
+import json
+import math
 import os
+import random
+import sqlite3
+import threading
 import time
 import traceback
-from datetime import datetime
+from contextlib import closing
+from datetime import datetime, timedelta
 from git import Repo
 import schedule
 import sys
 import logging
+import logging.handlers
 from pathlib import Path
 import servicemanager
 import socket
@@ -40,12 +60,644 @@ import subprocess
 # bat 파일에서 실행했는지 확인하기 위한 플래그
 from_bat = "--from-bat" in sys.argv
 
+# 자동 커밋 방식: "plumbing" (git 프로세스 최소화), "gitpython" (기존 방식)
+GIT_BACKEND = "plumbing"
+
+# 푸시 대기열: 커밋은 로컬에 바로 만들고 백그라운드 작업자가 푸시
+PUSH_RETRY_BASE_SECONDS = 30  # 첫 푸시 실패 후 대기 시간 (실패할 때마다 두 배)
+PUSH_RETRY_MAX_SECONDS = 1800  # 푸시 재시도 사이 최대 대기 시간
+PUSH_PROBE_TIMEOUT = 15  # 원격 저장소 연결 확인 제한 시간 (초)
+PUSH_TIMEOUT = 300  # 푸시 한 번의 제한 시간 (초)
+
+# 첫 가져오기: 처음 동기화할 양이 많으면 폴더 순서로 일정 크기씩 나눠 커밋하고 한 묶음씩 푸시
+IMPORT_BATCH_MB = 500  # 한 묶음의 최대 크기 (MB), 변경 전체가 이보다 크면 나눠서 가져옴 (0이면 사용 안 함)
+
+# 저장소 정리: 동기화 사이에 객체 수가 아래 기준을 넘었을 때만 실행
+MAINTENANCE = True  # 자동 정리 사용 여부
+MAINTENANCE_LOOSE_OBJECTS = 1000  # 느슨한 객체가 이 수 이상이면 오래된 불필요 객체를 지우고 나머지를 팩으로 묶음
+MAINTENANCE_PACKS = 20  # 팩 파일이 이 수 이상이면 multi-pack-index로 점진적 재압축
+MAINTENANCE_IDLE_SECONDS = 300  # 마지막 동기화 후 이 시간(초) 동안 조용할 때만 실행
+MAINTENANCE_CHECK_MINUTES = 30  # 객체 수 확인 간격 (분)
+
+# 동기화 기록: 동기화와 푸시 시도마다 단계별 시간과 결과 (.git/autosync-telemetry.sqlite)
+TELEMETRY = True  # 동기화 기록 사용 여부 (통계 보기: python git_commit.py --stats [시간])
+TELEMETRY_RETENTION_DAYS = 30  # 주기별 기록 보관 기간 (일), 지난 기록은 시간별 합계로만 남음
+PROMETHEUS_TEXTFILE_DIR = ""  # node_exporter textfile 수집 폴더 (예: "/var/lib/node_exporter/textfile"), 비우면 내보내지 않음
+LOG_MAX_BYTES = 5 * 1024 * 1024  # git_sync.log가 이 크기를 넘으면 새 파일로 교체 (이전 파일 3개 보관)
+
+SYNC_PHASES = ("status", "add", "commit", "fetch", "merge", "push", "other")
+
+class GitPlumbing:
+    """git 프로세스를 적게 띄우는 자동 커밋 백엔드
+
+    커밋/트리 조회는 계속 살아 있는 git cat-file --batch-check 프로세스 하나로 처리하고,
+    커밋은 update-index → write-tree → commit-tree → update-ref로 만든다.
+    (GitPython의 index.commit처럼 인덱스 전체를 Python에서 읽고 트리를 만들지 않음)
+    """
+    def __init__(self, repo_path):
+        self.repo_path = str(repo_path)
+        self.batch_process = None
+        atexit.register(self.close)
+
+    def run(self, *args, input=None):
+        result = subprocess.run(["git", *args], cwd=self.repo_path, input=input, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout.decode("utf-8", "surrogateescape")
+
+    def resolve(self, revision):
+        """리비전의 객체 ID 반환 (없으면 None). 조회마다 프로세스를 새로 띄우지 않음"""
+        if self.batch_process is None or self.batch_process.poll() is not None:
+            self.batch_process = subprocess.Popen(
+                ["git", "cat-file", "--batch-check"], cwd=self.repo_path,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        self.batch_process.stdin.write(revision.encode("utf-8") + b"\n")
+        self.batch_process.stdin.flush()
+        line = self.batch_process.stdout.readline()
+        if not line:
+            self.close()
+            raise RuntimeError("git cat-file --batch-check 프로세스가 종료되었습니다.")
+
+        # "<객체 ID> <종류> <크기>" 또는 "<리비전> missing"
+        fields = line.decode("utf-8", "replace").split()
+        return fields[0] if len(fields) == 3 and fields[1] in ("commit", "tree", "blob", "tag") else None
+
+    def commit(self, message, paths=None, cycle=None):
+        """변경 파일을 인덱스에 반영하고 커밋. 트리가 HEAD와 같으면 커밋하지 않고 None 반환
+
+        paths를 주지 않으면 git ls-files로 변경/삭제/추적 안 된 파일을 찾는다.
+        cycle(SyncCycle)을 주면 단계별 시간과 커밋한 파일 수를 기록한다.
+        """
+        if paths is None:
+            if cycle:
+                cycle.enter("status")
+            output = self.run("ls-files", "--modified", "--deleted", "--others", "--exclude-standard", "-z")
+            paths = list(dict.fromkeys(path for path in output.split("\0") if path))
+        if cycle:
+            cycle.enter("add")
+        if paths:
+            # --remove: 작업 트리에서 지워진 파일은 인덱스에서도 제거
+            self.run("update-index", "--add", "--remove", "--replace", "-z", "--stdin",
+                     input="\0".join(paths).encode("utf-8", "surrogateescape") + b"\0")
+
+        if cycle:
+            cycle.enter("commit")
+        tree = self.run("write-tree").strip()
+        parent = self.resolve("HEAD")
+        if parent and tree == self.resolve("HEAD^{tree}"):
+            return None
+
+        args = ["commit-tree", tree, "-m", message]
+        if parent:
+            args += ["-p", parent]
+        commit = self.run(*args).strip()
+        # 그 사이 다른 프로그램이 HEAD를 옮겼다면 덮어쓰지 않도록 이전 값을 함께 확인
+        self.run("update-ref", "-m", f"commit: {message}", "HEAD", commit, parent or "")
+        if cycle:
+            cycle.files_changed = len(paths)
+        return commit
+
+    def close(self):
+        if self.batch_process and self.batch_process.poll() is None:
+            self.batch_process.stdin.close()
+            self.batch_process.wait()
+        self.batch_process = None
+
+class RepoMaintenance:
+    """동기화 사이에 객체 수를 확인해 필요한 정리 작업만 실행
+
+    자동 커밋(plumbing, GitPython)은 git commit과 달리 gc --auto를 부르지 않아
+    느슨한 객체와 작은 팩이 계속 쌓입니다. 동기화와 같은 스레드에서 실행하므로 동기화와 겹치지 않습니다.
+    """
+    def __init__(self, repo_path, logger):
+        self.repo_path = str(repo_path)
+        self.logger = logger
+        self.next_check = 0.0
+        self.last_result = None
+
+    def git(self, *args):
+        result = subprocess.run(["git", *args], cwd=self.repo_path, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} 실패: {result.stderr.strip()}")
+        return result.stdout
+
+    def count_objects(self):
+        """git count-objects -v 결과 (count: 느슨한 객체 수, packs: 팩 파일 수 등)"""
+        stats = {}
+        for line in self.git("count-objects", "-v").splitlines():
+            key, value = line.split(": ", 1)
+            stats[key] = int(value)
+        return stats
+
+    def has_commit_graph(self):
+        info_dir = Path(self.git("rev-parse", "--git-path", "objects/info").strip())
+        if not info_dir.is_absolute():
+            info_dir = Path(self.repo_path) / info_dir
+        return (info_dir / "commit-graph").exists() or (info_dir / "commit-graphs").exists()
+
+    def plan_tasks(self, stats):
+        """기준을 넘은 항목에 해당하는 작업만 골라 실행 순서대로 반환"""
+        tasks = []
+        if stats["count"] >= MAINTENANCE_LOOSE_OBJECTS:
+            tasks += ["prune", "loose-objects"]
+        if stats["packs"] >= MAINTENANCE_PACKS:
+            tasks.append("incremental-repack")
+        if tasks or not self.has_commit_graph():
+            tasks.append("commit-graph")
+        return tasks
+
+    def run_task(self, task):
+        if task == "prune":
+            # 2주 넘게 어디에서도 참조하지 않는 느슨한 객체 삭제 (git gc 기본값과 같음)
+            self.git("prune", "--expire=2.weeks.ago")
+        elif task == "commit-graph":
+            # log/merge-base/fetch 협상이 커밋을 풀지 않고 그래프 파일만 읽도록
+            self.git("commit-graph", "write", "--reachable", "--changed-paths", "--split")
+        elif task == "incremental-repack":
+            self.git("multi-pack-index", "write")
+            self.git("maintenance", "run", "--task=incremental-repack")
+        elif task == "loose-objects":
+            self.git("maintenance", "run", "--task=loose-objects")
+            # 이 작업은 팩으로 묶은 느슨한 객체를 다음 실행 때 지우므로 바로 정리
+            self.git("prune-packed")
+        else:
+            self.git("maintenance", "run", f"--task={task}")
+
+    def is_due(self, idle_seconds):
+        return idle_seconds >= MAINTENANCE_IDLE_SECONDS and time.monotonic() >= self.next_check
+
+    def run(self):
+        """객체 수를 확인하고 필요한 작업 실행. 실행했으면 전후 객체 수와 소요 시간을 반환"""
+        self.next_check = time.monotonic() + MAINTENANCE_CHECK_MINUTES * 60
+        try:
+            before = self.count_objects()
+            tasks = self.plan_tasks(before)
+            if not tasks:
+                return None
+
+            start = time.perf_counter()
+            timings = {}
+            for task in tasks:
+                task_start = time.perf_counter()
+                self.run_task(task)
+                timings[task] = round(time.perf_counter() - task_start, 3)
+            after = self.count_objects()
+        except Exception as e:
+            self.logger.error(f"Maintenance failed: {str(e)}")
+            return None
+
+        self.last_result = {
+            "time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "tasks": timings,
+            "seconds": round(time.perf_counter() - start, 3),
+            "before": before,
+            "after": after,
+        }
+        self.logger.info(
+            f"Maintenance ({', '.join(tasks)}): loose objects {before['count']} -> {after['count']}, "
+            f"packs {before['packs']} -> {after['packs']}, "
+            f"{(before['size'] + before['size-pack']) / 1024:.1f} -> {(after['size'] + after['size-pack']) / 1024:.1f} MB, "
+            f"{self.last_result['seconds']:.2f}s"
+        )
+        return self.last_result
+
+    def run_if_idle(self, last_sync_time):
+        """스케줄러 루프에서 호출. 자동 정리가 켜져 있고 최근 동기화가 없을 때만 실행"""
+        if MAINTENANCE and self.is_due(time.monotonic() - last_sync_time):
+            return self.run()
+        return None
+
+def percentile(values, fraction):
+    """정렬하지 않은 값 목록의 백분위수 (nearest-rank, 값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+class SyncCycle:
+    """동기화 한 번 또는 푸시 시도 한 번의 단계별 시간과 결과
+
+    enter()로 단계를 바꾸면 그때까지 걸린 시간이 이전 단계에 더해진다 (어느 단계도 아니면 "other").
+    """
+    def __init__(self, kind="sync"):
+        self.kind = kind
+        self.started = time.time()
+        self.start_counter = time.perf_counter()
+        self.phase_seconds = dict.fromkeys(SYNC_PHASES, 0.0)
+        self.phase = "other"
+        self.phase_start = self.start_counter
+        self.files_changed = 0
+        self.bytes_pushed = 0
+        self.round_trips = 0  # ls-remote/push처럼 원격 저장소에 접속한 횟수
+        self.outcome = None
+        self.seconds = None
+
+    def enter(self, phase):
+        now = time.perf_counter()
+        self.phase_seconds[self.phase] += now - self.phase_start
+        self.phase, self.phase_start = phase, now
+
+    def finish(self, success):
+        self.enter("other")
+        self.seconds = time.perf_counter() - self.start_counter
+        if self.outcome is None:
+            if not success:
+                self.outcome = "failed"
+            elif self.files_changed or self.round_trips > 1:
+                self.outcome = "ok"
+            else:
+                # 커밋할 변경도 푸시한 것도 없었던 주기
+                self.outcome = "idle"
+
+class SyncTelemetry:
+    """동기화 기록 저장소 (SQLite, 저장소의 .git/autosync-telemetry.sqlite)
+
+    주기별 기록(cycles)은 TELEMETRY_RETENTION_DAYS 동안만 보관하고 시간별 합계(hourly)는 계속 남겨서
+    오래 실행해도 파일이 거의 커지지 않는다. 기록할 때마다 PROMETHEUS_TEXTFILE_DIR의 지표 파일도 갱신한다.
+    """
+    def __init__(self, git_dir, name, logger):
+        self.path = os.path.join(git_dir, "autosync-telemetry.sqlite")
+        self.name = name
+        self.logger = logger
+
+    def connect(self):
+        # 호출마다 따로 연결 (동기화 루프와 푸시 작업 스레드가 각각 기록함)
+        connection = sqlite3.connect(self.path, timeout=10)
+        phase_columns = ", ".join(f"{phase}_seconds REAL" for phase in SYNC_PHASES)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS cycles (started REAL, kind TEXT, outcome TEXT, seconds REAL, {phase_columns}, "
+            "files_changed INTEGER, bytes_pushed INTEGER, round_trips INTEGER)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS cycles_started ON cycles (started)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS hourly (hour INTEGER, kind TEXT, outcome TEXT, cycles INTEGER, seconds REAL, "
+            "max_seconds REAL, files_changed INTEGER, bytes_pushed INTEGER, round_trips INTEGER, PRIMARY KEY (hour, kind, outcome))"
+        )
+        return connection
+
+    def record(self, cycle):
+        row = (
+            cycle.started, cycle.kind, cycle.outcome, cycle.seconds,
+            *(cycle.phase_seconds[phase] for phase in SYNC_PHASES),
+            cycle.files_changed, cycle.bytes_pushed, cycle.round_trips,
+        )
+        try:
+            with closing(self.connect()) as connection, connection:
+                connection.execute(f"INSERT INTO cycles VALUES ({', '.join('?' * len(row))})", row)
+                connection.execute(
+                    "INSERT INTO hourly VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?) ON CONFLICT (hour, kind, outcome) DO UPDATE SET "
+                    "cycles = cycles + 1, seconds = seconds + excluded.seconds, max_seconds = max(max_seconds, excluded.max_seconds), "
+                    "files_changed = files_changed + excluded.files_changed, bytes_pushed = bytes_pushed + excluded.bytes_pushed, "
+                    "round_trips = round_trips + excluded.round_trips",
+                    (int(cycle.started // 3600 * 3600), cycle.kind, cycle.outcome, cycle.seconds, cycle.seconds,
+                     cycle.files_changed, cycle.bytes_pushed, cycle.round_trips),
+                )
+                connection.execute("DELETE FROM cycles WHERE started < ?", (time.time() - TELEMETRY_RETENTION_DAYS * 24 * 60 * 60,))
+            if PROMETHEUS_TEXTFILE_DIR:
+                self.write_prometheus()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Failed to record telemetry: {str(e)}")
+
+    def summarize(self, hours=24, kind="sync"):
+        """최근 hours시간 동안의 주기 수, 결과별 횟수, 전체와 단계별 p50/p95 (기록이 없으면 None)"""
+        with closing(self.connect()) as connection:
+            rows = connection.execute(
+                f"SELECT outcome, seconds, {', '.join(f'{phase}_seconds' for phase in SYNC_PHASES)}, files_changed, bytes_pushed, round_trips "
+                "FROM cycles WHERE kind = ? AND started >= ?", (kind, time.time() - hours * 60 * 60)
+            ).fetchall()
+        if not rows:
+            return None
+
+        outcomes = {}
+        for row in rows:
+            outcomes[row[0]] = outcomes.get(row[0], 0) + 1
+        seconds = [row[1] for row in rows]
+        phases = {}
+        for index, phase in enumerate(SYNC_PHASES, start=2):
+            values = [row[index] for row in rows if row[index]]
+            if values:
+                phases[phase] = (percentile(values, 0.5), percentile(values, 0.95))
+        return {
+            "cycles": len(rows),
+            "outcomes": outcomes,
+            "p50": percentile(seconds, 0.5),
+            "p95": percentile(seconds, 0.95),
+            "max": max(seconds),
+            "phases": phases,
+            "files_changed": sum(row[-3] for row in rows),
+            "bytes_pushed": sum(row[-2] for row in rows),
+            "round_trips": sum(row[-1] for row in rows),
+        }
+
+    def print_summary(self, hours=24):
+        found = False
+        for kind in ("sync", "push"):
+            summary = self.summarize(hours, kind)
+            if not summary:
+                continue
+            found = True
+            outcomes = ", ".join(f"{outcome} {count}" for outcome, count in sorted(summary["outcomes"].items()))
+            print(f"📊 [{self.name}] 최근 {hours}시간 {kind}: {summary['cycles']}회 ({outcomes})")
+            print(f"   주기 p50 {summary['p50']:.3f}초 | p95 {summary['p95']:.3f}초 | 최대 {summary['max']:.3f}초")
+            print("   단계별 p50/p95: " + ", ".join(
+                f"{phase} {p50:.3f}/{p95:.3f}초" for phase, (p50, p95) in summary["phases"].items()
+            ))
+            print(f"   변경 파일 {summary['files_changed']}개 | 푸시 {summary['bytes_pushed'] / 1024:.1f} KB | 원격 접속 {summary['round_trips']}회")
+        if not found:
+            print(f"📊 [{self.name}] 최근 {hours}시간 동안 동기화 기록이 없습니다.")
+
+    def write_prometheus(self):
+        """node_exporter textfile 수집기용 지표 파일을 원자적으로 교체"""
+        repo_label = self.name.replace("\\", "\\\\").replace('"', '\\"')
+        with closing(self.connect()) as connection:
+            totals = connection.execute(
+                "SELECT kind, outcome, SUM(cycles), SUM(seconds), SUM(files_changed), SUM(bytes_pushed), SUM(round_trips) "
+                "FROM hourly GROUP BY kind, outcome"
+            ).fetchall()
+            last = connection.execute(
+                "SELECT started, seconds FROM cycles WHERE kind = 'sync' ORDER BY started DESC LIMIT 1"
+            ).fetchone()
+            last_success = connection.execute(
+                "SELECT MAX(started) FROM cycles WHERE kind = 'push' AND outcome = 'ok'"
+            ).fetchone()[0]
+
+        metrics = {
+            "git_autosync_cycles_total": ("counter", "Sync cycles and push attempts by kind and outcome", []),
+            "git_autosync_cycle_seconds_total": ("counter", "Time spent in sync cycles and push attempts", []),
+            "git_autosync_files_changed_total": ("counter", "Files committed by sync cycles", []),
+            "git_autosync_pushed_bytes_total": ("counter", "On-disk size of pushed objects", []),
+            "git_autosync_remote_round_trips_total": ("counter", "Connections to the remote (ls-remote, push)", []),
+            "git_autosync_last_cycle_timestamp_seconds": ("gauge", "Start time of the last sync cycle", []),
+            "git_autosync_last_cycle_duration_seconds": ("gauge", "Duration of the last sync cycle", []),
+            "git_autosync_last_success_timestamp_seconds": ("gauge", "Start time of the last successful push", []),
+            "git_autosync_cycle_duration_seconds": ("gauge", "Sync cycle duration quantiles over the last 24 hours", []),
+        }
+        for kind, outcome, cycles, seconds, files_changed, bytes_pushed, round_trips in totals:
+            labels = f'repo="{repo_label}",kind="{kind}",outcome="{outcome}"'
+            metrics["git_autosync_cycles_total"][2].append((labels, cycles))
+            metrics["git_autosync_cycle_seconds_total"][2].append((labels, round(seconds, 3)))
+            metrics["git_autosync_files_changed_total"][2].append((labels, files_changed))
+            metrics["git_autosync_pushed_bytes_total"][2].append((labels, bytes_pushed))
+            metrics["git_autosync_remote_round_trips_total"][2].append((labels, round_trips))
+        labels = f'repo="{repo_label}"'
+        if last:
+            metrics["git_autosync_last_cycle_timestamp_seconds"][2].append((labels, round(last[0], 3)))
+            metrics["git_autosync_last_cycle_duration_seconds"][2].append((labels, round(last[1], 3)))
+        if last_success:
+            metrics["git_autosync_last_success_timestamp_seconds"][2].append((labels, round(last_success, 3)))
+        summary = self.summarize(24)
+        if summary:
+            for quantile in ("0.5", "0.95"):
+                value = summary["p50" if quantile == "0.5" else "p95"]
+                metrics["git_autosync_cycle_duration_seconds"][2].append((f'{labels},quantile="{quantile}"', round(value, 3)))
+
+        lines = []
+        for metric, (metric_type, help_text, samples) in metrics.items():
+            if samples:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"]
+                lines += [f"{metric}{{{labels}}} {value}" for labels, value in samples]
+
+        file_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.name)
+        path = os.path.join(PROMETHEUS_TEXTFILE_DIR, f"git_autosync_{file_name}.prom")
+        # 수집기가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        with open(path + ".tmp", 'w', encoding='utf-8', newline='\n') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(path + ".tmp", path)
+
+class PushWorker(threading.Thread):
+    """아직 원격 저장소에 올라가지 않은 로컬 커밋을 백그라운드에서 푸시하는 스레드
+
+    대기열은 origin/<브랜치>와 <브랜치> 사이의 커밋이므로 git 안에 그대로 남아 재시작해도 유지됩니다.
+    푸시 전에 git ls-remote로 원격 저장소 연결을 확인하고, 연결되지 않는 동안은
+    지수 백오프와 지터를 적용해 다시 시도합니다.
+    """
+    def __init__(self, repo_path, branch, logger):
+        super().__init__(name="PushWorker", daemon=True)
+        self.repo_path = str(repo_path)
+        self.branch = branch
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.failures = 0
+        self.next_attempt = None
+        self.pending_count = 0
+        self.oldest_pending = None
+        self.telemetry = None  # SyncTelemetry (저장소를 불러온 뒤 설정)
+
+    def git(self, *args, timeout=None):
+        # 아무도 답할 수 없는 인증 입력 창을 기다리지 않음
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        return subprocess.run(["git", *args], cwd=self.repo_path, env=env, capture_output=True, timeout=timeout)
+
+    def refresh_backlog(self):
+        """푸시 대기 중인 커밋 수와 가장 오래된 커밋의 시각 확인"""
+        with self.lock:
+            revisions = [f"refs/heads/{self.branch}"]
+            remote_ref = f"refs/remotes/origin/{self.branch}"
+            if self.git("rev-parse", "--verify", "-q", remote_ref).returncode == 0:
+                revisions += ["--not", remote_ref]
+            result = self.git("log", "--format=%ct", *revisions, "--")
+            # 브랜치에 아직 커밋이 없으면 실패
+            times = result.stdout.split() if result.returncode == 0 else []
+            self.pending_count = len(times)
+            self.oldest_pending = datetime.fromtimestamp(int(times[-1])) if times else None
+            return self.pending_count
+
+    def describe_backlog(self):
+        if not self.pending_count:
+            return "푸시 대기 중인 커밋 없음"
+        age_minutes = int((datetime.now() - self.oldest_pending).total_seconds() // 60) if self.oldest_pending else 0
+        text = f"푸시 대기: 커밋 {self.pending_count}개, 가장 오래된 커밋 {age_minutes}분 경과"
+        if self.next_attempt:
+            text += f", 다음 시도 {self.next_attempt.strftime('%H:%M:%S')}"
+        return text
+
+    def get_unpushed_bytes(self):
+        """원격에 아직 없는 커밋들이 가진 객체의 디스크 크기 (푸시할 양의 추정치)"""
+        result = self.git("rev-list", "--objects", "--disk-usage", f"refs/heads/{self.branch}", "--not", "--remotes=origin")
+        try:
+            return int(result.stdout) if result.returncode == 0 else 0
+        except ValueError:
+            return 0
+
+    def push_pending(self):
+        """푸시 한 번 시도. 실패하면 다음 시도 시각을 정하고 False 반환"""
+        cycle = SyncCycle("push")
+        pushed = False
+        try:
+            pushed = self.attempt_push(cycle)
+            return pushed
+        finally:
+            cycle.finish(pushed)
+            if self.telemetry:
+                self.telemetry.record(cycle)
+
+    def attempt_push(self, cycle):
+        """원격 연결을 확인하고 한 번 푸시 (단계별 시간과 결과는 cycle에 기록)"""
+        try:
+            cycle.enter("fetch")
+            cycle.round_trips += 1
+            probe = self.git("ls-remote", "--heads", "origin", self.branch, timeout=PUSH_PROBE_TIMEOUT)
+            if probe.returncode != 0:
+                cycle.outcome = "offline"
+                raise RuntimeError(f"원격 저장소에 연결할 수 없음: {probe.stderr.decode('utf-8', 'replace').strip()}")
+
+            self.logger.info(f"Force pushing {self.pending_count} commit(s) to origin/{self.branch}...")
+            cycle.enter("push")
+            unpushed_bytes = self.get_unpushed_bytes()
+            cycle.round_trips += 1
+            result = self.git("push", "--force", "--porcelain", "origin", self.branch, timeout=PUSH_TIMEOUT)
+            if result.returncode != 0:
+                cycle.outcome = "rejected"
+                raise RuntimeError(f"푸시 거부됨: {result.stderr.decode('utf-8', 'replace').strip()}")
+            cycle.bytes_pushed = unpushed_bytes
+        except (RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+            if cycle.outcome is None:
+                cycle.outcome = "timeout" if isinstance(e, subprocess.TimeoutExpired) else "failed"
+            self.failures += 1
+            delay = min(PUSH_RETRY_MAX_SECONDS, PUSH_RETRY_BASE_SECONDS * 2 ** (self.failures - 1))
+            # 여러 클라이언트가 동시에 재시도하지 않도록 백오프의 절반~전체 사이에서 무작위로 대기
+            self.next_attempt = datetime.now() + timedelta(seconds=random.uniform(delay / 2, delay))
+            self.logger.error(f"Push failed ({self.failures} in a row): {str(e)}")
+            self.logger.warning(self.describe_backlog())
+            return False
+
+        for line in result.stdout.decode("utf-8", "replace").splitlines():
+            if line.startswith(("+", " ", "*", "=")):
+                self.logger.info(f"Push result: {line.strip()}")
+        self.failures = 0
+        self.next_attempt = None
+        self.refresh_backlog()
+        return True
+
+    def notify(self):
+        """새 커밋이 생겼음을 작업자에게 알림"""
+        self.wake_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            timeout = None
+            if self.refresh_backlog() == 0:
+                self.failures = 0
+                self.next_attempt = None
+            elif self.next_attempt and datetime.now() < self.next_attempt:
+                # 새 커밋이 생겨도 백오프 대기는 줄이지 않음
+                timeout = (self.next_attempt - datetime.now()).total_seconds()
+            elif self.push_pending():
+                continue
+            else:
+                timeout = (self.next_attempt - datetime.now()).total_seconds()
+
+            self.wake_event.wait(max(timeout, 0) if timeout is not None else None)
+            self.wake_event.clear()
+
+class InitialImport:
+    """큰 작업 트리를 일정 크기 묶음으로 나눠 커밋하는 가져오기의 진행 상황
+
+    이어서 진행할 위치는 git 자체에 있음: 푸시한 묶음의 파일은 이미 커밋되어 변경 목록에 나오지 않으므로
+    실패하거나 다시 시작하면 남은 파일만 다시 나눈다. .git/autosync-import.json에는 진행률 표시용 합계만 저장한다.
+    """
+    def __init__(self, git_dir, logger):
+        self.path = os.path.join(git_dir, "autosync-import.json")
+        self.logger = logger
+        self.state = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = None
+
+    @property
+    def active(self):
+        return self.state is not None
+
+    def is_large(self, changes):
+        return IMPORT_BATCH_MB > 0 and sum(changes.values()) > IMPORT_BATCH_MB * 1024 * 1024
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.path)
+
+    def start(self, changes):
+        if self.state is None:
+            self.state = {
+                "started": datetime.now().isoformat(timespec="seconds"),
+                "total_files": len(changes), "total_bytes": sum(changes.values()),
+                "pushed_files": 0, "pushed_bytes": 0, "pending_files": 0, "pending_bytes": 0, "batches": 0,
+            }
+            self.save()
+            self.logger.info(f"Initial import: {len(changes)} files, {sum(changes.values()) / 1024 ** 2:.1f} MB "
+                             f"in batches of up to {IMPORT_BATCH_MB} MB")
+
+    def plan(self, changes):
+        """변경된 경로를 폴더끼리 모아 IMPORT_BATCH_MB 이하의 묶음으로 나눔
+
+        한도보다 큰 파일 하나는 그 파일만으로 한 묶음이 된다.
+        """
+        limit = IMPORT_BATCH_MB * 1024 * 1024
+        batches, batch, batch_bytes = [], [], 0
+        for path in sorted(changes, key=lambda path: (os.path.dirname(path), path)):
+            if batch and batch_bytes + changes[path] > limit:
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(path)
+            batch_bytes += changes[path]
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def batch_committed(self, files, size):
+        self.state["batches"] += 1
+        self.state["pending_files"] += files
+        self.state["pending_bytes"] += size
+        self.save()
+
+    def batch_pushed(self):
+        """커밋한 묶음이 원격에 올라감: 완료로 계산하고 진행률 기록"""
+        if not self.state or not self.state["pending_files"]:
+            return
+        state = self.state
+        state["pushed_files"] += state["pending_files"]
+        state["pushed_bytes"] += state["pending_bytes"]
+        state["pending_files"] = state["pending_bytes"] = 0
+        self.save()
+        total_bytes = max(state["total_bytes"], state["pushed_bytes"], 1)
+        self.logger.info(
+            f"Import batch {state['batches']} pushed: {state['pushed_bytes'] / 1024 ** 2:.1f} / {total_bytes / 1024 ** 2:.1f} MB "
+            f"({state['pushed_bytes'] * 100 // total_bytes}%), {state['pushed_files']} / {max(state['total_files'], state['pushed_files'])} files"
+        )
+
+    def finish(self):
+        if self.state:
+            self.logger.info(f"Initial import finished: {self.state['batches']} batch(es) pushed since {self.state['started']}")
+        self.state = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
 class GitAutoSync:
     def __init__(self, repo_path, remote_url, branch="gb"):
         self.repo_path = Path(repo_path)
         self.remote_url = remote_url
         self.branch = branch
         self.setup_logging()
+        self.plumbing = GitPlumbing(self.repo_path) if GIT_BACKEND == "plumbing" else None
+        self.push_worker = PushWorker(self.repo_path, self.branch, self.logger)
+        self.maintenance = RepoMaintenance(self.repo_path, self.logger)
+        self.last_sync_time = time.monotonic()
+        self.cycle = SyncCycle()
+        self.telemetry = None
+        self.importer = None
 
         try:
             if (self.repo_path / ".git").exists():
@@ -65,6 +717,11 @@ class GitAutoSync:
                 self.repo.create_remote("origin", remote_url)
                 self.logger.info("Remote 'origin' created")
 
+            if TELEMETRY:
+                self.telemetry = SyncTelemetry(self.repo.git_dir, self.repo_path.name, self.logger)
+                self.push_worker.telemetry = self.telemetry
+            self.importer = InitialImport(self.repo.git_dir, self.logger)
+
         except Exception as e:
             self.logger.error(f"Failed to initialize repository: {str(e)}")
             self.logger.error(traceback.format_exc())
@@ -75,7 +732,7 @@ class GitAutoSync:
         self.logger.setLevel(logging.INFO)
 
         log_path = self.repo_path.parent / "git_sync.log"
-        file_handler = logging.FileHandler(log_path)
+        file_handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=3, encoding="utf-8")
         console_handler = logging.StreamHandler()
 
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
@@ -104,77 +761,180 @@ class GitAutoSync:
             self.logger.error(traceback.format_exc())
             return False
 
+    def get_pending_changes(self):
+        """수정/삭제/추적 안 된 경로와 크기(바이트, 삭제된 파일은 0)"""
+        self.cycle.enter("status")
+        output = subprocess.run(
+            ["git", "ls-files", "--modified", "--deleted", "--others", "--exclude-standard", "-z"],
+            cwd=self.repo_path, capture_output=True, check=True
+        ).stdout.decode("utf-8", "surrogateescape")
+        changes = {}
+        for path in output.split("\0"):
+            if path and path not in changes:
+                try:
+                    changes[path] = os.lstat(self.repo_path / path).st_size
+                except OSError:
+                    changes[path] = 0
+        return changes
+
+    def commit_changes(self, message, paths=None):
+        """주어진 경로를 커밋 (None이면 모든 변경), 커밋할 내용이 없으면 False 반환"""
+        if self.plumbing:
+            try:
+                return self.plumbing.commit(message, paths, cycle=self.cycle) is not None
+            except Exception as e:
+                self.logger.warning(f"Plumbing commit failed, switching to GitPython: {str(e)}")
+                self.plumbing.close()
+                self.plumbing = None
+
+        self.cycle.enter("add")
+        if paths is None:
+            self.repo.git.add(".")
+        else:
+            # 경로가 수천 개여도 명령줄 길이 제한에 걸리지 않도록 표준 입력으로 전달
+            subprocess.run(["git", "add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"], cwd=self.repo_path,
+                           input="\0".join(paths).encode("utf-8", "surrogateescape"), capture_output=True, check=True)
+        if self.repo.is_dirty() or len(self.repo.untracked_files) > 0:
+            self.cycle.enter("commit")
+            self.repo.index.commit(message)
+            return True
+        return False
+
     def force_push(self):
         try:
             if not self.ensure_branch():
                 self.logger.error("Failed to ensure correct branch, skipping push")
                 return False
 
-            self.repo.git.add(".")
+            changes = self.get_pending_changes()
+            if self.importer.active or self.importer.is_large(changes):
+                return self.import_in_batches(changes)
 
+            # 변경이 있을 때만 커밋하고, 이전 실행에서 남은 대기 커밋은 그대로 푸시
             commit_message = f"Automated Commit Update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            self.repo.git.commit("-m", commit_message, "--allow-empty")
-            self.logger.info(f"Created commit: {commit_message}")
+            if self.commit_changes(commit_message, list(changes)):
+                self.logger.info(f"Created commit: {commit_message}")
 
-            try:
-                self.logger.info(f"Force pushing to origin/{self.branch}...")
-                origin = self.repo.remote("origin")
-                push_info = origin.push(self.branch, force=True)
-                for info in push_info:
-                    self.logger.info(f"Push result: {info.summary}")
+            if self.push_worker.refresh_backlog() == 0:
+                self.logger.info("No commits waiting to be pushed")
                 return True
-            except Exception as e:
-                self.logger.error(f"Push failed: {str(e)}")
-                self.logger.error(traceback.format_exc())
-                return False
+            self.logger.info(self.push_worker.describe_backlog())
+            return self.push_worker.push_pending()
 
         except Exception as e:
             self.logger.error(f"Error during force push: {str(e)}")
             self.logger.error(traceback.format_exc())
             return False
 
+    def commit_import_batch(self, paths, changes):
+        """가져오기 묶음 하나를 커밋 (실제로 바뀐 내용이 없으면 False 반환)"""
+        batch_bytes = sum(changes[path] for path in paths)
+        commit_message = (f"Automated Import {self.importer.state['batches'] + 1} ({len(paths)} files, "
+                          f"{batch_bytes / 1024 ** 2:.1f} MB) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if not self.commit_changes(commit_message, paths):
+            return False
+        self.importer.batch_committed(len(paths), batch_bytes)
+        self.logger.info(f"Created commit: {commit_message}")
+        return True
+
+    def import_in_batches(self, changes):
+        """시작 시 첫 가져오기: 한 묶음씩 커밋하고 푸시
+
+        푸시에 실패하면 남은 묶음은 커밋하지 않고 두며, 커밋한 묶음은 푸시 작업 스레드가 다시 시도하고
+        나머지는 스케줄된 동기화가 이어서 처리한다 (continue_import 참고).
+        """
+        self.importer.start(changes)
+        # 다시 시작하기 전에 커밋했지만 원격에 올라가지 못한 묶음을 먼저 푸시
+        if self.push_worker.refresh_backlog():
+            self.logger.info(self.push_worker.describe_backlog())
+            if not self.push_worker.push_pending():
+                return False
+        self.importer.batch_pushed()
+
+        for paths in self.importer.plan(changes):
+            if not self.commit_import_batch(paths, changes):
+                continue
+            self.push_worker.refresh_backlog()
+            if not self.push_worker.push_pending():
+                self.logger.warning("Import paused; the batch is retried in the background and the rest follows on later syncs")
+                return False
+            self.importer.batch_pushed()
+        self.importer.finish()
+        return True
+
+    def continue_import(self, changes):
+        """가져오기가 끝나지 않았을 때의 스케줄된 동기화: 이전 묶음이 푸시된 뒤에만 다음 묶음을 커밋
+
+        가져오기가 끝나서 남은 변경을 평소처럼 커밋하면 되면 False 반환
+        """
+        self.importer.start(changes)
+        if self.push_worker.refresh_backlog():
+            self.logger.info(f"Import waiting for the previous batch to be pushed ({self.push_worker.describe_backlog()})")
+            return True
+        self.importer.batch_pushed()
+        if not self.importer.is_large(changes):
+            self.importer.finish()
+            return False
+
+        if self.commit_import_batch(self.importer.plan(changes)[0], changes):
+            # 푸시 작업 스레드가 보냄, 다음 묶음은 다음 동기화에서 커밋
+            self.push_worker.refresh_backlog()
+            self.push_worker.notify()
+        return True
+
     def sync(self):
+        """스케줄된 동기화 (TELEMETRY가 켜져 있으면 단계별 시간과 결과를 기록)"""
+        self.cycle = SyncCycle()
+        success = False
+        try:
+            success = self.run_sync_cycle()
+        finally:
+            self.cycle.finish(success)
+            if self.telemetry:
+                self.telemetry.record(self.cycle)
+
+    def run_sync_cycle(self):
+        """동기화 한 주기: 로컬 변경사항을 커밋하고 푸시 작업 스레드에 넘김"""
+        self.last_sync_time = time.monotonic()
         try:
             print(f"스케줄된 동기화 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
             if not self.ensure_branch():
                 self.logger.error("Failed to ensure correct branch, skipping sync")
-                return
-
-            self.repo.git.add(".")
+                return False
 
-            if self.repo.is_dirty() or len(self.repo.untracked_files) > 0:
-                commit_message = f"Automated Commit Update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                self.repo.index.commit(commit_message)
+            changes = self.get_pending_changes()
+            commit_message = f"Automated Commit Update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            if (self.importer.active or self.importer.is_large(changes)) and self.continue_import(changes):
+                pass
+            elif changes and self.commit_changes(commit_message, list(changes)):
                 self.logger.info(f"Created scheduled commit: {commit_message}")
                 print(f"새 커밋 생성: {commit_message}")
-
-                try:
-                    self.logger.info(f"Pushing to origin/{self.branch}...")
-                    origin = self.repo.remote("origin")
-                    push_info = origin.push(self.branch, force=True)
-                    for info in push_info:
-                        self.logger.info(f"Push result: {info.summary}")
-                        print(f"푸시 결과: {info.summary}")
-                except Exception as e:
-                    self.logger.error(f"Push failed: {str(e)}")
-                    self.logger.error(traceback.format_exc())
-                    print(f"푸시 실패: {str(e)}")
+                # 푸시는 작업자가 담당하므로 sync는 네트워크를 기다리지 않음
+                self.push_worker.refresh_backlog()
+                self.push_worker.notify()
             else:
                 self.logger.info("No changes to sync")
                 print("동기화할 변경 사항이 없습니다.")
 
+            if self.push_worker.pending_count:
+                self.logger.info(self.push_worker.describe_backlog())
+                print(self.push_worker.describe_backlog())
+
             # 다음 실행 시간 표시
             next_run = schedule.next_run()
             if next_run:
                 print(f"다음 동기화 예정 시간: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
             else:
                 print("다음 동기화 일정이 없습니다.")
+            return True
 
         except Exception as e:
+            self.cycle.outcome = "error"
             self.logger.error(f"Error during sync: {str(e)}")
             self.logger.error(traceback.format_exc())
             print(f"동기화 중 오류 발생: {str(e)}")
+            return False
 
 
 class GitAutoSyncService(win32serviceutil.ServiceFramework):
@@ -217,6 +977,7 @@ class GitAutoSyncService(win32serviceutil.ServiceFramework):
                 servicemanager.LogMsg(servicemanager.EVENTLOG_INFORMATION_TYPE, 0, ("초기 푸시 완료", ""))
             else:
                 servicemanager.LogMsg(servicemanager.EVENTLOG_WARNING_TYPE, 0, ("초기 푸시 실패", ""))
+            git_sync.push_worker.start()
 
             schedule.every(10).minutes.do(git_sync.sync)
 
@@ -228,9 +989,11 @@ class GitAutoSyncService(win32serviceutil.ServiceFramework):
 
             while not self.stop_requested:
                 schedule.run_pending()
+                git_sync.maintenance.run_if_idle(git_sync.last_sync_time)
                 time.sleep(1)  # 1초마다 스케줄러 확인
                 if win32event.WaitForSingleObject(self.hWaitStop, 1000) == win32event.WAIT_OBJECT_0:
                     break
+            git_sync.push_worker.stop()
 
         except Exception as e:
             servicemanager.LogMsg(
@@ -263,6 +1026,13 @@ def run_foreground():
     branch = "깃허브 브랜치"
                 
 #######################################################################
+    # python git_commit.py --stats [시간, 기본 24]: 기록된 동기화 통계를 출력하고 종료
+    if "--stats" in sys.argv:
+        stats_args = sys.argv[sys.argv.index("--stats") + 1:]
+        hours = float(stats_args[0]) if stats_args and stats_args[0].replace(".", "", 1).isdigit() else 24
+        SyncTelemetry(os.path.join(repo_path, ".git"), Path(repo_path).name, logging.getLogger("GitAutoSync")).print_summary(hours)
+        return
+
     # bat 파일에서 실행한 경우 백그라운드로 재시작
     if from_bat and "--background" not in sys.argv:
         restart_as_background()
@@ -282,7 +1052,9 @@ def run_foreground():
         if git_sync.force_push():
             print("초기 푸시 완료!")
         else:
-            print("초기 푸시 실패. 로그를 확인하세요.")
+            print("초기 푸시 실패. 백그라운드에서 다시 시도합니다.")
+            print(git_sync.push_worker.describe_backlog())
+        git_sync.push_worker.start()
         
         # 스케줄러 설정
         print(f"\nGit 자동 동기화가 설정되었습니다. 10분마다 {branch} 브랜치를 동기화합니다.")
@@ -306,6 +1078,7 @@ def run_foreground():
             
             while True:
                 schedule.run_pending()
+                git_sync.maintenance.run_if_idle(git_sync.last_sync_time)
                 
                 # 1분마다 한 번씩 로그 출력
                 if count % 60 == 0 and count > 0:
@@ -315,7 +1088,10 @@ def run_foreground():
                     
                     minutes = time_left // 60
                     seconds = time_left % 60
-                    print(f"{now.strftime('%Y-%m-%d %H:%M:%S')} - 다음 동기화까지 {minutes}분 {seconds}초 남았습니다.")
+                    status = f"{now.strftime('%Y-%m-%d %H:%M:%S')} - 다음 동기화까지 {minutes}분 {seconds}초 남았습니다."
+                    if git_sync.push_worker.pending_count:
+                        status += f" ({git_sync.push_worker.describe_backlog()})"
+                    print(status)
                 
                 time.sleep(1)
                 count += 1
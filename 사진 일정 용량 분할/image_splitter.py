@@ -1,16 +1,212 @@
 #!/usr/bin/env python3
 # 디렉터리 정보: 이미지 파일들을 512MB 이하 크기의 폴더로 분할하고 압축하는 스크립트
+import gzip
+import io
+import json
 import os
+import queue
 import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # 여기에 경로를 입력하세요
 source_dir = r"이미지 경로"  # 원본 이미지가 있는 디렉토리 경로
 output_dir = r"저장할 경로"    # 분할된 이미지를 저장할 디렉토리 경로
+restore_dir = r"복원할 경로"   # 원본 이미지를 복원할 디렉토리 경로 (join 모드)
 max_size_mb = 512                # 폴더당 최대 크기(MB)
+archive_format = "zip"           # 압축 형식: zip, tar, tar.gz, tar.zst (tar.zst는 zstandard 필요)
+compare_backends = False         # 첫 번째 폴더로 모든 압축 형식의 처리 속도 비교
+verify_archives = True           # 압축 후 모든 압축 파일을 다시 읽어 분배 계획과 대조
+verify_workers = None            # 검증 프로세스 수 (None: CPU 개수)
+transform_format = None          # 압축 전 이미지 재인코딩 형식: None, "webp", "jpeg" (Pillow 필요)
+transform_quality = 85           # 재인코딩 품질 (1-100)
+transform_max_dimension = None   # 축소 후 긴 변의 최대 픽셀 수 (None: 원본 크기 유지)
+transform_workers = None         # 변환 프로세스 수 (None: CPU 개수)
+dedupe_policy = None             # 유사 중복 이미지 처리: None (사용 안 함), "keep", "drop", "list" (Pillow, NumPy 필요)
+dedupe_threshold = 4             # 유사 중복으로 판단할 64비트 해시 간 최대 차이 비트 수
+dedupe_workers = None            # 해시 계산 프로세스 수 (None: CPU 개수)
+join_workers = 4                 # join 모드에서 동시에 풀 압축 파일 수
+pipeline_memory_mb = 256         # 미리 읽기 및 병렬 압축 중인 파일에 사용할 메모리 한도 (MB)
+pipeline_readers = 4             # 파일을 미리 읽는 스레드 수
+pipeline_workers = None          # 압축 스레드 수 (None: CPU 개수)
+progress_interval = 0.5          # 진행 상황 줄을 다시 그리는 간격 (초)
+
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024     # 압축 파일 출력 버퍼 크기 (8MB)
+VERIFY_READ_SIZE = 1024 * 1024          # 압축 파일 검증 시 읽기 단위 (1MB)
+COPY_BUFFER_SIZE = 1024 * 1024          # 압축 해제 시 복사 버퍼 크기 (1MB)
+PIPELINE_QUEUE_SIZE = 4096              # 압축 파이프라인에서 대기할 수 있는 최대 파일 수
+MANIFEST_NAME = "manifest.json"
+SUMMARY_NAME = "split_summary.json"
+TAR_BLOCK_SIZE = 512
+TRANSFORM_FORMATS = {"webp": ("WEBP", ".webp"), "jpeg": ("JPEG", ".jpg")}
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+class ProgressReporter:
+    """단계 하나의 진행 상황. 파일마다 출력하지 않고 progress_interval마다 최대 한 번만 다시 그린다
+    
+    터미널에서는 같은 줄을 덮어쓰고, 로그로 리다이렉트된 경우에는 다시 그릴 때마다 새 줄로 출력한다.
+    update()는 여러 스레드에서 호출해도 된다. finish()는 마지막 줄을 출력하고 단계 통계를 반환한다.
+    """
+    def __init__(self, stage, total_files=0, total_bytes=0, display=True):
+        self.stage = stage
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.display = display
+        self.files = 0
+        self.bytes = 0
+        self.start_time = time.perf_counter()
+        self._last_draw = self.start_time
+        self._drawn_counts = None
+        self._width = 0
+        self._tty = sys.stdout.isatty()
+        self._lock = threading.Lock()
+
+    def update(self, files=1, nbytes=0):
+        with self._lock:
+            self.files += files
+            self.bytes += nbytes
+            now = time.perf_counter()
+            if self.display and now - self._last_draw >= progress_interval:
+                self._last_draw = now
+                self._draw(self._line(now - self.start_time))
+
+    def log(self, message):
+        """진행 상황 줄과 섞이지 않게 메시지 출력"""
+        with self._lock:
+            self._clear()
+            print(message)
+            self._last_draw = 0.0
+
+    def finish(self):
+        seconds = time.perf_counter() - self.start_time
+        with self._lock:
+            if self.display:
+                # 로그 파일에는 마지막으로 그린 뒤 변화가 없으면 같은 줄을 다시 쓰지 않음
+                if self._tty or self._drawn_counts != (self.files, self.bytes):
+                    self._draw(self._line(seconds))
+                if self._tty:
+                    sys.stdout.write("\n")
+                self._width = 0
+        elapsed = max(seconds, 1e-6)
+        return {
+            "stage": self.stage,
+            "files": self.files,
+            "bytes": self.bytes,
+            "seconds": round(seconds, 3),
+            "files_per_second": round(self.files / elapsed, 1),
+            "mb_per_second": round(self.bytes / (1024 * 1024) / elapsed, 1),
+        }
+
+    def _line(self, seconds):
+        elapsed = max(seconds, 1e-6)
+        rate = f"{self.files / elapsed:,.0f}개/s {self.bytes / (1024 * 1024) / elapsed:.1f}MB/s"
+        if not self.total_files:
+            return f"[{self.stage}] {self.files:,}개 {self.bytes / (1024 * 1024):.1f}MB | {rate}"
+        
+        # 파일 크기 편차가 파일당 처리 비용 편차보다 훨씬 크므로, 바이트 수를 알면 바이트 기준으로 추정
+        if self.total_bytes and self.bytes:
+            done = min(self.bytes / self.total_bytes, 1.0)
+        else:
+            done = min(self.files / self.total_files, 1.0)
+        eta = format_duration(seconds * (1 - done) / done) if done else "--:--:--"
+        return (f"[{self.stage}] {self.files:,}/{self.total_files:,}개 ({done * 100:.1f}%) "
+                f"{self.bytes / (1024 * 1024):.1f}MB | {rate} | 남은 시간 {eta}")
+
+    def _draw(self, line):
+        self._drawn_counts = (self.files, self.bytes)
+        if self._tty:
+            sys.stdout.write("\r" + line.ljust(self._width))
+            sys.stdout.flush()
+            self._width = len(line)
+        else:
+            print(line)
+
+    def _clear(self):
+        if self._tty and self._width:
+            sys.stdout.write("\r" + " " * self._width + "\r")
+            self._width = 0
+
+def get_peak_rss():
+    """이 프로세스와, 종료된 작업 프로세스 중 가장 큰 것의 최대 상주 메모리 (바이트, 알 수 없으면 None)"""
+    try:
+        import resource
+    except ImportError:
+        return get_windows_peak_rss(), None
+    # ru_maxrss는 Linux에서는 킬로바이트, macOS에서는 바이트 단위
+    scale = 1 if sys.platform == "darwin" else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+def get_windows_peak_rss():
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except ImportError:
+        pass
+    
+    import ctypes
+    from ctypes import wintypes
+    
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+    
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+    return None
+
+def write_summary(summary_path, summary):
+    """다른 도구로 실행 결과를 비교할 수 있도록 실행 통계를 JSON으로 저장"""
+    peak_rss, peak_worker_rss = get_peak_rss()
+    summary["peak_rss_bytes"] = peak_rss
+    summary["peak_worker_rss_bytes"] = peak_worker_rss
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(f"실행 요약 저장됨: {summary_path}")
 
-def get_all_image_files(source_dir):
+def get_all_image_files(source_dir, progress=None):
     image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
     image_files = []
     
@@ -20,9 +216,208 @@ def get_all_image_files(source_dir):
                 file_path = os.path.join(root, file)
                 file_size = os.path.getsize(file_path)
                 image_files.append((file_path, file_size))
+                if progress:
+                    progress.update(1, file_size)
+    
+    return image_files
+
+def compute_image_hash(file_path):
+    """64비트 차이 해시(dHash): 9x8 흑백 축소 이미지의 밝기 변화"""
+    try:
+        with Image.open(file_path) as img:
+            # JPEG는 축소된 크기로 디코딩하여 전체 디코딩보다 훨씬 빠르게 처리
+            img.draft("L", (64, 64))
+            pixels = list(img.convert("L").resize((9, 8), Image.BILINEAR).getdata())
+    except Exception:
+        return None
+    
+    image_hash = 0
+    for row in range(8):
+        for col in range(8):
+            image_hash = (image_hash << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return image_hash
+
+def popcount64(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    byte_counts = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return byte_counts[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+def find_near_duplicates(hashes, threshold, priority=None):
+    """해밍 거리 기준 이내의 해시를 남길 해시 주위로 묶어 각 해시가 속한 그룹의 남길 해시 위치를 반환
+    
+    priority 순서(예: 큰 파일 먼저)로 아직 묶이지 않은 해시를 남길 해시로 정하고, 그 기준 이내이면서 아직 묶이지 않은
+    해시만 그룹에 넣습니다. A~B, B~C처럼 이어진 쌍으로 묶지 않으므로 그룹의 모든 해시는 남길 해시와 기준 이내입니다.
+    
+    멀티 인덱스 해싱: 64비트를 (기준 + 1)개 조각으로 나누면 기준 이내의 두 해시는 적어도 한 조각이
+    정확히 일치합니다. 같은 조각 값을 가진 해시끼리만 비교하며, 모든 비교는 Python 반복문 대신
+    정렬된 조각 값 위에서 벡터 연산으로 처리합니다.
+    """
+    count = len(hashes)
+    chunk_count = min(threshold + 1, 64)
+    chunk_bits = [64 // chunk_count + (1 if i < 64 % chunk_count else 0) for i in range(chunk_count)]
+    left_parts = []
+    right_parts = []
+    
+    shift = 0
+    for bits in chunk_bits:
+        mask = np.uint64((1 << bits) - 1)
+        keys = (hashes >> np.uint64(shift)) & mask
+        shift += bits
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        
+        # 같은 조각 값이 이어지는 동안 각 해시를 d칸 뒤의 해시와 비교
+        offset = 1
+        active = np.flatnonzero(sorted_keys[:-1] == sorted_keys[1:])
+        while active.size:
+            left = order[active]
+            right = order[active + offset]
+            close = popcount64(hashes[left] ^ hashes[right]) <= threshold
+            left_parts.append(left[close])
+            right_parts.append(right[close])
+            
+            offset += 1
+            active = active[active + offset < count]
+            active = active[sorted_keys[active] == sorted_keys[active + offset]]
+    
+    labels = np.arange(count)
+    if not left_parts:
+        return labels
+    left = np.concatenate(left_parts)
+    right = np.concatenate(right_parts)
+    
+    # 양방향 인접 목록 (해시별 이웃이 연속되도록 정렬), 이웃이 있는 해시만 순서대로 처리
+    source = np.concatenate([left, right])
+    target = np.concatenate([right, left])
+    edge_order = np.argsort(source, kind="stable")
+    source, target = source[edge_order], target[edge_order]
+    starts = np.searchsorted(source, np.arange(count + 1))
+    priority = np.arange(count) if priority is None else np.asarray(priority)
+    priority = priority[starts[priority + 1] > starts[priority]]
+    assigned = np.zeros(count, dtype=bool)
+    for index in priority.tolist():
+        if assigned[index]:
+            continue
+        assigned[index] = True
+        neighbors = target[starts[index]:starts[index + 1]]
+        neighbors = neighbors[~assigned[neighbors]]
+        labels[neighbors] = index
+        assigned[neighbors] = True
+    return labels
+
+def dedupe_images(image_files, policy, list_path, progress=None):
+    if Image is None or np is None:
+        print("Pillow 또는 NumPy가 설치되어 있지 않아 유사 중복 검사를 건너뜁니다. (pip install pillow numpy)")
+        return image_files
+    
+    start_time = time.perf_counter()
+    hash_values = []
+    with ProcessPoolExecutor(max_workers=dedupe_workers) as pool:
+        for (_, file_size), value in zip(image_files, pool.map(compute_image_hash, [path for path, _ in image_files], chunksize=256)):
+            hash_values.append(value)
+            if progress:
+                progress.update(1, file_size)
+    hashed = [i for i, value in enumerate(hash_values) if value is not None]
+    hash_seconds = time.perf_counter() - start_time
+    
+    hashes = np.array([hash_values[i] for i in hashed], dtype=np.uint64)
+    # 큰 파일(보통 가장 높은 품질)부터 남길 파일로 정하고, 그 파일과 기준 이내인 파일만 중복으로 표시
+    sizes = np.array([image_files[i][1] for i in hashed], dtype=np.int64)
+    labels = find_near_duplicates(hashes, dedupe_threshold, np.argsort(-sizes, kind="stable"))
+    
+    groups = {}
+    for position, label in enumerate(labels.tolist()):
+        groups.setdefault(label, []).append(hashed[position])
+    duplicate_groups = []
+    for label, members in groups.items():
+        if len(members) > 1:
+            # 남길 파일을 맨 앞에
+            members.sort(key=lambda i: (i != hashed[label], -image_files[i][1]))
+            duplicate_groups.append(members)
+    duplicates = {i for members in duplicate_groups for i in members[1:]}
     
+    duplicate_mb = sum(image_files[i][1] for i in duplicates) / (1024 * 1024)
+    print(f"유사 중복: {len(duplicate_groups)}개 그룹, 파일 {len(duplicates)}개 ({duplicate_mb:.2f}MB), "
+          f"해시 {hash_seconds:.2f}초, 비교 {time.perf_counter() - start_time - hash_seconds:.2f}초")
+    
+    if policy in ("list", "drop") and duplicate_groups:
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for members in duplicate_groups:
+                f.write(f"{image_files[members[0]][0]}\n")
+                for i in members[1:]:
+                    f.write(f"    {image_files[i][0]}\n")
+        print(f"유사 중복 목록 저장: {list_path}")
+    
+    if policy == "drop":
+        return [image_file for i, image_file in enumerate(image_files) if i not in duplicates]
     return image_files
 
+def transform_image(task):
+    """이미지 하나를 축소 및/또는 재인코딩하고 압축에 사용할 경로와 크기를 반환"""
+    source_path, dest_path, image_format, quality, max_dimension = task
+    try:
+        with Image.open(source_path) as img:
+            needs_resize = max_dimension and max(img.size) > max_dimension
+            # 애니메이션 이미지는 프레임이 사라지므로 제외하고, 이미 조건을 만족하는 이미지는 그대로 사용
+            if getattr(img, "is_animated", False) or (not image_format and not needs_resize):
+                return source_path, os.path.getsize(source_path), None
+            
+            save_format = TRANSFORM_FORMATS[image_format][0] if image_format else img.format
+            if needs_resize:
+                img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+            if save_format == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            img.save(dest_path, format=save_format, quality=quality)
+        file_size = os.path.getsize(dest_path)
+        source_size = os.path.getsize(source_path)
+        # 축소 없이 다시 인코딩만 했는데 작아지지 않았으면(고품질 JPEG -> WebP, 이미 작은 PNG 등) 원본 사용
+        if not needs_resize and file_size >= source_size:
+            os.remove(dest_path)
+            return source_path, source_size, None
+        return dest_path, file_size, None
+    except Exception as e:
+        return source_path, os.path.getsize(source_path), str(e)
+
+def transform_images(image_files, source_dir, transform_dir, progress=None):
+    if Image is None:
+        print("Pillow가 설치되어 있지 않아 변환 단계를 건너뜁니다. (pip install pillow)")
+        return image_files
+    
+    tasks = []
+    for file_path, _ in image_files:
+        relative_path = os.path.relpath(file_path, source_dir)
+        if transform_format:
+            # 원래 확장자를 남겨서 a.png와 a.jpg가 같은 a.webp로 덮어써지지 않게 함 (a.png.webp, a.jpg.webp)
+            relative_path += TRANSFORM_FORMATS[transform_format][1]
+        dest_path = os.path.join(transform_dir, relative_path)
+        tasks.append((file_path, dest_path, transform_format, transform_quality, transform_max_dimension))
+    
+    transformed_files = []
+    failed = 0
+    kept = 0
+    with ProcessPoolExecutor(max_workers=transform_workers) as pool:
+        for (source_path, original_size), (file_path, file_size, error) in zip(image_files, pool.map(transform_image, tasks, chunksize=64)):
+            if error:
+                failed += 1
+                message = f"변환 실패, 원본을 사용합니다: {file_path} ({error})"
+                if progress:
+                    progress.log(message)
+                else:
+                    print(message)
+            elif file_path == source_path:
+                kept += 1
+            transformed_files.append((file_path, file_size))
+            if progress:
+                progress.update(1, original_size)
+    
+    before_mb = sum(size for _, size in image_files) / (1024 * 1024)
+    after_mb = sum(size for _, size in transformed_files) / (1024 * 1024)
+    print(f"변환 완료: {before_mb:.2f}MB -> {after_mb:.2f}MB (원본 유지 {kept}개, 실패 {failed}개)")
+    return transformed_files
+
 def create_output_folders(output_dir, num_folders):
     folders = []
     for i in range(1, num_folders + 1):
@@ -31,7 +426,7 @@ def create_output_folders(output_dir, num_folders):
         folders.append(folder_name)
     return folders
 
-def distribute_images(image_files, output_folders, max_size_bytes):
+def distribute_images(image_files, output_folders, max_size_bytes, member_overhead=None, progress=None):
     current_folder_index = 0
     current_size = 0
     distribution = {folder: [] for folder in output_folders}
@@ -39,6 +434,10 @@ def distribute_images(image_files, output_folders, max_size_bytes):
     image_files.sort(key=lambda x: x[1], reverse=True)
     
     for file_path, file_size in image_files:
+        if progress:
+            progress.update(1, file_size)
+        if member_overhead:
+            file_size += member_overhead(os.path.basename(file_path), file_size)
         if current_size + file_size > max_size_bytes and current_folder_index + 1 < len(output_folders):
             current_folder_index += 1
             current_size = 0
@@ -48,64 +447,685 @@ def distribute_images(image_files, output_folders, max_size_bytes):
     
     return distribution
 
-def copy_images(distribution):
-    total_files = sum(len(files) for files in distribution.values())
-    copied_files = 0
-    
+def unique_member_names(files):
+    """폴더 안에서 사용할 파일 이름 - 다른 디렉터리의 같은 이름 파일에는 _1, _2 접미사를 붙임"""
+    names = []
+    used = set()
+    for file_path in files:
+        name = os.path.basename(file_path)
+        stem, extension = os.path.splitext(name)
+        counter = 1
+        # Windows에서도 이름이 겹치지 않도록 대소문자를 구분하지 않고 비교
+        while name.lower() in used:
+            name = f"{stem}_{counter}{extension}"
+            counter += 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+def copy_images(distribution, progress=None):
     for folder, files in distribution.items():
-        for file_path in files:
-            dest_path = os.path.join(folder, os.path.basename(file_path))
+        for file_path, name in zip(files, unique_member_names(files)):
+            dest_path = os.path.join(folder, name)
             shutil.copy2(file_path, dest_path)
-            copied_files += 1
-            print(f"진행률: {copied_files}/{total_files} ({(copied_files/total_files)*100:.1f}%) - {file_path} -> {dest_path}")
+            if progress:
+                progress.update(1, os.path.getsize(dest_path))
 
-def zip_folders(output_folders):
-    print("폴더 압축 중...")
-    for folder in output_folders:
-        zip_path = f"{folder}.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, _, files in os.walk(folder):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, os.path.dirname(folder))
+class _SequentialWriter:
+    """seek 없는 쓰기 전용 파일 래퍼 - 압축 파일을 한 번의 순차 쓰기로 생성"""
+    def __init__(self, path):
+        self._file = open(path, 'wb', buffering=WRITE_BUFFER_SIZE)
+
+    def write(self, data):
+        return self._file.write(data)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_folder_members(folder):
+    for root, _, files in os.walk(folder):
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            arcname = os.path.relpath(file_path, os.path.dirname(folder))
+            yield file_path, arcname
+
+class _MemoryBudget:
+    """파이프라인 단계들이 공유하는 메모리 한도 - 충분한 메모리가 반환될 때까지 acquire가 대기"""
+    def __init__(self, limit):
+        self.limit = limit
+        self._used = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self, amount):
+        with self._condition:
+            while not self._closed and self._used and self._used + amount > self.limit:
+                self._condition.wait()
+            self._used += amount
+            return not self._closed
+
+    def release(self, amount):
+        with self._condition:
+            self._used -= amount
+            self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+def iter_prefetched_members(folder, prepare=None):
+    """뒤따르는 파일을 미리 읽으면서 압축 파일 순서대로 (file_path, arcname, payload)를 반환
+    
+    읽기 스레드가 다음 파일들을 불러오고, prepare()가 주어지면 별도 스레드 풀에서 데이터를
+    payload로 변환합니다 (예: 압축). 처리 중인 데이터 전체는 pipeline_memory_mb로 제한되며,
+    한도에 들어가지 않는 파일은 payload None으로 반환되어 호출한 쪽에서 스트리밍으로 처리합니다.
+    """
+    budget = _MemoryBudget(pipeline_memory_mb * 1024 * 1024)
+    pending = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    read_pool = ThreadPoolExecutor(max_workers=pipeline_readers)
+    work_pool = ThreadPoolExecutor(max_workers=pipeline_workers or os.cpu_count() or 1) if prepare else None
+    
+    def load(file_path, size):
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if prepare is None:
+            return data
+        
+        def run():
+            try:
+                return prepare(data)
+            finally:
+                # 압축이 끝나면 원본 데이터는 해제됨
+                budget.release(size)
+        return work_pool.submit(run)
+    
+    def schedule():
+        for file_path, arcname in iter_folder_members(folder):
+            size = os.path.getsize(file_path)
+            # prepare() 실행 중에는 원본 데이터와 압축본이 함께 존재함
+            reserved = size * 2 if prepare else size
+            if reserved > budget.limit:
+                pending.put((file_path, arcname, None, 0))
+                continue
+            if not budget.acquire(reserved):
+                return
+            pending.put((file_path, arcname, read_pool.submit(load, file_path, size), size))
+        pending.put(None)
+    
+    scheduler = threading.Thread(target=schedule, daemon=True)
+    scheduler.start()
+    try:
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            file_path, arcname, future, size = item
+            if future is None:
+                yield file_path, arcname, None
+                continue
+            payload = future.result()
+            if prepare:
+                payload = payload.result()
+            try:
+                yield file_path, arcname, payload
+            finally:
+                budget.release(size)
+    finally:
+        # 쓰기 쪽이 일찍 중단된 경우 스케줄러의 대기를 풀어줌
+        budget.close()
+        while scheduler.is_alive():
+            try:
+                pending.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        read_pool.shutdown(cancel_futures=True)
+        if work_pool:
+            work_pool.shutdown(cancel_futures=True)
+
+def deflate_member(data):
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return zlib.crc32(data), compressor.compress(data) + compressor.flush(), len(data)
+
+# write_precompressed_member가 쓰는 ZipFile 내부 멤버 (CPython 3.9-3.13에서 확인)
+PRECOMPRESSED_ZIP_MEMBERS = ("_writecheck", "_didModify", "fp", "start_dir", "filelist", "NameToInfo")
+
+def supports_precompressed_members(zipf):
+    """이 Python의 zipfile에 미리 압축한 데이터를 직접 쓸 수 있는지 (없으면 ZipFile.writestr로 압축)"""
+    return hasattr(zipfile.ZipInfo, "FileHeader") and all(hasattr(zipf, name) for name in PRECOMPRESSED_ZIP_MEMBERS)
+
+def write_precompressed_member(zipf, zinfo, crc, compressed, file_size):
+    """이미 deflate로 압축된 데이터를 열린 ZipFile에 추가 (zipfile에는 이를 위한 공개 API가 없음)"""
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.compress_size = len(compressed)
+    zinfo.file_size = file_size
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+def write_zip_archive(folder, archive_path, progress=None):
+    # 파일은 미리 읽혀 병렬로 압축되고, 이 스레드는 순서대로 이어 쓰기만 함
+    # seek이 불가능한 파일이면 ZipFile이 data descriptor를 사용하므로 헤더를 다시 쓰지 않음
+    with _SequentialWriter(archive_path) as out:
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # 내부 멤버가 바뀐 Python에서는 미리 읽기만 병렬로 하고 압축은 writestr에 맡김
+            precompress = supports_precompressed_members(zipf)
+            for file_path, arcname, payload in iter_prefetched_members(folder, deflate_member if precompress else None):
+                if payload is None:
                     zipf.write(file_path, arcname)
-        print(f"압축 완료: {zip_path}")
+                    file_size = os.path.getsize(file_path)
+                elif precompress:
+                    write_precompressed_member(zipf, zipfile.ZipInfo.from_file(file_path, arcname), *payload)
+                    file_size = payload[2]
+                else:
+                    zipf.writestr(zipfile.ZipInfo.from_file(file_path, arcname), payload, compress_type=zipfile.ZIP_DEFLATED)
+                    file_size = len(payload)
+                if progress:
+                    progress.update(1, file_size)
+
+def add_tar_members(tarf, folder, progress=None):
+    for file_path, arcname, data in iter_prefetched_members(folder):
+        if data is None:
+            tarf.add(file_path, arcname)
+            file_size = os.path.getsize(file_path)
+        else:
+            tarinfo = tarf.gettarinfo(file_path, arcname)
+            tarinfo.size = file_size = len(data)
+            tarf.addfile(tarinfo, io.BytesIO(data))
+        if progress:
+            progress.update(1, file_size)
+
+def write_tar_archive(folder, archive_path, compression="", progress=None):
+    # GNU 형식: 기본 PAX 형식은 소수점 있는 수정 시각이나 ASCII가 아닌 이름마다 1KB짜리 PAX 헤더를 붙여 용량 계획을 넘김
+    with _SequentialWriter(archive_path) as out:
+        if compression == "zst":
+            cctx = zstandard.ZstdCompressor(level=3, threads=-1, write_checksum=True)
+            with cctx.stream_writer(out, closefd=False) as zst_out:
+                with tarfile.open(fileobj=zst_out, mode="w|", bufsize=WRITE_BUFFER_SIZE, format=tarfile.GNU_FORMAT) as tarf:
+                    add_tar_members(tarf, folder, progress)
+        else:
+            with tarfile.open(fileobj=out, mode=f"w|{compression}", bufsize=WRITE_BUFFER_SIZE, format=tarfile.GNU_FORMAT) as tarf:
+                add_tar_members(tarf, folder, progress)
+
+def deflate_overhead(size):
+    # 이미 압축된 이미지는 stored 블록으로 저장됨: 최대 16KB 블록마다 5바이트
+    return 5 * (size // 16384 + 1)
+
+def zip_member_overhead(name, size):
+    # 로컬 파일 헤더 + data descriptor + 중앙 디렉터리 항목 (각각 파일 이름 포함)
+    arcname_length = len(f"images_000/{name}".encode('utf-8'))
+    return 30 + arcname_length + 16 + 46 + arcname_length + deflate_overhead(size)
+
+def tar_member_overhead(name, size):
+    # 512바이트 헤더, 100바이트를 넘는 이름의 GNU 긴 이름 헤더, 블록 경계까지의 데이터 패딩
+    arcname_length = len(f"images_000/{name}".encode('utf-8'))
+    overhead = 2 * TAR_BLOCK_SIZE
+    if arcname_length > 100:
+        overhead += 2 * TAR_BLOCK_SIZE + arcname_length
+    return overhead
+
+def compressed_tar_member_overhead(name, size):
+    return tar_member_overhead(name, size) + deflate_overhead(size)
+
+ARCHIVE_BACKENDS = {
+    "zip": {
+        "extension": ".zip",
+        "writer": write_zip_archive,
+        "member_overhead": zip_member_overhead,
+        "archive_overhead": 22,
+    },
+    "tar": {
+        "extension": ".tar",
+        "writer": write_tar_archive,
+        "member_overhead": tar_member_overhead,
+        "archive_overhead": tarfile.RECORDSIZE,
+    },
+    "tar.gz": {
+        "extension": ".tar.gz",
+        "writer": lambda folder, archive_path, progress=None: write_tar_archive(folder, archive_path, "gz", progress),
+        "member_overhead": compressed_tar_member_overhead,
+        "archive_overhead": tarfile.RECORDSIZE,
+    },
+    "tar.zst": {
+        "extension": ".tar.zst",
+        "writer": lambda folder, archive_path, progress=None: write_tar_archive(folder, archive_path, "zst", progress),
+        "member_overhead": compressed_tar_member_overhead,
+        "archive_overhead": tarfile.RECORDSIZE,
+    },
+}
+
+def available_archive_formats():
+    return [name for name in ARCHIVE_BACKENDS if name != "tar.zst" or zstandard is not None]
+
+def get_archive_backend(archive_format):
+    if archive_format not in ARCHIVE_BACKENDS:
+        raise ValueError(f"알 수 없는 압축 형식: {archive_format} (사용 가능: {', '.join(ARCHIVE_BACKENDS)})")
+    if archive_format not in available_archive_formats():
+        raise ValueError(f"{archive_format} 형식은 zstandard 모듈이 필요합니다: pip install zstandard")
+    return ARCHIVE_BACKENDS[archive_format]
+
+def get_folder_size(folder):
+    return sum(os.path.getsize(file_path) for file_path, _ in iter_folder_members(folder))
+
+def build_expected_members(distribution, file_sizes):
+    expected_members = {}
+    for folder, files in distribution.items():
+        folder_name = os.path.basename(folder)
+        expected_members[folder] = {
+            f"{folder_name}/{name}": file_sizes[path] for path, name in zip(files, unique_member_names(files))
+        }
+    return expected_members
+
+def write_manifest(manifest_path, distribution, file_sizes, archive_format, source_roots):
+    """join 모드에서 사용할 압축 파일 내 각 파일의 원래 상대 경로와 크기를 기록"""
+    extension = ARCHIVE_BACKENDS[archive_format]["extension"]
+    archives = []
+    for folder, files in distribution.items():
+        folder_name = os.path.basename(folder)
+        members = []
+        for path, name in zip(files, unique_member_names(files)):
+            absolute_path = os.path.abspath(path)
+            root = next(root for root in source_roots if os.path.commonpath([root, absolute_path]) == root)
+            members.append({
+                "name": f"{folder_name}/{name}",
+                "path": os.path.relpath(absolute_path, root).replace(os.sep, "/"),
+                "size": file_sizes[path],
+            })
+        archives.append({"archive": folder_name + extension, "members": members})
+    
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({"archive_format": archive_format, "files": sum(len(files) for files in distribution.values()),
+                   "archives": archives}, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"매니페스트 저장: {manifest_path}")
+
+def read_member_size(member):
+    size = 0
+    while True:
+        chunk = member.read(VERIFY_READ_SIZE)
+        if not chunk:
+            return size
+        size += len(chunk)
+
+def read_zip_members(archive_path):
+    members = {}
+    errors = []
+    with zipfile.ZipFile(archive_path) as zipf:
+        for info in zipf.infolist():
+            # 파일을 끝까지 읽으면 zipfile이 CRC-32를 비교함
+            try:
+                with zipf.open(info) as member:
+                    members[info.filename] = read_member_size(member)
+            except Exception as e:
+                members[info.filename] = None
+                errors.append((info.filename, str(e)))
+    return members, errors
+
+def read_tar_members(archive_path, archive_format):
+    members = {}
+    errors = []
+    current_name = "(압축 파일 헤더)"
+    with open(archive_path, 'rb') as f:
+        if archive_format == "tar.zst":
+            stream = zstandard.ZstdDecompressor().stream_reader(f)
+        elif archive_format == "tar.gz":
+            stream = gzip.GzipFile(fileobj=f)
+        else:
+            # 일반 tar는 데이터 체크섬이 없으므로 헤더, 크기, 잘림 여부만 확인 가능
+            stream = f
+        try:
+            with tarfile.open(fileobj=stream, mode="r|") as tarf:
+                for info in tarf:
+                    current_name = info.name
+                    if info.isfile():
+                        members[info.name] = read_member_size(tarf.extractfile(info))
+            # 압축 스트림 끝까지 읽어 마지막 체크섬도 비교
+            current_name = "(압축 파일 끝)"
+            read_member_size(stream)
+        except Exception as e:
+            # 손상된 스트림은 이어서 읽을 수 없으므로 손상 시점에 읽던 파일을 보고
+            errors.append((current_name, str(e)))
+    return members, errors
+
+def verify_archive(archive_path, archive_format, expected):
+    """압축 파일을 다시 읽고(CRC 확인) 포함된 파일을 분배 계획과 비교"""
+    try:
+        if archive_format == "zip":
+            members, errors = read_zip_members(archive_path)
+        else:
+            members, errors = read_tar_members(archive_path, archive_format)
+    except Exception as e:
+        return {"archive": archive_path, "members": 0, "errors": [("(압축 파일)",
+ f"압축 파일을 열 수 없음: {e}")]}
+    
+    unreadable = {name for name, _ in errors}
+    for name, size in expected.items():
+        if name in unreadable:
+            continue
+        if name not in members:
+            errors.append((name, "압축 파일에 없음"))
+        elif members[name] != size:
+            errors.append((name, f"크기 불일치: {members[name]}바이트 (계획 {size}바이트)"))
+    for name in members:
+        if name not in expected:
+            errors.append((name, "분배 계획에 없음"))
+    if len(members) != len(expected):
+        errors.append(("(압축 파일)",
+ f"파일 개수 불일치: {len(members)}개 (계획 {len(expected)}개)"))
+    
+    return {"archive": archive_path, "members": len(members), "errors": errors}
+
+def report_verification(results):
+    failed = [result for result in results if result["errors"]]
+    total_members = sum(result["members"] for result in results)
+    if not failed:
+        print(f"검증 통과: 압축 파일 {len(results)}개, 파일 {total_members}개")
+        return True
+    
+    print(f"검증 실패: 압축 파일 {len(failed)}/{len(results)}개")
+    for result in failed:
+        print(f"  {result['archive']}")
+        for name, message in result["errors"]:
+            print(f"    - {name}: {message}")
+    return False
+
+def archive_folders(output_folders, archive_format="zip", expected_members=None, progress=None, verify_progress=None,
+                    max_archive_bytes=None):
+    backend = get_archive_backend(archive_format)
+    print(f"폴더 압축 중... ({archive_format})")
+    log = progress.log if progress else print
+    total_input_bytes = 0
+    total_output_bytes = 0
+    total_seconds = 0.0
+    
+    # 다음 압축 파일을 만드는 동안 별도 프로세스에서 각 압축 파일을 검증
+    verify_pool = ProcessPoolExecutor(max_workers=verify_workers) if expected_members is not None else None
+    verify_futures = []
+    oversized = {}
+    
+    for folder in output_folders:
+        archive_path = f"{folder}{backend['extension']}"
+        input_bytes = get_folder_size(folder)
+        start_time = time.perf_counter()
+        backend["writer"](folder, archive_path, progress=progress)
+        seconds = time.perf_counter() - start_time
+        output_bytes = os.path.getsize(archive_path)
+        
+        total_input_bytes += input_bytes
+        total_output_bytes += output_bytes
+        total_seconds += seconds
+        log(f"압축 완료: {archive_path} ({input_bytes / (1024 * 1024) / max(seconds, 1e-6):.1f}MB/s)")
+        if max_archive_bytes and output_bytes > max_archive_bytes:
+            oversized[archive_path] = output_bytes
+            log(f"⚠️ 용량 초과: {archive_path} ({output_bytes:,}바이트, 한도 {max_archive_bytes:,}바이트)")
+        
+        if verify_pool:
+            future = verify_pool.submit(verify_archive, archive_path, archive_format, expected_members[folder])
+            if verify_progress:
+                # 압축 단계가 진행 상황 줄을 그리는 동안에는 출력 없이 집계만 함
+                future.add_done_callback(lambda f, nbytes=input_bytes: verify_progress.update(f.result()["members"], nbytes))
+            verify_futures.append(future)
+    
+    stages = [progress.finish()] if progress else []
+    throughput = total_input_bytes / (1024 * 1024) / max(total_seconds, 1e-6)
+    print(f"{archive_format} 처리 속도: {total_input_bytes / (1024 * 1024):.2f}MB / {total_seconds:.2f}초 ({throughput:.1f}MB/s)")
+    stats = {
+        "format": archive_format,
+        "archives": len(output_folders),
+        "input_bytes": total_input_bytes,
+        "output_bytes": total_output_bytes,
+        "seconds": total_seconds,
+        "stages": stages,
+    }
+    
+    if verify_pool:
+        start_time = time.perf_counter()
+        if verify_progress:
+            verify_progress.display = True
+        stats["verification"] = [future.result() for future in verify_futures]
+        verify_pool.shutdown()
+        if verify_progress:
+            stages.append(verify_progress.finish())
+        print(f"마지막 압축 이후 검증 대기 시간: {time.perf_counter() - start_time:.2f}초")
+        # 파일 하나가 한도보다 큰 경우가 아니면 용량 초과는 분배 계획이 틀렸다는 뜻이므로 검증 실패로 처리
+        for folder, result in zip(output_folders, stats["verification"]):
+            if result["archive"] in oversized and len(expected_members[folder]) > 1:
+                result["errors"].append(("(용량)", f"압축 파일 용량 {oversized[result['archive']]:,}바이트가 한도 {max_archive_bytes:,}바이트를 넘음"))
+    stats["oversized"] = len(oversized)
+    
+    return stats
+
+def zip_folders(output_folders):
+    return archive_folders(output_folders, "zip")
+
+def compare_archive_backends(folder):
+    """폴더 하나를 사용 가능한 모든 형식으로 임시 디렉터리에 압축하여 처리 속도 비교"""
+    print(f"압축 형식별 처리 속도 비교: {folder}")
+    input_mb = get_folder_size(folder) / (1024 * 1024)
+    results = []
+    
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(folder)) as temp_dir:
+        for name in available_archive_formats():
+            backend = ARCHIVE_BACKENDS[name]
+            archive_path = os.path.join(temp_dir, os.path.basename(folder) + backend["extension"])
+            start_time = time.perf_counter()
+            backend["writer"](folder, archive_path)
+            seconds = max(time.perf_counter() - start_time, 1e-6)
+            output_mb = os.path.getsize(archive_path) / (1024 * 1024)
+            results.append((name, input_mb / seconds, output_mb))
+            os.remove(archive_path)
+    
+    results.sort(key=lambda x: x[1], reverse=True)
+    for name, throughput, output_mb in results:
+        print(f"  {name:8s} {throughput:8.1f}MB/s  {output_mb:.2f}MB")
+    return results
+
+def iter_archive_members(archive_path, archive_format):
+    """압축 파일에 저장된 순서대로 (파일 이름, 읽기용 파일 객체)를 반환"""
+    if archive_format == "zip":
+        with zipfile.ZipFile(archive_path) as zipf:
+            for info in zipf.infolist():
+                if not info.is_dir():
+                    with zipf.open(info) as member:
+                        yield info.filename, member
+        return
+    
+    with open(archive_path, 'rb') as f:
+        if archive_format == "tar.zst":
+            stream = zstandard.ZstdDecompressor().stream_reader(f)
+        elif archive_format == "tar.gz":
+            stream = gzip.GzipFile(fileobj=f)
+        else:
+            stream = f
+        with tarfile.open(fileobj=stream, mode="r|") as tarf:
+            for info in tarf:
+                if info.isfile():
+                    yield info.name, tarf.extractfile(info)
+
+def extract_archive(archive_path, archive_format, members, restore_root):
+    """압축 파일 하나를 저장된 순서대로 원래 상대 경로에 풀고 각 파일 크기를 확인"""
+    expected = {member["name"]: member for member in members}
+    restored = set()
+    restored_paths = set()
+    errors = []
+    restored_bytes = 0
+    
+    for name, source in iter_archive_members(archive_path, archive_format):
+        member = expected.get(name)
+        if member is None:
+            errors.append((name, "매니페스트에 없음"))
+            continue
+        target_path = os.path.normpath(os.path.join(restore_root, member["path"]))
+        if os.path.commonpath([restore_root, target_path]) != restore_root:
+            errors.append((name, f"복원 디렉터리 밖의 경로: {member['path']}"))
+            continue
+        
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        with open(target_path, 'wb') as target:
+            shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+            written = target.tell()
+        restored.add(name)
+        restored_paths.add(target_path)
+        restored_bytes += written
+        if written != member["size"]:
+            errors.append((name, f"크기 불일치: {written}바이트 (매니페스트 {member['size']}바이트)"))
+    
+    failed = {error_name for error_name, _ in errors}
+    for name in expected:
+        if name not in restored and name not in failed:
+            errors.append((name, "압축 파일에 없음"))
+    return {"archive": archive_path, "files": len(restored), "bytes": restored_bytes, "errors": errors, "paths": restored_paths}
+
+def join_archives(archive_dir, restore_root):
+    """분할된 압축 파일들을 동시에 풀어 원래 디렉터리 구조를 복원"""
+    manifest_path = os.path.join(archive_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        print(f"매니페스트를 찾을 수 없습니다: {manifest_path}")
+        return False
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    archive_format = manifest["archive_format"]
+    get_archive_backend(archive_format)
+    restore_root = os.path.abspath(restore_root)
+    os.makedirs(restore_root, exist_ok=True)
+    print(f"압축 파일 {len(manifest['archives'])}개({archive_format})를 복원합니다: {restore_root}")
+    
+    # 각 작업자는 압축 파일을 처음부터 끝까지 읽고 그 순서대로 파일을 씀
+    # 작업자 수로 대상 디스크에 동시에 섞이는 쓰기 스트림 수를 제한
+    archives = sorted(manifest["archives"], key=lambda a: sum(m["size"] for m in a["members"]), reverse=True)
+    start_time = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=join_workers) as pool:
+        futures = [
+            pool.submit(extract_archive, os.path.join(archive_dir, archive["archive"]), archive_format,
+                        archive["members"], restore_root)
+            for archive in archives
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"압축 해제 완료: {result['archive']} (파일 {result['files']}개)")
+    
+    seconds = max(time.perf_counter() - start_time, 1e-6)
+    total_bytes = sum(result["bytes"] for result in results)
+    print(f"복원 완료: 파일 {sum(result['files'] for result in results)}개, "
+          f"{total_bytes / (1024 * 1024):.2f}MB / {seconds:.2f}초 ({total_bytes / (1024 * 1024) / seconds:.1f}MB/s)")
+    # 서로 다른 원본 파일이 같은 경로로 복원되면(덮어쓰기) 파일별 검사는 통과해도 개수가 모자람
+    source_files = manifest.get("files", sum(len(archive["members"]) for archive in manifest["archives"]))
+    restored_files = len(set().union(*(result["paths"] for result in results)))
+    verification = [
+        {"archive": result["archive"], "members": result["files"], "errors": result["errors"]} for result in results
+    ]
+    if restored_files != source_files:
+        verification.append({"archive": restore_root, "members": 0,
+                             "errors": [("(복원)", f"복원된 파일 수 불일치: {restored_files}개 (원본 {source_files}개)")]})
+    return report_verification(verification)
 
-def calculate_required_folders(image_files, max_size_bytes):
+def calculate_required_folders(image_files, max_size_bytes, member_overhead=None):
     total_size = sum(size for _, size in image_files)
+    if member_overhead:
+        total_size += sum(member_overhead(os.path.basename(path), size) for path, size in image_files)
     num_folders = (total_size + max_size_bytes - 1) // max_size_bytes
     return max(1, int(num_folders))
 
 def main():
-    max_size_bytes = max_size_mb * 1024 * 1024
+    backend = get_archive_backend(archive_format)
+    if transform_format not in (None, *TRANSFORM_FORMATS):
+        raise ValueError(f"알 수 없는 변환 형식: {transform_format} (사용 가능: {', '.join(TRANSFORM_FORMATS)})")
+    if dedupe_policy not in (None, "keep", "drop", "list"):
+        raise ValueError(f"알 수 없는 유사 중복 처리 방식: {dedupe_policy} (사용 가능: keep, drop, list)")
+    # 선택한 압축 형식의 끝부분 구조 크기만큼 여유를 둠
+    max_size_bytes = max_size_mb * 1024 * 1024 - backend["archive_overhead"]
     
     print(f"소스 디렉터리: {source_dir}")
     print(f"출력 디렉터리: {output_dir}")
     print(f"폴더당 최대 크기: {max_size_mb}MB")
+    print(f"압축 형식: {archive_format}")
     
     os.makedirs(output_dir, exist_ok=True)
     
+    run_start = time.perf_counter()
+    stages = []
+    
     print("이미지 파일 스캔 중...")
-    image_files = get_all_image_files(source_dir)
+    progress = ProgressReporter("scan")
+    image_files = get_all_image_files(source_dir, progress)
+    stages.append(progress.finish())
     print(f"총 {len(image_files)}개의 이미지 파일을 찾았습니다.")
     
     if not image_files:
         print("이미지 파일을 찾을 수 없습니다. 종료합니다.")
         return
     
-    num_folders = calculate_required_folders(image_files, max_size_bytes)
+    if dedupe_policy:
+        print("유사 중복 이미지 검사 중...")
+        progress = ProgressReporter("dedupe", len(image_files), sum(size for _, size in image_files))
+        image_files = dedupe_images(image_files, dedupe_policy, os.path.join(output_dir, "near_duplicates.txt"), progress)
+        stages.append(progress.finish())
+    
+    transform_dir = None
+    if transform_format or transform_max_dimension:
+        print("이미지 파일 변환 중...")
+        transform_dir = os.path.join(output_dir, "_transformed")
+        progress = ProgressReporter("transform", len(image_files), sum(size for _, size in image_files))
+        image_files = transform_images(image_files, source_dir, transform_dir, progress)
+        stages.append(progress.finish())
+    
+    total_files = len(image_files)
+    total_bytes = sum(size for _, size in image_files)
+    num_folders = calculate_required_folders(image_files, max_size_bytes, backend["member_overhead"])
     print(f"필요한 폴더 수: {num_folders}")
     
     output_folders = create_output_folders(output_dir, num_folders)
     
     print("이미지 파일 분배 계획 생성 중...")
-    distribution = distribute_images(image_files, output_folders, max_size_bytes)
+    progress = ProgressReporter("plan", total_files, total_bytes)
+    distribution = distribute_images(image_files, output_folders, max_size_bytes, backend["member_overhead"], progress)
+    stages.append(progress.finish())
     
     print("이미지 파일 복사 중...")
-    copy_images(distribution)
+    progress = ProgressReporter("copy", total_files, total_bytes)
+    copy_images(distribution, progress)
+    stages.append(progress.finish())
+    
+    source_roots = [os.path.abspath(root) for root in (transform_dir, source_dir) if root]
+    write_manifest(os.path.join(output_dir, MANIFEST_NAME), distribution, dict(image_files), archive_format, source_roots)
+    
+    if transform_dir and os.path.exists(transform_dir):
+        shutil.rmtree(transform_dir)
+    
+    if compare_backends:
+        compare_archive_backends(output_folders[0])
+    
+    expected_members = None
+    if verify_archives:
+        expected_members = build_expected_members(distribution, dict(image_files))
     
     # 폴더를 압축파일로 만들기
-    zip_folders(output_folders)
+    progress = ProgressReporter("compress", total_files, total_bytes)
+    verify_progress = ProgressReporter("verify", total_files, total_bytes, display=False) if verify_archives else None
+    archive_stats = archive_folders(output_folders, archive_format, expected_members, progress, verify_progress,
+                                    max_archive_bytes=int(max_size_mb * 1024 * 1024))
+    stages.extend(archive_stats["stages"])
+    verified = report_verification(archive_stats["verification"]) if verify_archives else True
     
     # 압축 후 폴더 정보 출력
     print("작업 완료!")
@@ -113,9 +1133,25 @@ def main():
     for folder in output_folders:
         folder_size_bytes = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f)))
         folder_size_mb = folder_size_bytes / (1024 * 1024)
-        zip_size_bytes = os.path.getsize(f"{folder}.zip") if os.path.exists(f"{folder}.zip") else 0
-        zip_size_mb = zip_size_bytes / (1024 * 1024)
-        print(f"{folder}: {len(os.listdir(folder))}개 파일, {folder_size_mb:.2f}MB (압축 파일: {zip_size_mb:.2f}MB)")
+        archive_path = f"{folder}{backend['extension']}"
+        archive_size_bytes = os.path.getsize(archive_path) if os.path.exists(archive_path) else 0
+        archive_size_mb = archive_size_bytes / (1024 * 1024)
+        print(f"{folder}: {len(os.listdir(folder))}개 파일, {folder_size_mb:.2f}MB (압축 파일: {archive_size_mb:.2f}MB)")
+    
+    write_summary(os.path.join(output_dir, SUMMARY_NAME), {
+        "archive_format": archive_format,
+        "files": total_files,
+        "input_bytes": archive_stats["input_bytes"],
+        "archives": archive_stats["archives"],
+        "output_bytes": archive_stats["output_bytes"],
+        "verified": verified if verify_archives else None,
+        "seconds": round(time.perf_counter() - run_start, 3),
+        "stages": stages,
+    })
+    
+    if not verified:
+        print("압축 파일 검증에 실패했습니다. 원본 폴더를 유지합니다.")
+        return
     
     # 압축 후 원본 폴더 삭제 여부 묻기
     delete_folders = input("압축이 완료되었습니다. 원본 폴더를 삭제하시겠습니까? (y/n): ")
@@ -124,5 +1160,12 @@ def main():
             shutil.rmtree(folder)
             print(f"삭제됨: {folder}")
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python image_splitter.py join [압축 파일 디렉터리] [복원 디렉터리]
+    if len(sys.argv) > 1 and sys.argv[1] == "join":
+        archive_dir = sys.argv[2] if len(sys.argv) > 2 else output_dir
+        restore_root = sys.argv[3] if len(sys.argv) > 3 else restore_dir
+        join_archives(archive_dir, restore_root)
+    else:
+        main()
\ No newline at end of file